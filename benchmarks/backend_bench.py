@@ -0,0 +1,190 @@
+"""Translation backend under injected latency and failures
+
+Starts a local stand-in for the Google Translate endpoint that adds latency
+and fails a configurable share of requests (HTTP 503, stalls, or a full
+outage window), then drives GoogleTranslateBackend through ResilientBackend
+the same way the app does. Reports latency percentiles, how many texts were
+translated, retried or rejected by the circuit breaker, and whether
+keep-alive connections were reused.
+
+Run from the repository root:
+    python -m benchmarks.backend_bench
+    python -m benchmarks.backend_bench --fail-rate 0.3 --outage 2:6
+"""
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+import numpy as np
+
+from translation_backend import BackendError, BackendUnavailable, GoogleTranslateBackend, ResilientBackend
+from metrics import TRANSLATION_RETRIES
+
+
+# ==================== Stand-in Server ====================
+class FlakyTranslateServer:
+    """Local HTTP server answering /translate_a/single like the real endpoint, with faults"""
+    def __init__(self, latency=0.02, fail_rate=0.0, stall_rate=0.0, stall=10.0, outage=None, seed=0,
+                 script=None):
+        self.latency = latency
+        self.fail_rate = fail_rate
+        self.stall_rate = stall_rate
+        self.stall = stall
+        self.outage = outage  # (start, end) seconds after start() during which everything fails
+        self.script = list(script or [])  # Faults for the first requests, in order, before the random ones
+        self.random = random.Random(seed)
+        self.requests = 0
+        self.connections = set()
+        self.started = None
+        self.server = None
+
+    def fault(self):
+        """Pick the fault for the next request: None, 'fail', 'stall' or 'garbage'"""
+        if self.script:
+            return self.script.pop(0)
+        elapsed = time.monotonic() - self.started
+        if self.outage and self.outage[0] <= elapsed < self.outage[1]:
+            return 'fail'
+        roll = self.random.random()
+        if roll < self.fail_rate:
+            return 'fail'
+        if roll < self.fail_rate + self.stall_rate:
+            return 'stall'
+        return None
+
+    def start(self):
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # Keep-alive
+            disable_nagle_algorithm = True  # Headers and body go out as separate writes
+
+            def do_POST(self):
+                stand_in.requests += 1
+                stand_in.connections.add(self.client_address)
+                length = int(self.headers.get('Content-Length', 0))
+                text = parse_qs(self.rfile.read(length).decode('utf-8')).get('q', [''])[0]
+
+                fault = stand_in.fault()
+                time.sleep(stand_in.stall if fault == 'stall' else stand_in.latency)
+                try:
+                    if fault == 'fail':
+                        self.send_response(503)
+                        self.send_header('Content-Length', '0')
+                        self.end_headers()
+                        return
+
+                    if fault == 'garbage':
+                        body = b"<html>Service temporarily unavailable</html>"
+                    else:
+                        body = json.dumps([[[f"<ar>{text}</ar>", text, None, None]]]).encode('utf-8')
+                    self.send_response(200)
+                    self.send_header('Content-Type', 'application/json; charset=utf-8')
+                    self.send_header('Content-Length', str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    self.close_connection = True  # Client gave up on a stalled request
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.server.daemon_threads = True
+        self.started = time.monotonic()
+        threading.Thread(target=self.server.serve_forever, daemon=True, name="FlakyServer").start()
+        return f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+# ==================== Benchmark ====================
+def run(args):
+    outage = tuple(float(v) for v in args.outage.split(':')) if args.outage else None
+    server = FlakyTranslateServer(
+        latency=args.latency,
+        fail_rate=args.fail_rate,
+        stall_rate=args.stall_rate,
+        outage=outage
+    )
+    base_url = server.start()
+    backend = ResilientBackend(
+        GoogleTranslateBackend(base_url=base_url, read_timeout=args.read_timeout),
+        deadline=args.deadline
+    )
+    backend.breaker.reset_timeout = args.reset_timeout
+    backend.breaker.failure_threshold = args.failure_threshold
+
+    outcomes = {'translated': 0, 'failed': 0, 'rejected': 0}
+    latencies = []
+    retries_before = TRANSLATION_RETRIES.total()
+    start = time.monotonic()
+    for i in range(args.requests):
+        t0 = time.perf_counter()
+        try:
+            backend.translate(f"Sample text number {i}")
+            outcomes['translated'] += 1
+        except BackendUnavailable:
+            outcomes['rejected'] += 1  # Circuit open - the app shows cached/original text
+        except BackendError:
+            outcomes['failed'] += 1
+        latencies.append(time.perf_counter() - t0)
+        time.sleep(args.interval)
+    elapsed = time.monotonic() - start
+
+    values = np.array(latencies) * 1000
+    result = {
+        'requests': args.requests,
+        'elapsed_s': elapsed,
+        'outcomes': outcomes,
+        'latency_ms': {
+            'p50': float(np.percentile(values, 50)),
+            'p95': float(np.percentile(values, 95)),
+            'p99': float(np.percentile(values, 99)),
+            'max': float(values.max())
+        },
+        'retries': TRANSLATION_RETRIES.total() - retries_before,
+        'server_requests': server.requests,
+        'server_connections': len(server.connections),
+        'breaker': backend.stats()
+    }
+    backend.close()
+    server.stop()
+    return result
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--interval', type=float, default=0.02, help="seconds between texts")
+    parser.add_argument('--latency', type=float, default=0.02, help="server seconds per request")
+    parser.add_argument('--fail-rate', type=float, default=0.1, help="share of requests answered with 503")
+    parser.add_argument('--stall-rate', type=float, default=0.02, help="share of requests that hang")
+    parser.add_argument('--outage', help="start:end seconds during which every request fails")
+    parser.add_argument('--read-timeout', type=float, default=1.0)
+    parser.add_argument('--deadline', type=float, default=2.0)
+    parser.add_argument('--failure-threshold', type=int, default=3, help="failed texts that open the circuit")
+    parser.add_argument('--reset-timeout', type=float, default=1.0, help="circuit breaker cool-down")
+    parser.add_argument('-o', '--output', help="write the JSON report here (default: stdout)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    report = json.dumps(run(args), indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(report)
+    else:
+        print(report)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,38 @@
+"""Microbenchmark: TranslationCache hit latency versus cache size
+
+Run from the repository root:
+    python -m benchmarks.cache_bench
+"""
+import random
+import time
+
+from translation_cache import TranslationCache
+
+SIZES = [200, 1000, 10000, 100000]
+LOOKUPS = 200000
+
+
+def bench_hits(size):
+    cache = TranslationCache(max_size=size, max_bytes=size * 1024)
+    texts = [f"Sample screen text number {i}" for i in range(size)]
+    for text in texts:
+        cache.set(text, text[::-1])
+
+    rng = random.Random(size)
+    keys = [rng.choice(texts) for _ in range(LOOKUPS)]
+
+    start = time.perf_counter()
+    for text in keys:
+        cache.get(text)
+    elapsed = time.perf_counter() - start
+    return elapsed / LOOKUPS * 1e9
+
+
+def main():
+    print(f"{'entries':>10} {'ns/hit':>10}")
+    for size in SIZES:
+        print(f"{size:>10} {bench_hits(size):>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Benchmark: per-frame OCR latency, resident engine versus pytesseract subprocess
+
+Run from the repository root (needs the tesseract binary, tesserocr optional):
+    python -m benchmarks.ocr_bench [frames]
+"""
+import statistics
+import sys
+import time
+
+import cv2
+import numpy as np
+
+from ocr_engine import PytesseractEngine, TesserocrEngine, tesserocr
+
+LINES = [
+    "Settings  Notifications  Privacy",
+    "You have 3 new messages from Sarah",
+    "Battery saver is on until 80%",
+    "Tap here to translate this screen",
+]
+
+
+def synthetic_band(text):
+    band = np.full((48, 900), 255, dtype=np.uint8)
+    cv2.putText(band, text, (10, 34), cv2.FONT_HERSHEY_SIMPLEX, 0.9, 0, 2, cv2.LINE_AA)
+    return band
+
+
+def bench(engine, bands, frames):
+    engine.recognize(bands[0])  # Warm-up
+    timings = []
+    for i in range(frames):
+        start = time.perf_counter()
+        engine.recognize(bands[i % len(bands)], psm=7)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), max(timings)
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    bands = [synthetic_band(text) for text in LINES]
+
+    engines = [PytesseractEngine('eng')]
+    if tesserocr is not None:
+        engines.append(TesserocrEngine('eng'))
+    else:
+        print("tesserocr not installed - only the pytesseract fallback is measured")
+
+    print(f"{'engine':>12} {'p50 ms':>8} {'max ms':>8}")
+    for engine in engines:
+        p50, worst = bench(engine, bands, frames)
+        print(f"{engine.name:>12} {p50:>8.1f} {worst:>8.1f}")
+        engine.close()
+
+
+if __name__ == "__main__":
+    main()
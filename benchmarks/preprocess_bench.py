@@ -0,0 +1,77 @@
+"""Benchmark: does the 1.5x upscale pay for itself?
+
+Renders synthetic screen captures with small text (as produced by a 0.6x
+capture), preprocesses them at 1.0x and 1.5x, and reports per-step cost.
+When the tesseract binary is available it also reports OCR time and
+character accuracy for each scale.
+
+Run from the repository root:
+    python -m benchmarks.preprocess_bench [frames]
+"""
+import difflib
+import shutil
+import statistics
+import sys
+import time
+
+import cv2
+import numpy as np
+
+from ocr_engine import create_engine
+from preprocessing import Preprocessor
+
+LINES = [
+    "Your order has shipped and will arrive on Tuesday",
+    "Reply to Ahmed: see you at the station at 6pm",
+    "Storage almost full - free up 2.4 GB of space",
+    "Privacy policy updated. Tap to review the changes",
+    "Download complete: holiday_photos_2024.zip",
+]
+
+
+def synthetic_capture(font_scale, seed):
+    rng = np.random.default_rng(seed)
+    frame = np.full((720, 648), 245, dtype=np.uint8)
+    lines = [LINES[(seed + i) % len(LINES)] for i in range(len(LINES))]
+    for i, text in enumerate(lines):
+        cv2.putText(frame, text, (8, 40 + i * 60), cv2.FONT_HERSHEY_SIMPLEX,
+                    font_scale, 30, 1, cv2.LINE_AA)
+    noise = rng.normal(0, 4, frame.shape)
+    return np.clip(frame + noise, 0, 255).astype(np.uint8), "\n".join(lines)
+
+
+def accuracy(expected, actual):
+    return difflib.SequenceMatcher(None, expected, " ".join(actual.split("\n"))).ratio()
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    engine = create_engine('eng') if shutil.which('tesseract') else None
+    if engine is None:
+        print("tesseract not found - only preprocessing cost is measured")
+
+    print(f"{'font':>5} {'scale':>6} {'prep ms':>8} {'ocr ms':>8} {'accuracy':>9}")
+    for font_scale in (0.35, 0.45, 0.6):
+        for scale in (1.0, 1.5):
+            preprocessor = Preprocessor(steps=('resize', 'contrast'), scale=scale)
+            ocr_times = []
+            scores = []
+            for seed in range(frames):
+                frame, expected = synthetic_capture(font_scale, seed)
+                processed = preprocessor.process(frame)
+                if engine is not None:
+                    start = time.perf_counter()
+                    text = engine.recognize(processed, psm=3)
+                    ocr_times.append((time.perf_counter() - start) * 1000)
+                    scores.append(accuracy(" ".join(expected.split("\n")), text))
+
+            prep_ms = sum(preprocessor.stats().values())
+            ocr_ms = f"{statistics.median(ocr_times):8.1f}" if ocr_times else f"{'-':>8}"
+            score = f"{statistics.mean(scores):9.3f}" if scores else f"{'-':>9}"
+            print(f"{font_scale:>5} {scale:>6} {prep_ms:>8.2f} {ocr_ms} {score}")
+    if engine is not None:
+        engine.close()
+
+
+if __name__ == "__main__":
+    main()
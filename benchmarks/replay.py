@@ -0,0 +1,297 @@
+"""Offline replay benchmark for the full capture -> OCR -> translate -> overlay path
+
+Replays recorded frames through ScreenProcessor with a deterministic local
+translator and a fake overlay sink, then writes per-stage latency
+percentiles, throughput, OCR skips, cache hit rate and peak RSS to JSON.
+
+Frame sources:
+    a directory of PNG/JPG files (sorted by name), an .npz file (arrays in
+    key order, or a single 'frames' array), a video file, or
+    synthetic:<static|scroll|chat>[:frames]
+
+Run from the repository root:
+    python -m benchmarks.replay recordings/chat/ -o bench.json
+    python -m benchmarks.replay synthetic:scroll:120 --ocr stub
+    python -m benchmarks.replay synthetic:chat:120 --ocr-workers 1   # serial OCR baseline
+    python -m benchmarks.replay synthetic:scroll:120 --ocr stub --no-scroll   # full re-OCR baseline
+"""
+import argparse
+import glob
+import hashlib
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+import cv2
+import numpy as np
+
+from ocr_engine import OCREngine, OCREnginePool
+from processor import ScreenProcessor
+from overlay_layout import OverlayLayout
+from overlay_presenter import OverlayPresenter, FakeOverlaySink
+from frame_source import FakeFrameSource
+from translation_backend import TranslationBackend
+from tracing import tracer
+from metrics import metrics, REGIONS_REUSED
+
+STAGES = ('ingest', 'change_detect', 'ocr', 'translate', 'render')
+
+SAMPLE_LINES = [
+    "Meeting moved to 3pm tomorrow",
+    "Can you send me the report?",
+    "Your package is out for delivery",
+    "Battery low - 15% remaining",
+    "New comment on your photo",
+    "Flight BA 117 is now boarding at gate 22",
+    "Don't forget to bring the charger",
+    "Weekly summary: 4 tasks completed",
+]
+
+
+# ==================== Frame Sources ====================
+def synthetic_frames(kind, count, width=648, height=1152):
+    """Generate RGBA frames: a static screen, a scrolling list or a chat with new messages"""
+    line_height = 48
+    lines = [f"{SAMPLE_LINES[i % len(SAMPLE_LINES)]} #{i}" for i in range(count + height // line_height + 2)]
+    canvas = np.full((len(lines) * line_height + height, width), 250, dtype=np.uint8)
+    for i, text in enumerate(lines):
+        cv2.putText(canvas, text, (12, i * line_height + 34), cv2.FONT_HERSHEY_SIMPLEX,
+                    0.7, 20, 2, cv2.LINE_AA)
+
+    for i in range(count):
+        if kind == 'static':
+            top = 0
+        elif kind == 'scroll':
+            top = i * 17  # Smooth scroll, a few pixels per frame
+        else:
+            top = (i // 5) * line_height  # A new chat line every fifth frame
+        gray = canvas[top:top + height]
+        yield cv2.cvtColor(gray, cv2.COLOR_GRAY2RGBA)
+
+
+def load_frames(source):
+    """Yield RGBA uint8 frames from a directory, .npz, video or synthetic spec"""
+    if source.startswith('synthetic:'):
+        parts = source.split(':')
+        count = int(parts[2]) if len(parts) > 2 else 60
+        yield from synthetic_frames(parts[1], count)
+        return
+
+    if os.path.isdir(source):
+        paths = sorted(
+            p for p in glob.glob(os.path.join(source, '*'))
+            if p.lower().endswith(('.png', '.jpg', '.jpeg'))
+        )
+        for path in paths:
+            yield cv2.cvtColor(cv2.imread(path, cv2.IMREAD_COLOR), cv2.COLOR_BGR2RGBA)
+        return
+
+    if source.endswith('.npz'):
+        data = np.load(source)
+        arrays = data['frames'] if 'frames' in data.files else [data[key] for key in data.files]
+        for frame in arrays:
+            if frame.ndim == 2:
+                frame = cv2.cvtColor(frame, cv2.COLOR_GRAY2RGBA)
+            elif frame.shape[2] == 3:
+                frame = cv2.cvtColor(frame, cv2.COLOR_RGB2RGBA)
+            yield np.ascontiguousarray(frame, dtype=np.uint8)
+        return
+
+    capture = cv2.VideoCapture(source)
+    if not capture.isOpened():
+        raise ValueError(f"Cannot open frame source: {source}")
+    while True:
+        ok, frame = capture.read()
+        if not ok:
+            break
+        yield cv2.cvtColor(frame, cv2.COLOR_BGR2RGBA)
+    capture.release()
+
+
+# ==================== Stubs ====================
+class StubTranslator(TranslationBackend):
+    """Deterministic local translator with configurable per-request latency"""
+    name = 'stub'
+
+    def __init__(self, latency=0.05, per_char=0.0):
+        self.latency = latency
+        self.per_char = per_char
+        self.calls = 0
+        self.bytes_sent = 0
+
+    def translate(self, text, timeout=None):
+        self.calls += 1
+        self.bytes_sent += len(text.encode('utf-8'))
+        time.sleep(self.latency + self.per_char * len(text))
+        return "\n".join(f"<ar>{line[::-1]}</ar>" for line in text.split("\n"))
+
+
+class StubOCREngine(OCREngine):
+    """Stand-in for machines without tesseract: content-derived text with fixed latency"""
+    name = 'stub'
+
+    def __init__(self, lang='eng+ara', latency=0.02):
+        super().__init__(lang)
+        self.latency = latency
+
+    def recognize(self, image, psm=6, lang=None):
+        time.sleep(self.latency)
+        digest = hashlib.md5(np.ascontiguousarray(image[::4, ::4] >> 5).tobytes()).hexdigest()
+        return f"text line {digest[:12]}"
+
+
+# ==================== Benchmark ====================
+def percentiles(samples):
+    if not samples:
+        return {'count': 0, 'p50_ms': 0, 'p95_ms': 0, 'p99_ms': 0, 'mean_ms': 0}
+    values = np.array(samples) * 1000
+    return {
+        'count': len(samples),
+        'p50_ms': float(np.percentile(values, 50)),
+        'p95_ms': float(np.percentile(values, 95)),
+        'p99_ms': float(np.percentile(values, 99)),
+        'mean_ms': float(values.mean())
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def build_processor(args):
+    if args.ocr == 'stub':
+        pool = OCREnginePool(size=args.ocr_workers, factory=lambda: StubOCREngine(latency=args.ocr_latency))
+    else:
+        pool = OCREnginePool(size=args.ocr_workers, lang=args.lang, prefer_resident=(args.ocr != 'pytesseract'))
+
+    translator = StubTranslator(latency=args.translate_latency)
+    processor = ScreenProcessor(translator=translator, ocr_pool=pool, upscale=args.upscale)
+    processor.use_text_regions = not args.no_regions
+    processor.use_tile_ocr = not args.no_tiles
+    processor.use_scroll_reuse = not args.no_scroll
+    return processor
+
+
+def run(args):
+    processor = build_processor(args)
+    translator = processor.translator
+    sink = FakeOverlaySink()
+    layout = OverlayLayout()
+    posted = []  # Stands in for the UI thread: drained once per replayed frame
+    presenter = OverlayPresenter(sink, layout, post=posted.append)
+    source = FakeFrameSource(ingestor=processor.frame_ingestor)
+    source.start()
+    timings = {stage: [] for stage in STAGES}
+    frames = 0
+
+    start = time.perf_counter()
+    for rgba in load_frames(args.source):
+        frames += 1
+
+        # Same delivery and ingestion path as the device: mailbox -> strided view -> luma
+        source.push(rgba)
+        t0 = time.perf_counter()
+        luma = source.next_frame(timeout=0)
+        t1 = time.perf_counter()
+        frame = processor.accept_frame(luma)
+        t2 = time.perf_counter()
+        timings['ingest'].append(t1 - t0)
+        timings['change_detect'].append(t2 - t1)
+        if frame is None:
+            continue
+
+        text = processor.filter_text(processor.recognize_frame(frame))
+        t3 = time.perf_counter()
+        timings['ocr'].append(t3 - t2)
+        if text is None:
+            continue
+
+        translation = processor.translate(text)
+        t4 = time.perf_counter()
+        timings['translate'].append(t4 - t3)
+
+        regions = layout.build(processor.lines, translation)
+        if regions is not None:
+            presenter.show_regions(regions)
+        else:
+            presenter.show_text(translation.display, translation.raw)
+        while posted:
+            posted.pop(0)()
+        timings['render'].append(time.perf_counter() - t4)
+    elapsed = time.perf_counter() - start
+    source.stop()
+
+    stats = processor.stats()
+    result = {
+        'source': args.source,
+        'commit': git_commit(),
+        'ocr_engine': processor.ocr_pool.engine_name,
+        'ocr_workers': processor.ocr_pool.size,
+        'frames': frames,
+        'elapsed_s': elapsed,
+        'fps': frames / elapsed if elapsed > 0 else 0,
+        'stages': {stage: percentiles(samples) for stage, samples in timings.items()},
+        'ocr_skips': stats['frames']['skips'],
+        'renders': sink.renders,
+        'overlay_region_ops': sink.region_ops,
+        'overlay': layout.stats(),
+        'presenter': presenter.stats(),
+        'cache_hit_rate': stats['cache']['hit_rate'],
+        'tile_reuse_rate': stats['tiles']['reuse_rate'],
+        'scroll_frames': stats['motion']['scrolls'],
+        'regions_reused': REGIONS_REUSED.total(),
+        'translate_calls': translator.calls,
+        'translate_bytes': translator.bytes_sent,
+        # ru_maxrss is in kilobytes on Linux
+        'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        'processor': stats,
+        'metrics': metrics.snapshot()
+    }
+    processor.ocr_pool.close()
+    return result
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument('source', help="frame directory, .npz, video file or synthetic:<kind>[:frames]")
+    parser.add_argument('-o', '--output', help="write the JSON report here (default: stdout)")
+    parser.add_argument('--ocr', choices=('auto', 'pytesseract', 'stub'), default='auto')
+    parser.add_argument('--lang', default='eng+ara')
+    parser.add_argument('--ocr-workers', type=int, default=0,
+                        help="OCR engines run in parallel (default: one per spare core)")
+    parser.add_argument('--ocr-latency', type=float, default=0.02, help="stub OCR seconds per call")
+    parser.add_argument('--translate-latency', type=float, default=0.05, help="stub translator seconds per call")
+    parser.add_argument('--upscale', type=float, default=1.5)
+    parser.add_argument('--no-regions', action='store_true', help="disable text-region detection")
+    parser.add_argument('--no-tiles', action='store_true', help="disable the dirty-tile OCR cache")
+    parser.add_argument('--no-scroll', action='store_true', help="disable scroll detection and line reuse")
+    parser.add_argument('--trace', help="also write a Chrome trace-event JSON timeline here")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.trace:
+        tracer.enable()
+    result = run(args)
+    if args.trace:
+        tracer.dump(args.trace)
+    report = json.dumps(result, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(report)
+        print(f"Wrote {args.output}: {result['fps']:.1f} fps, {result['ocr_skips']} OCR skips")
+    else:
+        print(report)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+"""Microbenchmark: Arabic reshaping + bidi cost per kilobyte
+
+Compares reshaping the whole translated text (the old path) with per-segment
+shaping through DisplayShaper, both cold (empty memo) and warm (all segments
+memoized, as for cached translations).
+
+Run from the repository root:
+    python -m benchmarks.reshape_bench
+"""
+import time
+
+import arabic_reshaper
+from bidi.algorithm import get_display
+
+from display_text import DisplayShaper
+from text_segments import split_segments
+
+SENTENCES = [
+    "تم نقل الاجتماع إلى الساعة الثالثة غدا.",
+    "هل يمكنك إرسال التقرير لي؟",
+    "طردك في طريقه إليك.",
+    "البطارية منخفضة - 15% متبقية.",
+    "تعليق جديد على صورتك.",
+    "الرحلة BA 117 تصعد الآن عند البوابة 22.",
+]
+SIZES_KB = [1, 4, 16]
+REPEATS = 5
+
+
+def make_text(kilobytes):
+    lines = []
+    size = 0
+    i = 0
+    while size < kilobytes * 1024:
+        line = " ".join(SENTENCES[(i + j) % len(SENTENCES)] + f" {i}" for j in range(3))
+        lines.append(line)
+        size += len(line.encode('utf-8')) + 1
+        i += 1
+    return "\n".join(lines)
+
+
+def timed(func):
+    best = float('inf')
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    print(f"{'KB':>4} {'blob ms/KB':>12} {'cold ms/KB':>12} {'warm ms/KB':>12}")
+    for kilobytes in SIZES_KB:
+        text = make_text(kilobytes)
+        lines = split_segments(text)
+
+        blob = timed(lambda: get_display(arabic_reshaper.reshape(text)))
+        cold = timed(lambda: DisplayShaper().layout(lines))
+        shaper = DisplayShaper()
+        shaper.layout(lines)
+        warm = timed(lambda: shaper.layout(lines))
+
+        print(f"{kilobytes:>4} {blob * 1000 / kilobytes:>12.3f} {cold * 1000 / kilobytes:>12.3f} "
+              f"{warm * 1000 / kilobytes:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+import numpy as np
+
+
+# ==================== Frame Change Detection ====================
+class FrameChangeDetector:
+    """Cheap pre-OCR change detector based on a downsampled luma tile grid"""
+    def __init__(self, grid_size=(24, 24), pixel_threshold=6.0, tile_threshold=0.0):
+        self.grid_rows, self.grid_cols = grid_size
+        self.pixel_threshold = pixel_threshold  # Mean luma delta for a tile to count as changed
+        # Fraction of changed tiles for the frame to count as changed. A new short line
+        # ("ok", "Wrong PIN") touches only a few tiles, and a skipped change is never
+        # OCRed because the reference does not move - so by default any tile is enough
+        self.tile_threshold = tile_threshold
+        self.last_signature = None
+        self.checks = 0
+        self.skips = 0
+        self.changes = 0
+
+    def signature(self, frame):
+        """Return a (rows, cols) float32 grid of mean luma per tile"""
+        height, width = frame.shape[:2]
+        rows = min(self.grid_rows, height)
+        cols = min(self.grid_cols, width)
+        tile_h = height // rows
+        tile_w = width // cols
+
+        # Subsample each tile on a coarse grid - plenty for change detection
+        step_y = max(1, tile_h // 8)
+        step_x = max(1, tile_w // 8)
+        sampled = frame[:rows * tile_h:step_y, :cols * tile_w:step_x]
+
+        if sampled.ndim == 3:
+            # Integer luma approximation (BT.601) on the RGB channels
+            luma = (sampled[..., 0].astype(np.uint16) * 77 +
+                    sampled[..., 1].astype(np.uint16) * 150 +
+                    sampled[..., 2].astype(np.uint16) * 29) >> 8
+        else:
+            luma = sampled.astype(np.uint16)
+
+        sub_h = luma.shape[0] // rows
+        sub_w = luma.shape[1] // cols
+        luma = luma[:rows * sub_h, :cols * sub_w]
+        return luma.reshape(rows, sub_h, cols, sub_w).mean(axis=(1, 3), dtype=np.float32)
+
+    def changed_tiles(self, signature):
+        """Return a boolean mask of tiles that differ from the previous signature"""
+        if self.last_signature is None or self.last_signature.shape != signature.shape:
+            return np.ones(signature.shape, dtype=bool)
+        return np.abs(signature - self.last_signature) > self.pixel_threshold
+
+    def has_changed(self, frame):
+        """Check a raw RGBA/RGB/gray frame and remember it as the new reference"""
+        self.checks += 1
+        signature = self.signature(frame)
+        mask = self.changed_tiles(signature)
+        changed = mask.mean() > self.tile_threshold
+
+        if changed:
+            self.last_signature = signature
+            self.changes += 1
+        else:
+            self.skips += 1
+        return changed
+
+    def reset(self):
+        self.last_signature = None
+        self.checks = 0
+        self.skips = 0
+        self.changes = 0
+
+    def stats(self):
+        skip_rate = (self.skips / self.checks * 100) if self.checks > 0 else 0
+        return {
+            'checks': self.checks,
+            'skips': self.skips,
+            'changes': self.changes,
+            'skip_rate': skip_rate
+        }
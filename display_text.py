@@ -0,0 +1,89 @@
+import logging
+import re
+import threading
+from collections import OrderedDict
+
+# Translation and Arabic text handling
+import arabic_reshaper
+from bidi.algorithm import get_display
+
+logger = logging.getLogger(__name__)
+
+# First strong character decides the direction (Unicode bidi rule P2, simplified)
+_STRONG = re.compile(r'([A-Za-z\u00C0-\u024F\u0370-\u052F\u1E00-\u1EFF])|([\u0590-\u08FF\uFB1D-\uFDFF\uFE70-\uFEFF])')
+
+
+# ==================== Display Shaping ====================
+def text_direction(text, default='R'):
+    """'R' if the first strong character is right-to-left, 'L' if left-to-right"""
+    match = _STRONG.search(text)
+    if match is None:
+        return default
+    return 'L' if match.group(1) else 'R'
+
+
+def shape_segment(text):
+    """Reshape Arabic letters and reorder one segment for display in its own direction"""
+    try:
+        return get_display(arabic_reshaper.reshape(text), base_dir=text_direction(text))
+    except Exception as e:
+        logger.debug(f"Reshaping failed, showing logical order: {e}")
+        return text
+
+
+class DisplayShaper:
+    """Per-segment reshaping and bidi reordering with an LRU memo
+
+    Lines are laid out from independently shaped segments, so unchanged
+    segments never go through the (pure-Python) reshaper again; only the
+    order of segments within a right-to-left line is reversed here.
+    """
+    def __init__(self, max_size=2048):
+        self.memo = OrderedDict()  # logical segment -> display form
+        self.max_size = max_size
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def shape(self, segment):
+        with self.lock:
+            display = self.memo.get(segment)
+            if display is not None:
+                self.memo.move_to_end(segment)
+                self.hits += 1
+                return display
+            self.misses += 1
+
+        display = shape_segment(segment)
+        with self.lock:
+            self.memo[segment] = display
+            if len(self.memo) > self.max_size:
+                self.memo.popitem(last=False)
+        return display
+
+    def layout(self, lines, displays=None):
+        """Display text for lines of logical segments; `displays` may hold precomputed forms"""
+        displays = displays or {}
+        rows = []
+        for segments in lines:
+            shaped = [displays.get(s) or self.shape(s) for s in segments]
+            if segments and text_direction(segments[0]) == 'R':
+                shaped.reverse()  # Sentence order runs right to left
+            rows.append(" ".join(shaped))
+        return "\n".join(rows)
+
+    def clear(self):
+        with self.lock:
+            self.memo.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        with self.lock:
+            total = self.hits + self.misses
+            return {
+                'size': len(self.memo),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': (self.hits / total * 100) if total > 0 else 0
+            }
@@ -0,0 +1,77 @@
+import numpy as np
+import cv2
+
+
+# ==================== Frame Ingestion ====================
+def strided_rgba_view(data, width, height, row_stride, pixel_stride=4):
+    """Build a (height, width, 4) view over a padded RGBA buffer without copying"""
+    if pixel_stride < 4:
+        raise ValueError(f"Pixel stride {pixel_stride} is too small for RGBA")
+    if row_stride < width * pixel_stride:
+        raise ValueError(f"Row stride {row_stride} is smaller than {width}x{pixel_stride} bytes")
+
+    # The last row is not necessarily padded, so it may end before row_stride
+    needed = (height - 1) * row_stride + width * pixel_stride
+    flat = np.frombuffer(data, dtype=np.uint8)
+    if flat.size < needed:
+        raise ValueError(f"Buffer holds {flat.size} bytes, {needed} needed")
+
+    return np.lib.stride_tricks.as_strided(
+        flat,
+        shape=(height, width, 4),
+        strides=(row_stride, pixel_stride, 1),
+        writeable=False
+    )
+
+
+class FrameIngestor:
+    """Turn ImageReader planes into RGBA views and luma frames using reusable buffers"""
+    def __init__(self):
+        self.raw = None  # Reused landing buffer for the JNI copy
+        self.luma = None  # Reused (height, width) grayscale output
+
+    def raw_buffer(self, size):
+        """Return a reusable bytearray of exactly `size` bytes"""
+        if self.raw is None or len(self.raw) != size:
+            self.raw = bytearray(size)
+        return self.raw
+
+    def luma_buffer(self, height, width):
+        if self.luma is None or self.luma.shape != (height, width):
+            self.luma = np.empty((height, width), dtype=np.uint8)
+        return self.luma
+
+    def to_luma(self, rgba):
+        """Convert an RGBA view (possibly row-padded) to luma in one pass into the reusable buffer"""
+        height, width = rgba.shape[:2]
+        out = self.luma_buffer(height, width)
+        if rgba.strides[1] == 4:
+            # OpenCV handles padded rows natively as long as pixels are packed
+            cv2.cvtColor(rgba, cv2.COLOR_RGBA2GRAY, dst=out)
+        else:
+            # Wider pixel stride: integer BT.601 weights via a single dot product
+            weights = np.array([77, 150, 29], dtype=np.uint16)
+            np.right_shift(rgba[..., :3].dot(weights), 8, out=out, casting='unsafe')
+        return out
+
+    def ingest(self, data, width, height, row_stride, pixel_stride=4):
+        """Return (rgba_view, luma) for a raw buffer; both are only valid until the next call"""
+        rgba = strided_rgba_view(data, width, height, row_stride, pixel_stride)
+        return rgba, self.to_luma(rgba)
+
+    def ingest_image(self, image):
+        """Read an android.media.Image (RGBA_8888) honoring row and pixel stride"""
+        plane = image.getPlanes()[0]
+        buffer = plane.getBuffer()
+
+        # pyjnius cannot expose the direct ByteBuffer memory, so one copy into a reused buffer remains
+        data = self.raw_buffer(buffer.remaining())
+        buffer.get(data)
+
+        return self.ingest(
+            data,
+            image.getWidth(),
+            image.getHeight(),
+            plane.getRowStride(),
+            plane.getPixelStride()
+        )
@@ -0,0 +1,151 @@
+import logging
+import threading
+import time
+
+from frame_ingest import FrameIngestor
+from tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+
+# ==================== Latest-Frame Mailbox ====================
+class FrameMailbox:
+    """Single-slot mailbox: a new frame replaces (and releases) the unconsumed one"""
+    def __init__(self, release=None):
+        self.release = release  # Called on frames that are replaced or discarded
+        self.item = None
+        self.cond = threading.Condition()
+        self.closed = False
+        self.delivered = 0
+        self.replaced = 0
+
+    def put(self, item):
+        with self.cond:
+            if self.closed:
+                stale = item
+            else:
+                stale = self.item
+                self.item = item
+                if stale is not None:
+                    self.replaced += 1
+                self.cond.notify()
+        if stale is not None and self.release:
+            self.release(stale)
+
+    def get(self, timeout=None):
+        """Block until a frame is available; None on timeout or close"""
+        with self.cond:
+            if self.item is None and not self.closed:
+                self.cond.wait(timeout)
+            item = self.item
+            self.item = None
+            if item is not None:
+                self.delivered += 1
+            return item
+
+    def close(self):
+        with self.cond:
+            self.closed = True
+            stale = self.item
+            self.item = None
+            self.cond.notify_all()
+        if stale is not None and self.release:
+            self.release(stale)
+
+    def reopen(self):
+        with self.cond:
+            self.closed = False
+
+
+# ==================== Frame Sources ====================
+class FrameSource:
+    """Interface for capture sources delivering luma frames
+
+    `next_frame` blocks until a frame newer than the previous one exists and
+    returns a 2D uint8 array that stays valid until the next call.
+    """
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+    def next_frame(self, timeout=None):
+        raise NotImplementedError
+
+    def stats(self):
+        return {}
+
+
+class MailboxFrameSource(FrameSource):
+    """Base for push-driven sources: producers put raw frames, consumers ingest the latest"""
+    def __init__(self, ingestor=None):
+        self.ingestor = ingestor or FrameIngestor()
+        self.mailbox = FrameMailbox(release=self.release)
+        self.ingest_seconds = 0.0  # Cost of the last ingest, for the capture scheduler
+
+    def release(self, raw):
+        """Free a raw frame that will never be ingested"""
+        pass
+
+    def ingest(self, raw):
+        raise NotImplementedError
+
+    def start(self):
+        self.mailbox.reopen()
+
+    def stop(self):
+        self.mailbox.close()
+
+    def next_frame(self, timeout=None):
+        raw = self.mailbox.get(timeout)
+        if raw is None:
+            return None
+        start = time.perf_counter()
+        try:
+            with tracer.span('ingest', 'capture'):
+                return self.ingest(raw)
+        finally:
+            self.release(raw)
+            self.ingest_seconds = time.perf_counter() - start
+
+    def stats(self):
+        return {
+            'delivered': self.mailbox.delivered,
+            'replaced': self.mailbox.replaced
+        }
+
+
+class ImageReaderFrameSource(MailboxFrameSource):
+    """Frames pushed by ImageReader.OnImageAvailableListener instead of polling
+
+    The listener acquires the newest Image and parks it in the mailbox; an
+    Image that was never consumed is closed as soon as a newer one arrives, so
+    the reader's small buffer queue never fills up while OCR is busy.
+    """
+    def on_image_available(self, reader):
+        """Listener callback (runs on the reader's handler thread)"""
+        image = reader.acquireLatestImage()
+        if image:
+            self.mailbox.put(image)
+
+    def release(self, image):
+        try:
+            image.close()
+        except Exception as e:
+            logger.warning(f"Error closing image: {e}")
+
+    def ingest(self, image):
+        _, luma = self.ingestor.ingest_image(image)
+        return luma
+
+
+class FakeFrameSource(MailboxFrameSource):
+    """Frame source fed from numpy RGBA frames with `push`, for Linux tests and benchmarks"""
+    def push(self, rgba):
+        self.mailbox.put(rgba)
+
+    def ingest(self, rgba):
+        height, width = rgba.shape[:2]
+        _, luma = self.ingestor.ingest(rgba.data, width, height, rgba.strides[0], rgba.strides[1])
+        return luma
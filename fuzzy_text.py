@@ -0,0 +1,48 @@
+# Glyphs Tesseract swaps between frames of the same screen, folded to one representative.
+# Only one-for-one look-alikes: anything that changes length, case or punctuation can
+# change the meaning ("is"/"is not", "file"/"files", "Done?"/"Done.") and is kept
+OCR_CONFUSABLES = str.maketrans({
+    'I': 'l', '|': 'l', '1': 'l',
+    '0': 'O',
+    # Arabic letter variants that differ only in hamza
+    'أ': 'ا', 'إ': 'ا', 'آ': 'ا', 'ٱ': 'ا',
+    'ى': 'ي', 'ؤ': 'و', 'ئ': 'ي'
+})
+
+
+# ==================== Normalization ====================
+def fold_text(text):
+    """Fold the differences OCR jitter produces without changing meaning: spacing and look-alike glyphs"""
+    return " ".join(text.split()).translate(OCR_CONFUSABLES)
+
+
+# ==================== Change Detection ====================
+class TextChangeDetector:
+    """Decide whether OCR output differs from the last accepted text beyond OCR jitter
+
+    Texts are compared line by line after folding, so a line that only
+    flickered between look-alike glyphs is the same line while any other
+    edit, however small, is a change. The reference only moves when a text
+    is accepted as changed.
+    """
+    def __init__(self):
+        self.last = None  # Folded lines of the last accepted text
+        self.checks = 0
+        self.jitter = 0  # Texts that matched the last accepted one up to OCR jitter
+
+    def has_changed(self, text):
+        self.checks += 1
+        lines = [line for line in map(fold_text, text.splitlines()) if line]
+        if lines == self.last:
+            self.jitter += 1
+            return False
+        self.last = lines
+        return True
+
+    def reset(self):
+        self.last = None
+        self.checks = 0
+        self.jitter = 0
+
+    def stats(self):
+        return {'checks': self.checks, 'jitter': self.jitter}
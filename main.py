@@ -7,13 +7,12 @@ from kivymd.uix.label import MDLabel
 from kivymd.uix.menu import MDDropdownMenu
 from kivymd.uix.dialog import MDDialog
 from kivymd.uix.textfield import MDTextField
-from kivymd.uix.list import OneLineListItem
+from kivymd.uix.list import OneLineListItem, TwoLineListItem, MDList
+from kivy.uix.scrollview import ScrollView as KivyScrollView
 from kivymd.toast import toast
 import threading
 import time
-import hashlib
 import logging
-from datetime import datetime
 import os
 
 # Android imports - الترتيب الصحيح مهم
@@ -22,15 +21,22 @@ from android import config
 from android.runnable import run_on_ui_thread
 
 # Image processing and OCR
-from PIL import Image
 import pytesseract
-import numpy as np
-import cv2
 
-# Translation and Arabic text handling
-from deep_translator import GoogleTranslator
-import arabic_reshaper
-from bidi.algorithm import get_display
+# Translation
+from translation_backend import GoogleTranslateBackend, ResilientBackend
+
+# Local modules
+from processor import ScreenProcessor
+from translation_store import PersistentTranslationStore
+from translation_history import TranslationHistory, TranslationLog
+from pipeline import Pipeline, Stage
+from scheduler import CaptureScheduler
+from frame_source import ImageReaderFrameSource
+from overlay_layout import OverlayLayout
+from overlay_presenter import OverlayPresenter, OverlaySink
+from tracing import tracer
+from metrics import metrics, MetricsServer, FRAMES_OCR, ERRORS
 
 # ==================== Android Java Classes ====================
 PythonActivity = autoclass('org.kivy.android.PythonActivity')
@@ -41,11 +47,15 @@ LayoutParams = autoclass('android.view.WindowManager$LayoutParams')
 Gravity = autoclass('android.view.Gravity')
 Color = autoclass('android.graphics.Color')
 TextView = autoclass('android.widget.TextView')
+FrameLayout = autoclass('android.widget.FrameLayout')
+FrameLayoutParams = autoclass('android.widget.FrameLayout$LayoutParams')
 ScrollView = autoclass('android.widget.ScrollView')
 ImageReader = autoclass('android.media.ImageReader')
 PixelFormat = autoclass('android.graphics.PixelFormat')
 Handler = autoclass('android.os.Handler')
+HandlerThread = autoclass('android.os.HandlerThread')
 Looper = autoclass('android.os.Looper')
+Choreographer = autoclass('android.view.Choreographer')
 Settings = autoclass('android.provider.Settings')
 Uri = autoclass('android.net.Uri')
 Activity = autoclass('android.app.Activity')
@@ -59,6 +69,8 @@ Build = autoclass('android.os.Build')
 PowerManager = autoclass('android.os.PowerManager')
 WakeLock = autoclass('android.os.PowerManager$WakeLock')
 View = autoclass('android.view.View')
+TruncateAt = autoclass('android.text.TextUtils$TruncateAt')
+TypedValue = autoclass('android.util.TypedValue')
 Toast = autoclass('android.widget.Toast')
 
 # ==================== Setup Logging ====================
@@ -110,67 +122,69 @@ class OverlayClickListener(PythonJavaClass):
     
     @java_method('(Landroid/view/View;)V')
     def onClick(self, view):
-        text = view.getText().toString()
+        # Copy the logical-order translation, not the reshaped visual form shown on screen
+        text = self.app.overlay_raw_text or view.getText().toString()
         if text and text.strip():
             self.app.copy_to_clipboard(text)
 
-# ==================== Translation Cache ====================
-class TranslationCache:
-    """Cache manager for translations with LRU eviction"""
-    def __init__(self, max_size=200):
-        self.cache = {}
-        self.order = []  # For LRU tracking
-        self.max_size = max_size
-        self.hits = 0
-        self.misses = 0
-    
-    def get(self, text):
-        text_hash = self._hash_text(text)
-        if text_hash in self.cache:
-            # Move to end (most recently used)
-            self.order.remove(text_hash)
-            self.order.append(text_hash)
-            self.hits += 1
-            return self.cache[text_hash]['translation']
-        self.misses += 1
-        return None
-    
-    def set(self, text, translation, source_lang='auto', target_lang='arabic'):
-        text_hash = self._hash_text(text)
-        
-        if text_hash in self.cache:
-            self.order.remove(text_hash)
-        elif len(self.cache) >= self.max_size:
-            # Remove least recently used
-            lru_hash = self.order.pop(0)
-            del self.cache[lru_hash]
-        
-        self.cache[text_hash] = {
-            'translation': translation,
-            'source_lang': source_lang,
-            'target_lang': target_lang,
-            'timestamp': time.time()
-        }
-        self.order.append(text_hash)
-    
-    def _hash_text(self, text):
-        return hashlib.md5(text.encode('utf-8')).hexdigest()
-    
-    def clear(self):
-        self.cache.clear()
-        self.order.clear()
-        self.hits = 0
-        self.misses = 0
-    
-    def stats(self):
-        total = self.hits + self.misses
-        hit_rate = (self.hits / total * 100) if total > 0 else 0
-        return {
-            'size': len(self.cache),
-            'hits': self.hits,
-            'misses': self.misses,
-            'hit_rate': hit_rate
-        }
+# ==================== Frame Callback ====================
+class FrameCallback(PythonJavaClass):
+    _javacontext_ = 'app'
+    _javainterfaces_ = ['android/view/Choreographer$FrameCallback']
+    
+    def __init__(self):
+        super().__init__()
+        self.callback = None
+    
+    @java_method('(J)V')
+    def doFrame(self, frame_time_nanos):
+        callback, self.callback = self.callback, None
+        if callback:
+            callback()
+
+# ==================== Android Overlay Sink ====================
+class AndroidOverlaySink(OverlaySink):
+    """Draws presenter updates into the app's overlay windows (called on the UI thread)"""
+    def __init__(self, app_instance):
+        self.app = app_instance
+        self.vibrator = None
+        self.vibrator_checked = False
+    
+    def show_text(self, display, raw):
+        self.app.update_overlay_text(display, raw)
+    
+    def apply_regions(self, diff):
+        self.app.apply_overlay_diff(diff)
+    
+    def vibrate(self, milliseconds):
+        # Look the service up once; devices without a vibrator are remembered too
+        if not self.vibrator_checked:
+            self.vibrator_checked = True
+            try:
+                activity = PythonActivity.mActivity
+                vibrator = activity.getSystemService(Context.VIBRATOR_SERVICE)
+                if vibrator and vibrator.hasVibrator():
+                    self.vibrator = vibrator
+            except Exception as e:
+                logger.debug(f"Vibrator unavailable: {e}")
+        if self.vibrator:
+            self.vibrator.vibrate(milliseconds)
+
+# ==================== Image Available Listener ====================
+class ImageAvailableListener(PythonJavaClass):
+    _javacontext_ = 'app'
+    _javainterfaces_ = ['android/media/ImageReader$OnImageAvailableListener']
+    
+    def __init__(self, frame_source):
+        super().__init__()
+        self.frame_source = frame_source
+    
+    @java_method('(Landroid/media/ImageReader;)V')
+    def onImageAvailable(self, reader):
+        try:
+            self.frame_source.on_image_available(reader)
+        except Exception as e:
+            logger.warning(f"Failed to acquire image: {e}")
 
 # ==================== Main Application ====================
 class ScreenTranslatorApp(MDApp):
@@ -179,35 +193,69 @@ class ScreenTranslatorApp(MDApp):
         
         # State management
         self.service_active = False
-        self.last_hash = ""
-        self.translation_cache = TranslationCache(max_size=200)
+        self.translation_store = None
         
         # Android resources
         self.overlay_view = None
+        self.overlay_raw_text = None  # Logical-order text behind the overlay, for copying
         self.scroll_view = None
+        self.region_container = None  # Full-screen window holding every positioned region view
+        self.region_views = {}  # Overlay region key -> TextView
         self.image_reader = None
+        self.image_listener = None
+        self.image_thread = None
         self.projection = None
         self.virtual_display = None
         self.wm = None
         self.wake_lock = None
         
-        # Translators
-        self.translator = None
-        self.current_target_lang = 'ar'  # Arabic code
-        self.current_source_lang = 'auto'
-        
         # Performance settings
-        self.capture_interval = 1.5  # seconds
+        self.capture_interval = 1.5  # seconds, current value chosen by the scheduler
+        self.scheduler = CaptureScheduler(
+            target_latency=1.0,  # seconds from screen change to overlay
+            cpu_budget=0.5,  # fraction of one core
+            min_interval=0.25,
+            max_interval=4.0
+        )
         self.capture_resolution = (0.6, 0.6)  # width, height scale
-        self.text_min_length = 10  # Minimum text length to process
+        
+        # OCR and translation core (translator is created when the service starts)
+        self.processor = ScreenProcessor(
+            source_lang='auto',
+            target_lang='ar',  # Arabic code
+            # Upscale low-resolution captures
+            upscale=1.5 if self.capture_resolution[0] < 0.8 else 1.0
+        )
+        
+        # Frames are pushed by the ImageReader listener, ingested with the processor's buffers
+        self.frame_source = ImageReaderFrameSource(self.processor.frame_ingestor)
         
         # UI settings
         self.font_size = 18
         self.max_overlay_lines = 10
+        self.positioned_overlay = True  # Translations over their source lines; the panel is the fallback
+        self.overlay_layout = OverlayLayout()
+        # Overlay updates are coalesced into at most one UI post per display frame
+        self.frame_callback = None
+        self.overlay_presenter = OverlayPresenter(
+            AndroidOverlaySink(self),
+            self.overlay_layout,
+            post=self.post_frame_callback
+        )
         
         # Threading
         self.processing_thread = None
         self.processing_active = False
+        self.pipeline = None
+        self.frames_rendered = 0
+        
+        # Metrics endpoint (optional, localhost only) for soak runs
+        self.metrics_server = None
+        self.metrics_port = os.environ.get('SCREEN_TRANSLATOR_METRICS_PORT')
+        
+        # Tracing (ring buffer dumped as Chrome trace JSON when the service stops)
+        if os.environ.get('SCREEN_TRANSLATOR_TRACE') == '1':
+            tracer.enable()
         
         # Error handling
         self.error_count = 0
@@ -217,9 +265,9 @@ class ScreenTranslatorApp(MDApp):
         self.permission_handler = None
         self.activity_result_handler = None
         
-        # History
-        self.translation_history = []
-        self.max_history_size = 100
+        # History (recent entries in memory, full log on disk once the app starts)
+        self.translation_history = TranslationHistory(capacity=100)
+        self.history_log = None
         
         # Supported languages
         self.supported_languages = {
@@ -237,7 +285,7 @@ class ScreenTranslatorApp(MDApp):
             'ur': 'الأردية'
         }
         
-        # Configure pytesseract
+        # Configure pytesseract (fallback when no resident OCR engine is available)
         pytesseract.pytesseract.tesseract_cmd = '/usr/bin/tesseract'  # Default path
     
     def build(self):
@@ -288,6 +336,16 @@ class ScreenTranslatorApp(MDApp):
         )
         layout.add_widget(settings_btn)
         
+        # History button
+        history_btn = MDRaisedButton(
+            text="السجل",
+            pos_hint={'center_x': 0.5},
+            on_release=self.open_history_dialog,
+            size_hint=(0.6, None),
+            height=45
+        )
+        layout.add_widget(history_btn)
+        
         # Performance info
         self.performance_label = MDLabel(
             text="",
@@ -310,6 +368,35 @@ class ScreenTranslatorApp(MDApp):
         activity = PythonActivity.mActivity
         activity.addActivityResultListener(self.activity_result_handler)
         
+        # Open persistent translation store behind the in-memory cache
+        try:
+            self.translation_store = PersistentTranslationStore(
+                os.path.join(self.user_data_dir, 'translations.db')
+            )
+            self.translation_store.open()
+            self.processor.translation_cache.store = self.translation_store
+        except Exception as e:
+            logger.warning(f"Persistent translation store unavailable: {e}")
+            self.translation_store = None
+        
+        # Open the searchable history log
+        try:
+            self.history_log = TranslationLog(os.path.join(self.user_data_dir, 'history.db'))
+            self.history_log.open()
+            self.translation_history.attach(self.history_log)
+        except Exception as e:
+            logger.warning(f"Translation history log unavailable: {e}")
+            self.history_log = None
+        
+        # Serve Prometheus metrics on localhost if configured
+        if self.metrics_port:
+            try:
+                self.metrics_server = MetricsServer(metrics, port=int(self.metrics_port))
+                self.metrics_server.start()
+            except Exception as e:
+                logger.warning(f"Metrics endpoint unavailable: {e}")
+                self.metrics_server = None
+        
         # Update UI
         self.update_performance_info()
     
@@ -317,6 +404,19 @@ class ScreenTranslatorApp(MDApp):
         """Cleanup when app stops"""
         self.stop_service()
         
+        # Flush pending translations to disk
+        if self.translation_store:
+            self.processor.translation_cache.store = None
+            self.translation_store.close()
+        
+        # Flush pending history entries
+        if self.history_log:
+            self.translation_history.detach()
+            self.history_log.close()
+        
+        if self.metrics_server:
+            self.metrics_server.stop()
+        
         # Remove listeners
         if self.activity_result_handler:
             activity = PythonActivity.mActivity
@@ -349,13 +449,23 @@ class ScreenTranslatorApp(MDApp):
         self.service_active = False
         self.processing_active = False
         
-        # Wait for processing thread to finish
-        if self.processing_thread and self.processing_thread.is_alive():
+        # Wait for processing thread to finish (unless stopping from inside it)
+        if (self.processing_thread and self.processing_thread.is_alive() and
+                self.processing_thread is not threading.current_thread()):
             self.processing_thread.join(timeout=3.0)
         
         # Cleanup resources
         self.cleanup_resources()
         
+        # Save the span timeline for chrome://tracing / Perfetto
+        if tracer.enabled:
+            try:
+                path = os.path.join(self.user_data_dir, 'trace.json')
+                count = tracer.dump(path)
+                logger.info(f"Trace written: {path} ({count} spans)")
+            except Exception as e:
+                logger.warning(f"Could not write trace: {e}")
+        
         # Update UI
         self.control_btn.text = "بدء الخدمة"
         self.status_label.text = "متوقف"
@@ -428,12 +538,19 @@ class ScreenTranslatorApp(MDApp):
     def setup_and_start_service(self, result_code, data):
         """Setup and start service after permissions granted"""
         try:
-            # Initialize translator
-            self.translator = GoogleTranslator(
-                source=self.current_source_lang,
-                target=self.current_target_lang
+            # Initialize translator: keep-alive session behind retries and a circuit breaker
+            self.processor.translator = ResilientBackend(
+                GoogleTranslateBackend(
+                    source=self.processor.current_source_lang,
+                    target=self.processor.current_target_lang
+                ),
+                deadline=6.0  # seconds per request, including retries
             )
             
+            # Warm the in-memory cache from the persistent store
+            warmed = self.processor.translation_cache.warm()
+            logger.info(f"Translation cache warmed with {warmed} entries")
+            
             # Create overlay UI
             self.create_overlay_ui()
             
@@ -473,6 +590,11 @@ class ScreenTranslatorApp(MDApp):
             activity = PythonActivity.mActivity
             self.wm = cast(WindowManager, activity.getSystemService(Context.WINDOW_SERVICE))
             
+            # One window for all positioned regions: moving a region is a property
+            # change on a child view, not a WindowManager layout pass per line
+            self.region_container = FrameLayout(activity)
+            self.wm.addView(self.region_container, self.region_container_params())
+            
             # Create ScrollView
             self.scroll_view = ScrollView(activity)
             self.scroll_view.setLayoutParams(android_widget.AbsoluteLayout.LayoutParams(
@@ -488,7 +610,7 @@ class ScreenTranslatorApp(MDApp):
             self.overlay_view.setPadding(25, 15, 25, 15)
             self.overlay_view.setLineSpacing(1.1, 1.1)
             self.overlay_view.setMaxLines(self.max_overlay_lines)
-            self.overlay_view.setEllipsize(android_text.TextUtils.TruncateAt.END)
+            self.overlay_view.setEllipsize(TruncateAt.END)
             
             # Set click listener
             click_listener = OverlayClickListener(self)
@@ -502,12 +624,7 @@ class ScreenTranslatorApp(MDApp):
             params.width = LayoutParams.MATCH_PARENT
             params.height = LayoutParams.WRAP_CONTENT
             
-            # Set type based on Android version
-            if Build.VERSION.SDK_INT >= 26:
-                params.type = LayoutParams.TYPE_APPLICATION_OVERLAY
-            else:
-                params.type = LayoutParams.TYPE_PHONE
-            
+            params.type = self.overlay_window_type()
             params.flags = (
                 LayoutParams.FLAG_NOT_FOCUSABLE |
                 LayoutParams.FLAG_NOT_TOUCH_MODAL |
@@ -526,6 +643,125 @@ class ScreenTranslatorApp(MDApp):
             logger.error(f"Failed to create overlay UI: {e}")
             raise
     
+    def overlay_window_type(self):
+        """Window type for views drawn over other apps, based on Android version"""
+        if Build.VERSION.SDK_INT >= 26:
+            return LayoutParams.TYPE_APPLICATION_OVERLAY
+        return LayoutParams.TYPE_PHONE
+    
+    def region_container_params(self):
+        """Full-screen, non-touchable window in screen coordinates for the region views"""
+        params = LayoutParams()
+        params.width = LayoutParams.MATCH_PARENT
+        params.height = LayoutParams.MATCH_PARENT
+        params.type = self.overlay_window_type()
+        # Touches go to the app underneath (copying stays on the panel)
+        params.flags = (
+            LayoutParams.FLAG_NOT_FOCUSABLE |
+            LayoutParams.FLAG_NOT_TOUCHABLE |
+            LayoutParams.FLAG_LAYOUT_IN_SCREEN |
+            LayoutParams.FLAG_LAYOUT_NO_LIMITS
+        )
+        params.format = PixelFormat.TRANSLUCENT
+        params.gravity = Gravity.TOP | Gravity.LEFT
+        return params
+    
+    def create_region_view(self):
+        """Single-line TextView for one overlay region"""
+        view = TextView(PythonActivity.mActivity)
+        view.setTextColor(Color.YELLOW)
+        view.setBackgroundColor(Color.argb(200, 0, 0, 0))
+        view.setPadding(4, 0, 4, 0)
+        view.setMaxLines(1)
+        view.setEllipsize(TruncateAt.END)
+        return view
+    
+    def place_region_view(self, view, region):
+        """Size a region view to exactly its source line's box and show its text there
+
+        The box is also what the processor masks out of the capture, so the
+        view must not grow beyond it.
+        """
+        x, y, w, h = region.box
+        params = view.getLayoutParams()
+        if params is None:
+            params = FrameLayoutParams(max(w, 1), max(h, 1))
+            view.setLayoutParams(params)
+        elif params.width != max(w, 1) or params.height != max(h, 1):
+            params.width = max(w, 1)
+            params.height = max(h, 1)
+            view.setLayoutParams(params)
+        view.setX(float(x))
+        view.setY(float(y))
+        view.setText(region.display)
+        view.setTextSize(TypedValue.COMPLEX_UNIT_PX, max(12, h * 0.7))
+    
+    @run_on_ui_thread
+    def post_frame_callback(self, callback):
+        """Run callback on the UI thread at the next display frame"""
+        if self.frame_callback is None:
+            self.frame_callback = FrameCallback()
+        self.frame_callback.callback = callback
+        Choreographer.getInstance().postFrameCallback(self.frame_callback)
+    
+    def apply_overlay_diff(self, diff):
+        """Apply a render-model diff (UI thread); unchanged regions are not touched"""
+        if not self.region_container:
+            return
+        try:
+            with tracer.span('apply_diff', 'ui', added=len(diff.added), changed=len(diff.changed),
+                             moved=len(diff.moved), removed=len(diff.removed)):
+                # Views of removed regions are recycled for added ones
+                spare = [self.region_views.pop(region.key) for region in diff.removed
+                         if region.key in self.region_views]
+                added = list(diff.added)
+                
+                for region in diff.changed:
+                    view = self.region_views.get(region.key)
+                    if view is None:
+                        added.append(region)
+                        continue
+                    self.place_region_view(view, region)
+                
+                for region in diff.moved:
+                    view = self.region_views.get(region.key)
+                    if view is None:
+                        added.append(region)
+                        continue
+                    # Same size and text: only the position changes, no layout pass
+                    view.setX(float(region.box[0]))
+                    view.setY(float(region.box[1]))
+                
+                for region in added:
+                    if spare:
+                        view = spare.pop()
+                    else:
+                        view = self.create_region_view()
+                        self.region_container.addView(view)
+                    self.place_region_view(view, region)
+                    self.region_views[region.key] = view
+                
+                for view in spare:
+                    self.region_container.removeView(view)
+                
+                # The panel only shows when translations cannot be positioned
+                if self.scroll_view:
+                    self.scroll_view.setVisibility(View.GONE if self.region_views else View.VISIBLE)
+        except Exception as e:
+            logger.warning(f"Overlay update failed, redrawing all regions next time: {e}")
+            self.remove_region_views()
+    
+    def remove_region_views(self):
+        """Remove every region view; the render model starts over"""
+        if self.region_container:
+            try:
+                self.region_container.removeAllViews()
+            except Exception as e:
+                logger.debug(f"Error removing region views: {e}")
+        self.region_views = {}
+        self.overlay_layout.clear()
+        self.processor.set_overlay_lines([])
+    
     def setup_screen_capture(self, result_code, data):
         """Setup screen capture with proper resolution"""
         try:
@@ -547,12 +783,27 @@ class ScreenTranslatorApp(MDApp):
             
             logger.info(f"Capture dimensions: {capture_width}x{capture_height}")
             
+            # OCR boxes are in capture pixels, overlay regions in screen pixels
+            self.overlay_layout.scale = (original_width / capture_width, original_height / capture_height)
+            
             # Create ImageReader
             self.image_reader = ImageReader.newInstance(
                 capture_width,
                 capture_height,
                 PixelFormat.RGBA_8888,
-                2  # Max images to keep in buffer
+                3  # Max images open at once, see below
+            )
+            
+            # Deliver frames through a listener on a dedicated looper thread. Up to three
+            # images are open at once: one being ingested by the processing thread, one
+            # parked in the mailbox and one being acquired by the listener
+            self.frame_source.start()
+            self.image_thread = HandlerThread("ImageReaderCallbacks")
+            self.image_thread.start()
+            self.image_listener = ImageAvailableListener(self.frame_source)
+            self.image_reader.setOnImageAvailableListener(
+                self.image_listener,
+                Handler(self.image_thread.getLooper())
             )
             
             # Get media projection
@@ -593,75 +844,66 @@ class ScreenTranslatorApp(MDApp):
     
     # ==================== Main Processing Loop ====================
     def processing_loop(self):
-        """Main processing loop for screen capture and translation"""
+        """Capture loop feeding the OCR -> translate -> render pipeline"""
         logger.info("Processing loop started")
         
-        frames_processed = 0
-        last_text_hash = ""
-        last_process_time = 0
+        # Two translate workers: a new screen is not held up behind a slow request, and
+        # segments both are waiting on share one backend call (processor single-flight);
+        # a result that lands after a newer one is dropped by the stage
+        self.pipeline = Pipeline([
+            Stage('ocr', self.ocr_stage),
+            Stage('translate', self.translate_stage, workers=2),
+            Stage('render', self.render_stage)
+        ], on_error=self.on_stage_error, on_complete=self.scheduler.observe_stage)
+        self.pipeline.start()
+        
+        frames_captured = 0
+        self.scheduler.reset()
         
         while self.processing_active and self.error_count < self.max_errors:
             try:
-                current_time = time.time()
-                
-                # Calculate dynamic sleep time
-                time_since_last = current_time - last_process_time
-                if time_since_last < self.capture_interval:
-                    sleep_time = self.capture_interval - time_since_last
-                    time.sleep(max(0.1, sleep_time))
+                # Rate limit: hold off until the scheduler says the next capture is due
+                # (frames arriving meanwhile replace each other in the mailbox)
+                wait = self.scheduler.wait_time()
+                if wait > 0:
+                    time.sleep(min(wait, 0.5))
                     continue
                 
-                # Acquire latest image
-                image = self.image_reader.acquireLatestImage()
-                if not image:
-                    time.sleep(0.05)
-                    continue
+                # A static screen shown untranslated during an outage produces no new
+                # frames; its text goes straight back to translation once the backend recovers
+                retry = self.processor.take_retry()
+                if retry is not None:
+                    self.pipeline.submit(retry, stage='translate')
                 
-                # Process image and extract text
-                start_process = time.time()
-                extracted_text = self.process_image(image)
-                image.close()
+                # Block until the display produced a new frame - a static screen
+                # produces none, so there is nothing to wake up for
+                with tracer.span('wait_frame', 'capture'):
+                    luma = self.frame_source.next_frame(timeout=0.5)
+                if luma is None:
+                    continue
                 
-                # Check if we have valid text
-                if extracted_text and len(extracted_text.strip()) >= self.text_min_length:
-                    current_hash = hashlib.md5(extracted_text.encode('utf-8')).hexdigest()
-                    
-                    # Only process if text has changed
-                    if current_hash != last_text_hash:
-                        last_text_hash = current_hash
-                        
-                        # Translate text
-                        translated_text = self.translate_text(extracted_text)
-                        
-                        if translated_text:
-                            # Update overlay with translated text
-                            self.update_overlay_text(translated_text)
-                            
-                            # Add to history
-                            self.add_to_history(extracted_text, translated_text)
-                            
-                            # Update performance info occasionally
-                            if frames_processed % 10 == 0:
-                                self.update_performance_info()
+                # Change detection; unchanged frames never enter the pipeline
+                start_capture = time.time()
+                frame = self.processor.accept_frame(luma)
+                if frame is not None:
+                    self.pipeline.submit(frame)
                 
-                # Update timing
-                frames_processed += 1
-                last_process_time = time.time()
-                process_duration = last_process_time - start_process
+                # Schedule the next capture from stage latencies and the change rate
+                frames_captured += 1
+                self.capture_interval = self.scheduler.on_capture(
+                    changed=frame is not None,
+                    capture_seconds=self.frame_source.ingest_seconds + time.time() - start_capture
+                )
                 
-                # Adaptive interval adjustment
-                if process_duration > self.capture_interval * 1.2:
-                    # Slow down if processing is taking too long
-                    self.capture_interval = min(3.0, self.capture_interval * 1.1)
-                elif process_duration < self.capture_interval * 0.8:
-                    # Speed up if we have extra capacity
-                    self.capture_interval = max(0.8, self.capture_interval * 0.9)
+                if frames_captured % 30 == 0:
+                    logger.info(f"Pipeline stats: {self.pipeline.stats()}")
                 
                 # Reset error count on success
                 self.error_count = 0
                 
             except Exception as e:
                 self.error_count += 1
+                ERRORS.inc(stage='capture', type=type(e).__name__)
                 logger.error(f"Error in processing loop ({self.error_count}/{self.max_errors}): {e}")
                 
                 if self.error_count >= self.max_errors:
@@ -671,164 +913,94 @@ class ScreenTranslatorApp(MDApp):
                 else:
                     time.sleep(2.0)  # Wait before retrying
         
-        logger.info(f"Processing loop ended. Frames processed: {frames_processed}")
+        if not self.pipeline.stop():
+            # A stage is still inside OCR or a request; the pool closes its engine when it is returned
+            logger.warning("Pipeline stage still busy after stop timeout")
+        logger.info(f"Processing loop ended. Frames captured: {frames_captured}, "
+                    f"source: {self.frame_source.stats()}")
     
-    def process_image(self, image):
-        """Process Android Image and extract text using OCR"""
-        try:
-            # Get image dimensions
-            width = image.getWidth()
-            height = image.getHeight()
-            
-            # Get the first plane (should be RGBA)
-            plane = image.getPlanes()[0]
-            buffer = plane.getBuffer()
-            
-            # Create byte array
-            pixel_data = bytearray(buffer.remaining())
-            buffer.get(pixel_data)
-            
-            # Convert to numpy array and reshape
-            img_array = np.frombuffer(pixel_data, dtype=np.uint8).reshape((height, width, 4))
-            
-            # Convert RGBA to RGB for PIL
-            rgb_array = cv2.cvtColor(img_array, cv2.COLOR_RGBA2RGB)
-            
-            # Create PIL Image
-            pil_image = Image.fromarray(rgb_array)
-            
-            # Preprocess for better OCR
-            processed_image = self.preprocess_image(pil_image)
-            
-            # Perform OCR with multiple languages
-            config = '--oem 3 --psm 3'
-            text = pytesseract.image_to_string(
-                processed_image,
-                lang='eng+ara',  # English and Arabic
-                config=config
-            ).strip()
-            
-            # Clean up
-            del img_array, rgb_array, pixel_data
-            
-            return text
-            
-        except Exception as e:
-            logger.error(f"Image processing error: {e}")
-            return ""
+    # ==================== Pipeline Stages ====================
+    def ocr_stage(self, frame):
+        """OCR a captured frame; pass on text (and its lines) only if it is long enough and changed"""
+        text = self.processor.filter_text(self.processor.recognize_frame(frame))
+        if text is None:
+            return None
+        return text, self.processor.lines
     
-    def preprocess_image(self, image):
-        """Preprocess image for better OCR results"""
-        try:
-            # Convert to grayscale
-            gray = image.convert('L')
-            
-            # Resize for better performance while maintaining quality
-            if self.capture_resolution[0] < 0.8:
-                scale_factor = 1.5
-                new_width = int(gray.width * scale_factor)
-                new_height = int(gray.height * scale_factor)
-                gray = gray.resize((new_width, new_height), Image.Resampling.LANCZOS)
-            
-            # Apply contrast enhancement
-            from PIL import ImageEnhance
-            enhancer = ImageEnhance.Contrast(gray)
-            gray = enhancer.enhance(1.5)  # Increase contrast by 50%
-            
-            # Optional: Apply thresholding for binary image
-            # gray = gray.point(lambda x: 0 if x < 180 else 255, '1')
-            
-            return gray
-            
-        except Exception as e:
-            logger.warning(f"Image preprocessing error, using original: {e}")
-            return image.convert('L')
+    def translate_stage(self, item):
+        extracted_text, lines = item
+        translation = self.processor.translate(extracted_text)
+        if not translation.display:
+            return None
+        return extracted_text, lines, translation
     
-    def translate_text(self, text):
-        """Translate text with caching"""
-        try:
-            # Check cache first
-            cached = self.translation_cache.get(text)
-            if cached:
-                return cached
-            
-            # Check if text is already in target language (simple check)
-            if self.current_target_lang == 'ar' and self.is_arabic(text):
-                return text  # Already Arabic
-            
-            # Perform translation
-            translated = self.translator.translate(text)
-            
-            # Reshape Arabic text for proper display
-            if self.current_target_lang == 'ar':
-                translated = self.reshape_arabic_text(translated)
-            
-            # Cache the result
-            self.translation_cache.set(
-                text, 
-                translated, 
-                self.current_source_lang, 
-                self.current_target_lang
-            )
-            
-            return translated
-            
-        except Exception as e:
-            logger.error(f"Translation error: {e}")
-            return f"[خطأ في الترجمة]"
-    
-    def is_arabic(self, text):
-        """Check if text contains Arabic characters"""
-        arabic_range = range(0x0600, 0x06FF + 1)
-        for char in text:
-            if ord(char) in arabic_range:
-                return True
-        return False
-    
-    def reshape_arabic_text(self, text):
-        """Reshape Arabic text for proper display"""
-        try:
-            reshaped = arabic_reshaper.reshape(text)
-            return get_display(reshaped)
-        except:
-            return text
+    def render_stage(self, item):
+        extracted_text, lines, translation = item
+        
+        # Tracked here, in display order: a stale result from the other translate worker never gets this far
+        self.processor.track_fallback((extracted_text, lines), translation)
+        
+        # Place translations over their source lines, touching only regions that changed;
+        # fall back to the panel when lines and translation rows do not match up
+        regions = self.overlay_layout.build(lines, translation) if self.positioned_overlay else None
+        with tracer.span('ui_post', 'render'):
+            if regions is not None:
+                # The capture mirrors the overlay: those boxes are masked and keep this source text
+                self.processor.set_overlay_lines(lines)
+                self.overlay_presenter.show_regions(regions)
+            else:
+                self.processor.set_overlay_lines([])
+                self.overlay_presenter.show_text(translation.display, translation.raw)
+        
+        # Add to history (logical order)
+        self.add_to_history(extracted_text, translation.raw)
+        
+        # Update performance info occasionally
+        self.frames_rendered += 1
+        if self.frames_rendered % 10 == 1:
+            self.update_performance_info()
     
-    @run_on_ui_thread
-    def update_overlay_text(self, text):
-        """Update overlay text on UI thread"""
+    def on_stage_error(self, stage, error):
+        """Stop the service when a stage keeps failing"""
+        if stage.consecutive_errors >= self.max_errors and self.processing_active:
+            logger.critical(f"Stage {stage.name} failed repeatedly, stopping service")
+            self.show_android_toast("توقف الخدمة بسبب أخطاء متعددة")
+            self.stop_service()
+    
+    def update_overlay_text(self, text, raw_text=None):
+        """Update overlay panel text (UI thread, via the overlay presenter)"""
         if self.overlay_view and text:
-            self.overlay_view.setText(text)
-            
-            # Vibrate briefly for new translation
-            try:
-                activity = PythonActivity.mActivity
-                vibrator = activity.getSystemService(Context.VIBRATOR_SERVICE)
-                if vibrator and vibrator.hasVibrator():
-                    vibrator.vibrate(50)  # 50ms vibration
-            except:
-                pass
+            with tracer.span('set_text', 'ui'):
+                self.overlay_view.setText(text)
+            self.overlay_raw_text = raw_text
+            self.scroll_view.setVisibility(View.VISIBLE)
     
     def add_to_history(self, original, translated):
         """Add translation to history"""
-        entry = {
-            'timestamp': datetime.now().strftime("%H:%M:%S"),
-            'original': original[:100] + "..." if len(original) > 100 else original,
-            'translated': translated[:100] + "..." if len(translated) > 100 else translated,
-            'full_original': original,
-            'full_translated': translated
-        }
-        
-        self.translation_history.insert(0, entry)
-        
-        # Limit history size
-        if len(self.translation_history) > self.max_history_size:
-            self.translation_history = self.translation_history[:self.max_history_size]
+        self.translation_history.add(
+            original,
+            translated,
+            source=self.processor.current_source_lang,
+            target=self.processor.current_target_lang
+        )
+    
+    def search_history(self, query, limit=50):
+        """Search past translations (the whole on-disk log when it is open)"""
+        return self.translation_history.search(query, limit)
     
     # ==================== UI Methods ====================
     def update_performance_info(self):
         """Update performance information display"""
-        cache_stats = self.translation_cache.stats()
-        info = f"ذاكرة التخزين: {cache_stats['size']} | نجاح: {cache_stats['hit_rate']:.1f}%"
+        stats = self.processor.stats()
+        cache_stats = stats['cache']
+        frame_stats = stats['frames']
+        tile_stats = stats['tiles']
+        info = (
+            f"ذاكرة التخزين: {cache_stats['size']} | نجاح: {cache_stats['hit_rate']:.1f}% | "
+            f"إطارات متخطاة: {frame_stats['skips']}/{frame_stats['checks']} | "
+            f"مقاطع معاد استخدامها: {tile_stats['reuse_rate']:.0f}% | "
+            f"OCR: {FRAMES_OCR.total()}"
+        )
         self.performance_label.text = info
     
     def open_settings_dialog(self, *args):
@@ -872,6 +1044,57 @@ class ScreenTranslatorApp(MDApp):
         dialog.dismiss()
         self.show_android_toast("تم حفظ الإعدادات")
     
+    def open_history_dialog(self, *args):
+        """Open the history dialog: recent translations, searchable across the whole log"""
+        content = MDBoxLayout(
+            orientation='vertical',
+            spacing='10dp',
+            size_hint_y=None,
+            height='400dp'
+        )
+        
+        search_field = MDTextField(
+            hint_text="بحث في السجل",
+            size_hint_y=None,
+            height='48dp'
+        )
+        content.add_widget(search_field)
+        
+        results = MDList()
+        scroll = KivyScrollView()
+        scroll.add_widget(results)
+        content.add_widget(scroll)
+        
+        search_field.bind(on_text_validate=lambda field: self.show_history_entries(
+            results, self.search_history(field.text) if field.text.strip() else self.translation_history.recent()
+        ))
+        self.show_history_entries(results, self.translation_history.recent())
+        
+        dialog = MDDialog(
+            title="سجل الترجمة",
+            type="custom",
+            content_cls=content,
+            buttons=[
+                MDRaisedButton(
+                    text="إغلاق",
+                    on_release=lambda x: dialog.dismiss()
+                )
+            ]
+        )
+        dialog.open()
+    
+    def show_history_entries(self, results, entries):
+        """Fill the history list; tapping an entry copies its translation"""
+        results.clear_widgets()
+        for entry in entries:
+            results.add_widget(TwoLineListItem(
+                text=entry.translated_preview(60),
+                secondary_text=f"{entry.time_label} - {entry.original_preview(60)}",
+                on_release=lambda item, text=entry.translated: self.copy_to_clipboard(text)
+            ))
+        if not entries:
+            results.add_widget(OneLineListItem(text="لا توجد نتائج"))
+    
     # ==================== Utility Methods ====================
     @run_on_ui_thread
     def show_android_toast(self, message):
@@ -911,12 +1134,23 @@ class ScreenTranslatorApp(MDApp):
         except Exception as e:
             logger.warning(f"Error releasing wake lock: {e}")
         
+        try:
+            # Drop pending overlay updates and remove positioned regions
+            self.overlay_presenter.reset()
+            self.remove_region_views()
+            if self.region_container and self.wm:
+                self.wm.removeView(self.region_container)
+                self.region_container = None
+        except Exception as e:
+            logger.warning(f"Error removing overlay regions: {e}")
+        
         try:
             # Remove overlay view
             if self.scroll_view and self.wm:
                 self.wm.removeView(self.scroll_view)
                 self.scroll_view = None
                 self.overlay_view = None
+                self.overlay_raw_text = None
                 logger.info("Overlay view removed")
         except Exception as e:
             logger.warning(f"Error removing overlay: {e}")
@@ -939,6 +1173,18 @@ class ScreenTranslatorApp(MDApp):
         except Exception as e:
             logger.warning(f"Error stopping projection: {e}")
         
+        try:
+            # Stop frame delivery; a parked image is closed with the mailbox
+            if self.image_reader:
+                self.image_reader.setOnImageAvailableListener(None, None)
+            self.frame_source.stop()
+            if self.image_thread:
+                self.image_thread.quitSafely()
+                self.image_thread = None
+            self.image_listener = None
+        except Exception as e:
+            logger.warning(f"Error stopping frame delivery: {e}")
+        
         try:
             # Close image reader
             if self.image_reader:
@@ -948,11 +1194,22 @@ class ScreenTranslatorApp(MDApp):
         except Exception as e:
             logger.warning(f"Error closing image reader: {e}")
         
-        # Clear cache
-        self.translation_cache.clear()
+        try:
+            # Close the translation session (pooled keep-alive connections)
+            if self.processor.translator:
+                self.processor.translator.close()
+                self.processor.translator = None
+        except Exception as e:
+            logger.warning(f"Error closing translator: {e}")
+        
+        # Release OCR engines and clear in-memory caches
+        # (models reload lazily, persisted translations are re-warmed on next start);
+        # an engine a stage thread still has checked out is closed when it comes back
+        self.processor.reset()
         
         # Reset state
         self.service_active = False
+        self.frames_rendered = 0
         self.processing_active = False
         self.error_count = 0
         
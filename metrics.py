@@ -0,0 +1,260 @@
+import logging
+import math
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger(__name__)
+
+
+def _label_key(labels):
+    return tuple(sorted(labels.items()))
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(key):
+    if not key:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in key) + "}"
+
+
+# ==================== Metric Types ====================
+class Counter:
+    """Monotonic counter, optionally split by labels"""
+    kind = 'counter'
+
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help = help_text
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = _label_key(labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def value(self, **labels):
+        return self.values.get(_label_key(labels), 0)
+
+    def total(self):
+        return sum(self.values.values())
+
+    def samples(self):
+        with self.lock:
+            return [(self.name, key, value) for key, value in self.values.items()]
+
+
+class Gauge:
+    """Point-in-time value, either set explicitly or read from a callback at scrape time"""
+    kind = 'gauge'
+
+    def __init__(self, name, help_text, func=None):
+        self.name = name
+        self.help = help_text
+        self.func = func  # Callable returning a number or [(labels_dict, value), ...]
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def set(self, value, **labels):
+        with self.lock:
+            self.values[_label_key(labels)] = value
+
+    def samples(self):
+        if self.func:
+            try:
+                result = self.func()
+            except Exception as e:
+                logger.warning(f"Gauge {self.name} callback failed: {e}")
+                return []
+            if isinstance(result, (int, float)):
+                return [(self.name, (), result)]
+            return [(self.name, _label_key(labels), value) for labels, value in result]
+        with self.lock:
+            return [(self.name, key, value) for key, value in self.values.items()]
+
+
+class Histogram:
+    """HDR-style log-linear latency histogram (seconds), ~6% relative bucket width"""
+    kind = 'histogram'
+    SUB_BUCKETS = 16  # Linear sub-buckets per power of two
+    MIN_VALUE = 1e-6  # 1 microsecond resolution
+    # Bucket boundaries exported to Prometheus (cumulative "le" buckets)
+    EXPORT_BOUNDS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help = help_text
+        self.series = {}  # label key -> [bucket counts dict, count, sum, max]
+        self.lock = threading.Lock()
+
+    def _index(self, value):
+        units = max(1.0, value / self.MIN_VALUE)
+        exponent = int(math.log2(units))
+        sub = int((units / (1 << exponent) - 1.0) * self.SUB_BUCKETS)
+        return exponent * self.SUB_BUCKETS + sub
+
+    def _upper_bound(self, index):
+        exponent, sub = divmod(index, self.SUB_BUCKETS)
+        return (1 << exponent) * (1.0 + (sub + 1) / self.SUB_BUCKETS) * self.MIN_VALUE
+
+    def observe(self, value, **labels):
+        key = _label_key(labels)
+        index = self._index(value)
+        with self.lock:
+            series = self.series.get(key)
+            if series is None:
+                series = self.series[key] = [{}, 0, 0.0, 0.0]
+            buckets = series[0]
+            buckets[index] = buckets.get(index, 0) + 1
+            series[1] += 1
+            series[2] += value
+            series[3] = max(series[3], value)
+
+    def quantile(self, q, **labels):
+        """Approximate quantile (upper bucket bound) for one label set"""
+        with self.lock:
+            series = self.series.get(_label_key(labels))
+            if not series or not series[1]:
+                return 0.0
+            target = q * series[1]
+            seen = 0
+            for index in sorted(series[0]):
+                seen += series[0][index]
+                if seen >= target:
+                    return min(self._upper_bound(index), series[3])
+            return series[3]
+
+    def samples(self):
+        samples = []
+        with self.lock:
+            for key, (buckets, count, total, _) in self.series.items():
+                cumulative = 0
+                ordered = sorted(buckets.items())
+                position = 0
+                for bound in self.EXPORT_BOUNDS:
+                    while position < len(ordered) and self._upper_bound(ordered[position][0]) <= bound:
+                        cumulative += ordered[position][1]
+                        position += 1
+                    samples.append((f"{self.name}_bucket", key + (('le', bound),), cumulative))
+                samples.append((f"{self.name}_bucket", key + (('le', '+Inf'),), count))
+                samples.append((f"{self.name}_count", key, count))
+                samples.append((f"{self.name}_sum", key, total))
+        return samples
+
+
+# ==================== Registry ====================
+class MetricsRegistry:
+    """Named counters, gauges and histograms with Prometheus text export"""
+    def __init__(self):
+        self.metrics = {}
+        self.lock = threading.Lock()
+
+    def _get_or_create(self, cls, name, help_text, **kwargs):
+        with self.lock:
+            metric = self.metrics.get(name)
+            if metric is None:
+                metric = self.metrics[name] = cls(name, help_text, **kwargs)
+            return metric
+
+    def counter(self, name, help_text=""):
+        return self._get_or_create(Counter, name, help_text)
+
+    def gauge(self, name, help_text="", func=None):
+        gauge = self._get_or_create(Gauge, name, help_text)
+        if func is not None:
+            gauge.func = func
+        return gauge
+
+    def histogram(self, name, help_text=""):
+        return self._get_or_create(Histogram, name, help_text)
+
+    def render_prometheus(self):
+        lines = []
+        for metric in list(self.metrics.values()):
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, key, value in metric.samples():
+                lines.append(f"{name}{_format_labels(key)} {value}")
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self):
+        """Plain dict of counter totals and gauge values, for the UI and benchmarks"""
+        result = {}
+        for metric in list(self.metrics.values()):
+            if isinstance(metric, Counter):
+                result[metric.name] = metric.total()
+            elif isinstance(metric, Gauge):
+                for name, key, value in metric.samples():
+                    result[name + _format_labels(key)] = value
+            else:
+                for key in list(metric.series):
+                    labels = dict(key)
+                    result[metric.name + _format_labels(key) + "_p50"] = metric.quantile(0.5, **labels)
+                    result[metric.name + _format_labels(key) + "_p99"] = metric.quantile(0.99, **labels)
+        return result
+
+
+# ==================== HTTP Endpoint ====================
+class MetricsServer:
+    """Optional localhost endpoint serving /metrics in Prometheus text format"""
+    def __init__(self, registry, port=9464, host='127.0.0.1'):
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self.server = None
+        self.thread = None
+
+    def start(self):
+        registry = self.registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                body = registry.render_prometheus().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self.port = self.server.server_address[1]
+        self.thread = threading.Thread(
+            target=self.server.serve_forever,
+            daemon=True,
+            name="MetricsServer"
+        )
+        self.thread.start()
+        logger.info(f"Metrics endpoint: http://{self.host}:{self.port}/metrics")
+
+    def stop(self):
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+            self.thread = None
+
+
+# Process-wide registry used by all modules
+metrics = MetricsRegistry()
+
+FRAMES_CAPTURED = metrics.counter('frames_captured_total', "Frames read from the capture source")
+FRAMES_SKIPPED = metrics.counter('frames_skipped_total', "Frames skipped by change detection")
+FRAMES_OCR = metrics.counter('frames_ocr_total', "Frames sent through OCR")
+FRAMES_SCROLLED = metrics.counter('frames_scrolled_total', "Frames recognized as a scroll of the previous one")
+REGIONS_REUSED = metrics.counter('ocr_regions_reused_total', "Text lines carried across a scroll instead of re-OCRed")
+TRANSLATION_CALLS = metrics.counter('translation_calls_total', "Requests sent to the translation backend")
+TRANSLATION_BYTES = metrics.counter('translation_bytes_sent_total', "UTF-8 bytes sent for translation")
+TRANSLATION_RETRIES = metrics.counter('translation_retries_total', "Translation requests retried after a transient failure")
+TRANSLATION_FALLBACKS = metrics.counter('translation_fallbacks_total', "Segments shown untranslated because the backend failed")
+TRANSLATION_DEDUPED = metrics.counter('translation_singleflight_saved_total', "Backend calls saved by joining an identical in-flight request")
+ERRORS = metrics.counter('errors_total', "Errors by stage and exception type")
+STAGE_LATENCY = metrics.histogram('stage_latency_seconds', "Per-stage processing latency")
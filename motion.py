@@ -0,0 +1,140 @@
+import cv2
+import numpy as np
+
+
+# ==================== Scroll Estimation ====================
+class MotionEstimator:
+    """Detect a whole-screen scroll between consecutive frames by phase correlation
+
+    Frames are downsampled before the FFT and the coarse shift is refined to
+    the exact pixel at full resolution. A shift is accepted only if it is
+    (nearly) axis-aligned and the overlapping parts of both frames actually
+    agree once shifted, so content changes and animations are not mistaken
+    for scrolling.
+    """
+    def __init__(self, max_width=360, min_response=0.1, max_residual=6.0, min_overlap=0.25):
+        self.max_width = max_width
+        self.min_response = min_response  # Phase correlation peak strength
+        self.max_residual = max_residual  # Mean luma difference over the overlap
+        self.min_overlap = min_overlap  # Fraction of the frame both frames must share
+        self.last = None  # Downsampled float32 reference frame
+        self.last_gray = None  # Full-resolution reference for refinement
+        self.window = None
+        self.estimates = 0
+        self.scrolls = 0
+        self.rejected = 0
+
+    def _downsample(self, gray):
+        scale = 1
+        small = gray
+        while small.shape[1] > self.max_width:
+            small = cv2.pyrDown(small)
+            scale *= 2
+        return small.astype(np.float32), scale
+
+    def estimate(self, gray):
+        """(dx, dy) in `gray` pixels that content moved since the previous frame, or None
+
+        (0, 0) means no motion; None means the change is not a scroll. The
+        frame always becomes the new reference.
+        """
+        small, scale = self._downsample(gray)
+        last, self.last = self.last, small
+        last_gray, self.last_gray = self.last_gray, gray.copy()
+        if last_gray is None or last_gray.shape != gray.shape:
+            return None
+
+        self.estimates += 1
+        if self.window is None or self.window.shape != small.shape:
+            self.window = cv2.createHanningWindow(small.shape[::-1], cv2.CV_32F)
+        (dx, dy), response = cv2.phaseCorrelate(last, small, self.window)
+
+        # Scrolling moves content along one axis; a little drift on the other is noise
+        if max(abs(dx), abs(dy)) < 0.5:
+            return (0, 0)
+        if min(abs(dx), abs(dy)) > 1.5:
+            self.rejected += 1
+            return None
+        if abs(dy) >= abs(dx):
+            dx, dy = 0, int(round(dy * scale))
+        else:
+            dx, dy = int(round(dx * scale)), 0
+
+        height, width = gray.shape[:2]
+        if (height - abs(dy)) * (width - abs(dx)) < self.min_overlap * height * width:
+            self.rejected += 1
+            return None
+        if response < self.min_response:
+            self.rejected += 1
+            return None
+
+        # The coarse estimate is only good to about one downsampled pixel
+        candidates = [(dx + d, 0) if dx else (0, dy + d) for d in range(-scale, scale + 1)]
+        residual, dx, dy = min((self.residual(last_gray, gray, cx, cy), cx, cy) for cx, cy in candidates)
+        if residual > self.max_residual:
+            self.rejected += 1
+            return None
+
+        self.scrolls += 1
+        return (dx, dy)
+
+    @staticmethod
+    def residual(previous, current, dx, dy):
+        """Mean absolute difference of the region both frames show after the shift (sampled)"""
+        height, width = previous.shape[:2]
+        old = previous[max(0, -dy):height - max(0, dy):4, max(0, -dx):width - max(0, dx):2]
+        new = current[max(0, dy):height - max(0, -dy):4, max(0, dx):width - max(0, -dx):2]
+        return float(np.abs(old.astype(np.int16) - new).mean())
+
+    def reset(self):
+        self.last = None
+        self.last_gray = None
+        self.estimates = 0
+        self.scrolls = 0
+        self.rejected = 0
+
+    def stats(self):
+        return {
+            'estimates': self.estimates,
+            'scrolls': self.scrolls,
+            'rejected': self.rejected
+        }
+
+
+# ==================== Region Reuse ====================
+def shift_regions(regions, dx, dy, shape, edge=4):
+    """Carry recognized regions (OCRLine) across a scroll
+
+    Returns the regions that are still fully on screen with their boxes
+    moved, and the (x, y, w, h) area that still needs detection and OCR:
+    the newly exposed strip plus any line that was cut by the frame edge
+    before the scroll.
+    """
+    height, width = shape[:2]
+    kept = []
+    for region in regions:
+        x, y, w, h = region.box
+        # Lines touching the old frame edge may have been cut off - OCR them again
+        if dy and (y <= edge or y + h >= height - edge):
+            continue
+        if dx and (x <= edge or x + w >= width - edge):
+            continue
+        nx, ny = x + dx, y + dy
+        if nx >= 0 and ny >= 0 and nx + w <= width and ny + h <= height:
+            kept.append(region._replace(box=(nx, ny, w, h)))
+
+    # The rest of the screen, beyond the kept lines in the direction of the scroll
+    boxes = [region.box for region in kept]
+    if dy < 0:
+        top = max([y + h for _, y, _, h in boxes], default=0)
+        area = (0, top, width, height - top)
+    elif dy > 0:
+        bottom = min([y for _, y, _, _ in boxes], default=height)
+        area = (0, 0, width, bottom)
+    elif dx < 0:
+        left = max([x + w for x, _, w, _ in boxes], default=0)
+        area = (left, 0, width - left, height)
+    else:
+        right = min([x for x, _, _, _ in boxes], default=width)
+        area = (0, 0, right, height)
+    return kept, area
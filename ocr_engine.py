@@ -0,0 +1,297 @@
+import logging
+import os
+import queue
+import threading
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Optional resident Tesseract C-API binding; pytesseract (subprocess per call) is the fallback
+try:
+    import tesserocr
+except ImportError:
+    tesserocr = None
+
+import pytesseract
+
+# One recognized text line: box is (x, y, w, h) in image pixels, confidence 0-100 (None if unknown)
+OCRLine = namedtuple('OCRLine', ['text', 'box', 'confidence'])
+
+
+def merge_lines(lines, box=None):
+    """One OCRLine covering several, words joined in order; `box` overrides their union"""
+    texts = [line.text for line in lines if line.text]
+    if box is None and lines:
+        x0 = min(line.box[0] for line in lines)
+        y0 = min(line.box[1] for line in lines)
+        x1 = max(line.box[0] + line.box[2] for line in lines)
+        y1 = max(line.box[1] + line.box[3] for line in lines)
+        box = (x0, y0, x1 - x0, y1 - y0)
+    confidences = [line.confidence for line in lines if line.text and line.confidence is not None]
+    confidence = sum(confidences) / len(confidences) if confidences else None
+    return OCRLine(" ".join(texts), box, confidence)
+
+
+# ==================== OCR Engines ====================
+class OCREngine:
+    """Base class for OCR backends working on 2D uint8 numpy frames"""
+    name = 'base'
+
+    def __init__(self, lang='eng+ara'):
+        self.lang = lang  # Default language string, each call may override it
+
+    def recognize(self, image, psm=6, lang=None):
+        raise NotImplementedError
+
+    def recognize_lines(self, image, psm=6, lang=None):
+        """Text lines with boxes and confidences; engines without layout output span the image"""
+        height, width = image.shape[:2]
+        return [OCRLine(line.strip(), (0, 0, width, height), None)
+                for line in self.recognize(image, psm, lang).splitlines() if line.strip()]
+
+    def detect_script(self, image):
+        """Tesseract OSD script name for an image, or None if unsupported/unsure"""
+        return None
+
+    def close(self):
+        pass
+
+
+class TesserocrEngine(OCREngine):
+    """Long-lived Tesseract handles: language models are loaded once and reused
+
+    One handle per language string (Tesseract fixes languages at Init), the
+    least recently used one is released beyond `max_handles`.
+    """
+    name = 'tesserocr'
+
+    def __init__(self, lang='eng+ara', tessdata=None, max_handles=3):
+        super().__init__(lang)
+        self.tessdata = tessdata
+        self.max_handles = max_handles
+        self.apis = OrderedDict()  # lang -> PyTessBaseAPI
+        self.osd_api = None
+        self._api(lang)  # Load the default model now so a missing language fails at startup
+
+    def _create(self, lang, **kwargs):
+        if self.tessdata:
+            kwargs['path'] = self.tessdata
+        return tesserocr.PyTessBaseAPI(lang=lang, **kwargs)
+
+    def _api(self, lang):
+        api = self.apis.get(lang)
+        if api is not None:
+            self.apis.move_to_end(lang)
+            return api
+        api = self.apis[lang] = self._create(lang, oem=tesserocr.OEM.LSTM_ONLY)
+        if len(self.apis) > self.max_handles:
+            _, oldest = self.apis.popitem(last=False)
+            oldest.End()
+        return api
+
+    def _set_image(self, api, image):
+        image = np.ascontiguousarray(image)
+        height, width = image.shape[:2]
+        bytes_per_pixel = 1 if image.ndim == 2 else image.shape[2]
+        # Hand the numpy buffer straight to Tesseract - no PIL image, no temp file
+        api.SetImageBytes(image.tobytes(), width, height, bytes_per_pixel, image.strides[0])
+
+    def recognize(self, image, psm=6, lang=None):
+        api = self._api(lang or self.lang)
+        api.SetPageSegMode(psm)
+        self._set_image(api, image)
+        text = api.GetUTF8Text()
+        api.Clear()
+        return text
+
+    def recognize_lines(self, image, psm=6, lang=None):
+        api = self._api(lang or self.lang)
+        api.SetPageSegMode(psm)
+        self._set_image(api, image)
+        api.Recognize()
+        level = tesserocr.RIL.TEXTLINE
+        lines = []
+        for result in tesserocr.iterate_level(api.GetIterator(), level):
+            text = (result.GetUTF8Text(level) or "").strip()
+            bounds = result.BoundingBox(level)
+            if text and bounds:
+                x0, y0, x1, y1 = bounds
+                lines.append(OCRLine(text, (x0, y0, x1 - x0, y1 - y0), result.Confidence(level)))
+        api.Clear()
+        return lines
+
+    def detect_script(self, image):
+        if self.osd_api is None:
+            self.osd_api = self._create('osd', psm=tesserocr.PSM.OSD_ONLY)
+        self._set_image(self.osd_api, image)
+        result = self.osd_api.DetectOrientationScript()
+        self.osd_api.Clear()
+        return result['script_name'] if result else None
+
+    def close(self):
+        for api in self.apis.values():
+            api.End()
+        self.apis.clear()
+        if self.osd_api:
+            self.osd_api.End()
+            self.osd_api = None
+
+
+class PytesseractEngine(OCREngine):
+    """Fallback engine: spawns the tesseract binary for every call"""
+    name = 'pytesseract'
+
+    def recognize(self, image, psm=6, lang=None):
+        return pytesseract.image_to_string(
+            image,
+            lang=lang or self.lang,
+            config=f'--oem 3 --psm {psm}'
+        )
+
+    def recognize_lines(self, image, psm=6, lang=None):
+        data = pytesseract.image_to_data(
+            image,
+            lang=lang or self.lang,
+            config=f'--oem 3 --psm {psm}',
+            output_type=pytesseract.Output.DICT
+        )
+        # Words come back in reading order, tagged with their block/paragraph/line
+        words = OrderedDict()
+        for i, text in enumerate(data['text']):
+            if not text.strip():
+                continue
+            key = (data['block_num'][i], data['par_num'][i], data['line_num'][i])
+            confidence = float(data['conf'][i])
+            box = (data['left'][i], data['top'][i], data['width'][i], data['height'][i])
+            words.setdefault(key, []).append(OCRLine(text.strip(), box, confidence if confidence >= 0 else None))
+        return [merge_lines(line) for line in words.values()]
+
+    def detect_script(self, image):
+        try:
+            return pytesseract.image_to_osd(image, output_type=pytesseract.Output.DICT)['script']
+        except pytesseract.TesseractError:
+            return None  # Too few characters, or osd.traineddata is missing
+
+
+def create_engine(lang='eng+ara', tessdata=None, prefer_resident=True):
+    """Create the best available engine, falling back to pytesseract"""
+    if prefer_resident and tesserocr is not None:
+        try:
+            return TesserocrEngine(lang, tessdata)
+        except Exception as e:
+            logger.warning(f"tesserocr unavailable, falling back to pytesseract: {e}")
+    return PytesseractEngine(lang)
+
+
+# ==================== Engine Pool ====================
+def default_pool_size(reserve=1, limit=4):
+    """Engines to run in parallel: the usable cores minus `reserve` for capture and UI
+
+    Capped at `limit` because every engine holds its own copy of the language
+    models (tens of MB each for eng+ara).
+    """
+    try:
+        cores = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cores = os.cpu_count() or 1
+    return max(1, min(limit, cores - reserve))
+
+
+class OCREnginePool:
+    """Pool of long-lived engines that can be used from several threads
+
+    Tesseract recognition is single-threaded per call; tesserocr releases the
+    GIL while recognizing and pytesseract runs a subprocess, so `map` keeps
+    one job per engine in flight and uses several cores at once.
+    """
+    def __init__(self, size=None, lang='eng+ara', tessdata=None, prefer_resident=True, factory=None):
+        self.size = size or default_pool_size()
+        self.factory = factory  # Optional callable returning a new engine
+        self.lang = lang
+        self.tessdata = tessdata
+        self.prefer_resident = prefer_resident
+        self.engines = []
+        self.idle = queue.Queue()
+        self.executor = None
+        self.lock = threading.Lock()
+
+    def _ensure_started(self):
+        # Engines are created lazily so model loading happens off the UI thread
+        with self.lock:
+            if self.engines:
+                return
+            if self.size > 1:
+                # Engines already run in parallel; Tesseract's own OpenMP threads would
+                # only oversubscribe the cores (read by tesseract subprocesses)
+                os.environ.setdefault('OMP_THREAD_LIMIT', '1')
+                self.executor = ThreadPoolExecutor(max_workers=self.size, thread_name_prefix="OCRWorker")
+            for _ in range(self.size):
+                if self.factory:
+                    engine = self.factory()
+                else:
+                    engine = create_engine(self.lang, self.tessdata, self.prefer_resident)
+                self.engines.append(engine)
+                self.idle.put(engine)
+            logger.info(f"OCR pool started: {self.size} x {self.engines[0].name}")
+
+    @property
+    def engine_name(self):
+        return self.engines[0].name if self.engines else None
+
+    @contextmanager
+    def engine(self):
+        """Borrow an engine for the duration of the block"""
+        self._ensure_started()
+        idle = self.idle
+        engine = idle.get()
+        try:
+            yield engine
+        finally:
+            if idle is self.idle:
+                idle.put(engine)
+            else:
+                engine.close()  # The pool was closed while this engine was busy
+
+    def recognize(self, image, psm=6, lang=None):
+        with self.engine() as engine:
+            return engine.recognize(image, psm, lang)
+
+    def recognize_lines(self, image, psm=6, lang=None):
+        with self.engine() as engine:
+            return engine.recognize_lines(image, psm, lang)
+
+    def detect_script(self, image):
+        with self.engine() as engine:
+            return engine.detect_script(image)
+
+    def map(self, recognize, jobs):
+        """Run recognize(image, psm) for (image, psm) jobs across the pool; results keep job order
+
+        Jobs are dispatched largest first so a big tile does not start last and
+        leave the other engines idle at the end of the frame.
+        """
+        self._ensure_started()
+        if self.executor is None or len(jobs) < 2:
+            return [recognize(image, psm) for image, psm in jobs]
+
+        order = sorted(range(len(jobs)), key=lambda i: jobs[i][0].size, reverse=True)
+        futures = {i: self.executor.submit(recognize, *jobs[i]) for i in order}
+        return [futures[i].result() for i in range(len(jobs))]
+
+    def close(self):
+        """Close idle engines now; an engine still checked out is closed when it is returned"""
+        with self.lock:
+            if self.executor:
+                self.executor.shutdown(wait=False, cancel_futures=True)
+                self.executor = None
+            idle, self.idle = self.idle, queue.Queue()
+            while True:
+                try:
+                    idle.get_nowait().close()
+                except queue.Empty:
+                    break
+            self.engines = []
@@ -0,0 +1,93 @@
+from collections import namedtuple
+
+from translation_cache import normalize_text
+
+# One translated line placed over its source line: box is (x, y, w, h) in screen pixels
+OverlayRegion = namedtuple('OverlayRegion', ['key', 'box', 'raw', 'display'])
+
+# What a renderer has to do to go from the shown regions to the new ones
+OverlayDiff = namedtuple('OverlayDiff', ['added', 'changed', 'moved', 'removed'])
+
+
+# ==================== Overlay Render Model ====================
+class OverlayLayout:
+    """Map translated lines back onto the screen and diff them against what is shown
+
+    A region is identified by its source line (and which occurrence of that
+    line it is), so a scrolled line is only moved, a retranslated line only
+    gets new text, and untouched lines cost the renderer nothing.
+    """
+    def __init__(self, scale=(1.0, 1.0), max_regions=40):
+        self.scale = scale  # Screen pixels per frame pixel (x, y)
+        self.max_regions = max_regions
+        self.regions = {}  # key -> OverlayRegion currently shown
+        self.updates = 0
+        self.added = 0
+        self.changed = 0
+        self.moved = 0
+        self.removed = 0
+        self.unchanged = 0
+
+    def build(self, lines, translation):
+        """Regions for OCR lines (frame pixels) and their Translation, or None if they do not line up
+
+        The translated text holds one row per non-blank source line; an error
+        text or a provider that merged lines makes positioning impossible.
+        """
+        sources = [line for line in lines if normalize_text(line.text)]
+        raw_rows = translation.raw.split("\n")
+        display_rows = translation.display.split("\n")
+        if not sources or len(raw_rows) != len(sources) or len(display_rows) != len(sources):
+            return None
+        if len(sources) > self.max_regions:
+            return None
+
+        scale_x, scale_y = self.scale
+        occurrences = {}
+        regions = []
+        for line, raw, display in zip(sources, raw_rows, display_rows):
+            text = normalize_text(line.text)
+            occurrence = occurrences[text] = occurrences.get(text, -1) + 1
+            x, y, w, h = line.box
+            box = (int(x * scale_x), int(y * scale_y), int(w * scale_x), int(h * scale_y))
+            regions.append(OverlayRegion((text, occurrence), box, raw, display))
+        return regions
+
+    def update(self, regions):
+        """Make `regions` the shown set and return the diff a renderer has to apply"""
+        current = {region.key: region for region in regions}
+        added, changed, moved = [], [], []
+        for key, region in current.items():
+            shown = self.regions.get(key)
+            if shown is None:
+                added.append(region)
+            elif shown.display != region.display:
+                changed.append(region)
+            elif shown.box != region.box:
+                moved.append(region)
+            else:
+                self.unchanged += 1
+        removed = [region for key, region in self.regions.items() if key not in current]
+
+        self.regions = current
+        self.updates += 1
+        self.added += len(added)
+        self.changed += len(changed)
+        self.moved += len(moved)
+        self.removed += len(removed)
+        return OverlayDiff(added, changed, moved, removed)
+
+    def clear(self):
+        """Forget the shown regions; the next update re-adds everything"""
+        self.regions = {}
+
+    def stats(self):
+        return {
+            'shown': len(self.regions),
+            'updates': self.updates,
+            'added': self.added,
+            'changed': self.changed,
+            'moved': self.moved,
+            'removed': self.removed,
+            'unchanged': self.unchanged
+        }
@@ -0,0 +1,158 @@
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+# ==================== Overlay Sinks ====================
+class OverlaySink:
+    """Where the presenter draws; every method is called on the UI thread"""
+
+    def show_text(self, display, raw):
+        """Show translated text in the panel (display form; raw is the logical order)"""
+        raise NotImplementedError
+
+    def apply_regions(self, diff):
+        """Apply an OverlayDiff to the positioned region views"""
+        raise NotImplementedError
+
+    def vibrate(self, milliseconds):
+        pass
+
+
+class FakeOverlaySink(OverlaySink):
+    """Records what would be drawn, for benchmarks and tests without Android"""
+    def __init__(self):
+        self.texts = []
+        self.diffs = []
+        self.region_ops = 0  # Views a positioned overlay had to touch
+        self.vibrations = 0
+
+    def show_text(self, display, raw):
+        self.texts.append(display)
+
+    def apply_regions(self, diff):
+        self.diffs.append(diff)
+        self.region_ops += sum(len(regions) for regions in diff)
+
+    def vibrate(self, milliseconds):
+        self.vibrations += 1
+
+    @property
+    def renders(self):
+        return len(self.texts) + len(self.diffs)
+
+
+# ==================== Overlay Presenter ====================
+class OverlayPresenter:
+    """Coalesce overlay updates into at most one UI post per display frame
+
+    Producers (the render stage) only record the latest wanted state; the
+    first update after a flush schedules one `post(flush)` and later ones
+    ride along with it. The flush runs on the UI thread, diffs regions
+    through the layout, skips text that is already shown and rate-limits
+    haptic feedback.
+    """
+    def __init__(self, sink, layout, post=None, haptic_ms=50, haptic_interval=3.0, clock=time.monotonic):
+        self.sink = sink
+        self.layout = layout  # OverlayLayout; its shown state is only touched by flush
+        self.post = post  # Callable scheduling a callable on the UI thread (next frame); None = flush now
+        self.haptic_ms = haptic_ms
+        self.haptic_interval = haptic_interval  # Minimum seconds between vibrations
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.pending = None  # ('text', display, raw) or ('regions', regions, None)
+        self.scheduled = False
+        self.shown_text = None
+        self.last_haptic = None
+        self.updates = 0
+        self.posts = 0
+        self.flushes = 0
+        self.coalesced = 0
+        self.noops = 0
+        self.haptics = 0
+        self.haptics_suppressed = 0
+
+    def show_text(self, display, raw=None):
+        self._submit(('text', display, raw))
+
+    def show_regions(self, regions):
+        self._submit(('regions', regions, None))
+
+    def _submit(self, update):
+        with self.lock:
+            self.updates += 1
+            if self.pending is not None:
+                self.coalesced += 1  # Superseded before it was drawn
+            self.pending = update
+            if self.scheduled:
+                return
+            self.scheduled = True
+            self.posts += 1
+        if self.post:
+            self.post(self.flush)
+        else:
+            self.flush()
+
+    def flush(self):
+        """Draw the latest pending update (UI thread)"""
+        with self.lock:
+            update, self.pending = self.pending, None
+            self.scheduled = False
+        if update is None:
+            return
+        self.flushes += 1
+
+        kind, content, raw = update
+        if kind == 'regions':
+            diff = self.layout.update(content)
+            if not any(diff):
+                self.noops += 1
+                return
+            self.sink.apply_regions(diff)
+            self.shown_text = None  # The panel is hidden while regions are shown
+            fresh = bool(diff.added or diff.changed)
+        else:
+            if self.layout.regions:
+                self.sink.apply_regions(self.layout.update([]))
+            if not content or content == self.shown_text:
+                self.noops += 1
+                return
+            self.sink.show_text(content, raw)
+            self.shown_text = content
+            fresh = True
+
+        if fresh:
+            self._haptic()
+
+    def _haptic(self):
+        now = self.clock()
+        if self.last_haptic is not None and now - self.last_haptic < self.haptic_interval:
+            self.haptics_suppressed += 1
+            return
+        self.last_haptic = now
+        self.haptics += 1
+        try:
+            self.sink.vibrate(self.haptic_ms)
+        except Exception as e:
+            logger.debug(f"Vibration failed: {e}")
+
+    def reset(self):
+        """Drop anything pending and forget what is shown"""
+        with self.lock:
+            self.pending = None
+            self.scheduled = False
+        self.shown_text = None
+        self.layout.clear()
+
+    def stats(self):
+        return {
+            'updates': self.updates,
+            'posts': self.posts,
+            'flushes': self.flushes,
+            'coalesced': self.coalesced,
+            'noops': self.noops,
+            'haptics': self.haptics,
+            'haptics_suppressed': self.haptics_suppressed
+        }
@@ -0,0 +1,202 @@
+import logging
+import threading
+import time
+from collections import deque
+
+from tracing import tracer
+from metrics import metrics, STAGE_LATENCY, ERRORS
+
+logger = logging.getLogger(__name__)
+
+
+# ==================== Latest-Wins Queue ====================
+class LatestQueue:
+    """Bounded queue that drops the oldest item instead of blocking the producer"""
+    def __init__(self, maxsize=1):
+        self.items = deque()
+        self.maxsize = maxsize
+        self.cond = threading.Condition()
+        self.closed = False
+        self.dropped = 0
+        self.max_depth = 0
+
+    def put(self, item):
+        with self.cond:
+            if len(self.items) >= self.maxsize:
+                self.items.popleft()  # Stale - a newer item supersedes it
+                self.dropped += 1
+            self.items.append(item)
+            self.max_depth = max(self.max_depth, len(self.items))
+            self.cond.notify()
+
+    def get(self, timeout=None):
+        """Return the next item, or None on timeout/close"""
+        with self.cond:
+            if not self.items and not self.closed:
+                self.cond.wait(timeout)
+            if self.items:
+                return self.items.popleft()
+            return None
+
+    def close(self):
+        with self.cond:
+            self.closed = True
+            self.items.clear()
+            self.cond.notify_all()
+
+    def reopen(self):
+        with self.cond:
+            self.closed = False
+
+    def __len__(self):
+        return len(self.items)
+
+
+# ==================== Pipeline Stage ====================
+class Stage:
+    """Pipeline stage: worker thread(s) applying `func` to items from a latest-wins input queue
+
+    `func` returns the item for the next stage, or None to drop it.
+    """
+    def __init__(self, name, func, workers=1, maxsize=1):
+        self.name = name
+        self.func = func
+        self.workers = workers
+        self.input = LatestQueue(maxsize)
+        self.output = None  # Next stage's input queue
+        self.threads = []
+        self.active = False
+        self.on_error = None
+        self.on_complete = None  # Called with (stage name, seconds) after each item
+        self.lock = threading.Lock()
+        self.last_seq = -1  # Highest sequence number emitted, for stale-result dropping
+        self.started_at = 0
+        self.processed = 0
+        self.filtered = 0
+        self.stale = 0
+        self.errors = 0
+        self.consecutive_errors = 0
+        self.busy_time = 0.0
+        self.last_duration = 0.0
+
+    def start(self):
+        self.active = True
+        self.input.reopen()
+        self.started_at = time.time()
+        self.threads = [
+            threading.Thread(target=self._worker, daemon=True, name=f"Stage-{self.name}-{i}")
+            for i in range(self.workers)
+        ]
+        for thread in self.threads:
+            thread.start()
+
+    def stop(self, timeout=3.0):
+        """Stop the workers; False if one is still busy after `timeout`"""
+        self.active = False
+        self.input.close()
+        current = threading.current_thread()
+        for thread in self.threads:
+            if thread is not current:
+                thread.join(timeout=timeout)
+        stopped = not any(thread.is_alive() and thread is not current for thread in self.threads)
+        self.threads = []
+        return stopped
+
+    def _worker(self):
+        while self.active:
+            item = self.input.get(timeout=0.2)
+            if item is None:
+                continue
+            seq, payload = item
+
+            start = time.time()
+            try:
+                with tracer.span(self.name, 'stage', seq=seq):
+                    result = self.func(payload)
+            except Exception as e:
+                ERRORS.inc(stage=self.name, type=type(e).__name__)
+                with self.lock:
+                    self.errors += 1
+                    self.consecutive_errors += 1
+                logger.error(f"Stage {self.name} failed: {e}")
+                if self.on_error:
+                    self.on_error(self, e)
+                continue
+
+            duration = time.time() - start
+            STAGE_LATENCY.observe(duration, stage=self.name)
+            if self.on_complete:
+                self.on_complete(self.name, duration)
+            with self.lock:
+                self.processed += 1
+                self.consecutive_errors = 0
+                self.busy_time += duration
+                self.last_duration = duration
+
+                if result is None:
+                    if self.output is not None:
+                        self.filtered += 1
+                    continue
+                # A parallel worker already emitted a newer item
+                if seq < self.last_seq:
+                    self.stale += 1
+                    continue
+                self.last_seq = seq
+
+            if self.output is not None:
+                self.output.put((seq, result))
+
+    def stats(self):
+        with self.lock:
+            elapsed = time.time() - self.started_at if self.started_at else 0
+            return {
+                'processed': self.processed,
+                'filtered': self.filtered,
+                'dropped': self.input.dropped,
+                'stale': self.stale,
+                'errors': self.errors,
+                'depth': len(self.input),
+                'max_depth': self.input.max_depth,
+                'avg_ms': (self.busy_time / self.processed * 1000) if self.processed else 0,
+                'last_ms': self.last_duration * 1000,
+                'throughput': (self.processed / elapsed) if elapsed > 0 else 0
+            }
+
+
+# ==================== Pipeline ====================
+class Pipeline:
+    """Chain of stages connected by latest-wins queues"""
+    def __init__(self, stages, on_error=None, on_complete=None):
+        self.stages = stages
+        self.seq = 0
+        self.seq_lock = threading.Lock()
+        for stage, next_stage in zip(stages, stages[1:]):
+            stage.output = next_stage.input
+        for stage in stages:
+            stage.on_error = on_error
+            stage.on_complete = on_complete
+
+    def submit(self, item, stage=None):
+        """Feed an item into the first stage (or the one named); older pending items are dropped"""
+        target = self.stages[0] if stage is None else next(s for s in self.stages if s.name == stage)
+        with self.seq_lock:
+            seq = self.seq
+            self.seq += 1
+        target.input.put((seq, item))
+
+    def start(self):
+        for stage in self.stages:
+            stage.start()
+
+        # Queue depths and drops are read at scrape time
+        metrics.gauge('pipeline_queue_depth', "Items waiting in each stage's input queue",
+                      func=lambda: [({'stage': s.name}, len(s.input)) for s in self.stages])
+        metrics.gauge('pipeline_dropped', "Stale items dropped from each stage's input queue",
+                      func=lambda: [({'stage': s.name}, s.input.dropped) for s in self.stages])
+
+    def stop(self, timeout=3.0):
+        """Stop every stage; False if a worker is still running after its timeout"""
+        return all([stage.stop(timeout) for stage in self.stages])
+
+    def stats(self):
+        return {stage.name: stage.stats() for stage in self.stages}
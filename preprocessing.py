@@ -0,0 +1,95 @@
+import time
+
+import cv2
+import numpy as np
+
+
+# ==================== OCR Preprocessing ====================
+class Preprocessor:
+    """Configurable numpy/OpenCV preprocessing pipeline working on reusable buffers
+
+    Steps run in the order given; each one is timed. The returned frame is an
+    internal buffer that stays valid until the next call to `process`.
+    """
+    STEPS = ('resize', 'contrast', 'clahe', 'denoise', 'adaptive_threshold')
+
+    def __init__(self, steps=('resize', 'contrast'), scale=1.5, contrast=1.5,
+                 clahe_clip=2.0, clahe_grid=8, threshold_block=31, threshold_c=10,
+                 denoise_strength=7):
+        unknown = [step for step in steps if step not in self.STEPS]
+        if unknown:
+            raise ValueError(f"Unknown preprocessing steps: {unknown}")
+        self.steps = list(steps)
+        self.scale = scale
+        self.contrast = contrast
+        self.clahe = cv2.createCLAHE(clipLimit=clahe_clip, tileGridSize=(clahe_grid, clahe_grid))
+        self.threshold_block = threshold_block
+        self.threshold_c = threshold_c
+        self.denoise_strength = denoise_strength
+        self.buffers = {}
+        self.lut = np.empty(256, dtype=np.uint8)
+        self.identity = np.arange(256, dtype=np.float32)
+        self.timings = {step: [0.0, 0] for step in self.STEPS}
+
+    def buffer(self, name, shape):
+        buf = self.buffers.get(name)
+        if buf is None or buf.shape != shape:
+            buf = np.empty(shape, dtype=np.uint8)
+            self.buffers[name] = buf
+        return buf
+
+    def process(self, gray):
+        """Run the configured steps on a 2D uint8 frame"""
+        frame = gray
+        for step in self.steps:
+            start = time.perf_counter()
+            frame = getattr(self, f"_{step}")(frame)
+            timing = self.timings[step]
+            timing[0] += time.perf_counter() - start
+            timing[1] += 1
+        return frame
+
+    # ==================== Steps ====================
+    def _resize(self, frame):
+        if self.scale == 1.0:
+            return frame
+        height, width = frame.shape
+        size = (int(width * self.scale), int(height * self.scale))
+        out = self.buffer('resize', (size[1], size[0]))
+        # Area averaging when shrinking, bilinear when enlarging (LANCZOS costs far more)
+        interpolation = cv2.INTER_AREA if self.scale < 1.0 else cv2.INTER_LINEAR
+        cv2.resize(frame, size, dst=out, interpolation=interpolation)
+        return out
+
+    def _contrast(self, frame):
+        # Same mapping as PIL ImageEnhance.Contrast (blend with the mean gray level), applied as a LUT
+        mean = cv2.mean(frame)[0]
+        self.lut[:] = np.clip(np.rint(mean + (self.identity - mean) * self.contrast), 0, 255)
+        out = self.buffer('contrast', frame.shape)
+        cv2.LUT(frame, self.lut, dst=out)
+        return out
+
+    def _clahe(self, frame):
+        out = self.buffer('clahe', frame.shape)
+        self.clahe.apply(frame, dst=out)
+        return out
+
+    def _denoise(self, frame):
+        out = self.buffer('denoise', frame.shape)
+        cv2.fastNlMeansDenoising(frame, dst=out, h=self.denoise_strength,
+                                 templateWindowSize=7, searchWindowSize=15)
+        return out
+
+    def _adaptive_threshold(self, frame):
+        out = self.buffer('adaptive_threshold', frame.shape)
+        cv2.adaptiveThreshold(frame, 255, cv2.ADAPTIVE_THRESH_MEAN_C, cv2.THRESH_BINARY,
+                              self.threshold_block, self.threshold_c, dst=out)
+        return out
+
+    def stats(self):
+        """Average milliseconds per configured step"""
+        return {
+            step: (total / count * 1000) if count else 0
+            for step, (total, count) in self.timings.items()
+            if step in self.steps
+        }
@@ -0,0 +1,414 @@
+import logging
+from collections import namedtuple
+
+import numpy as np
+
+from translation_cache import TranslationCache
+from display_text import DisplayShaper
+from single_flight import SingleFlight
+from fuzzy_text import TextChangeDetector
+from script_detection import OCRLanguageSelector, LANGUAGE_SCRIPTS, in_script
+from text_segments import split_segments, join_segments, unique_segments, translate_segments
+from change_detection import FrameChangeDetector
+from ocr_engine import OCREnginePool
+from text_regions import TextRegionDetector
+from preprocessing import Preprocessor
+from tile_ocr import TileOCR, stitch_regions
+from motion import MotionEstimator, shift_regions
+from frame_ingest import FrameIngestor
+from tracing import tracer
+from metrics import (FRAMES_CAPTURED, FRAMES_SKIPPED, FRAMES_OCR, FRAMES_SCROLLED, REGIONS_REUSED,
+                     TRANSLATION_CALLS, TRANSLATION_BYTES, TRANSLATION_FALLBACKS, ERRORS)
+
+logger = logging.getLogger(__name__)
+
+
+# A translation in logical order (clipboard, history) and laid out for display (overlay);
+# `complete` is False when some segments are shown untranslated because the backend failed
+Translation = namedtuple('Translation', ['raw', 'display', 'complete'], defaults=(True,))
+
+TRANSLATION_ERROR = "[خطأ في الترجمة]"
+
+
+# ==================== Screen Processor ====================
+class ScreenProcessor:
+    """Android-independent OCR and translation core, shared by the app and offline benchmarks"""
+    def __init__(self, translator=None, translation_cache=None, ocr_pool=None,
+                 source_lang='auto', target_lang='ar', upscale=1.5):
+        self.translator = translator  # TranslationBackend: translate(text) and translate_batch(list)
+        self.current_source_lang = source_lang
+        self.current_target_lang = target_lang
+        self.text_min_length = 10  # Minimum text length to process
+        self.text_change = TextChangeDetector()  # Ignores OCR flicker between frames of one screen
+
+        self.translation_cache = translation_cache or TranslationCache(max_size=200)
+        self.display_shaper = DisplayShaper()  # Memoized per-segment reshaping and bidi
+        self.inflight = SingleFlight()  # Concurrent requests for the same segment share one call
+        self.inflight_timeout = 10.0  # Seconds a follower waits for the leader's result
+        self.frame_ingestor = FrameIngestor()
+        self.change_detector = FrameChangeDetector()
+        self.ocr_pool = ocr_pool or OCREnginePool(lang='eng+ara')  # One engine per spare core
+        self.tile_ocr = TileOCR(self.recognize_tile, recognize_batch=self.recognize_tiles)
+        self.use_tile_ocr = True  # Re-OCR only the bands that changed
+        self.text_region_detector = TextRegionDetector()
+        # Load only the language models the screen needs (learned from OCR output + OSD guess)
+        self.language_selector = OCRLanguageSelector(guess=self.ocr_pool.detect_script)
+        self.language_selector.set_source_language(source_lang)
+        self.ocr_langs = None  # Tesseract languages for the frame being recognized
+        self.use_text_regions = True  # OCR only areas that look like text
+        self.motion_estimator = MotionEstimator()
+        self.use_scroll_reuse = True  # After a scroll, OCR only the newly exposed strip
+        self.regions = None  # OCRLine per detected box of the last recognized frame (preprocessed pixels)
+        self.regions_lang = None  # OCR languages `regions` were recognized with
+        self.lines = []  # OCRLine per visual line of the last recognized frame, in frame pixels
+        self.retry_item = None  # Pipeline item last shown untranslated, sent again by take_retry
+        # Source lines (frame pixels) our positioned overlay is drawn over; the capture
+        # mirrors the overlay, so these boxes are masked and their last source text kept
+        self.overlay_lines = []
+        self.overlay_padding = 2  # Frame pixels around each box, for screen-scale rounding
+        self.scrolled = False  # Whether the last recognized frame was a scroll of the one before
+        self.min_line_confidence = 30  # Lines Tesseract is less sure of are mostly icons and noise
+        self.preprocessor = Preprocessor(
+            steps=('resize', 'contrast'),
+            scale=upscale,
+            contrast=1.5  # Increase contrast by 50%
+        )
+
+    # ==================== Image Processing ====================
+    def accept_frame(self, luma):
+        """Run change detection on a luma frame; return an owned copy, or None if unchanged
+
+        Areas under our own overlay are masked first (in place), so drawing
+        a translation is not itself a screen change.
+        """
+        FRAMES_CAPTURED.inc()
+        self.mask_overlay(luma)
+        with tracer.span('change_detect', 'capture'):
+            if not self.change_detector.has_changed(luma):
+                FRAMES_SKIPPED.inc()
+                return None
+
+        # Ingest buffers are reused for the next frame, later stages need their own copy
+        with tracer.span('buffer_copy', 'capture'):
+            return luma.copy()
+
+    def set_overlay_lines(self, lines):
+        """Source lines (frame pixels) that positioned overlay regions now cover; [] when none"""
+        self.overlay_lines = list(lines)
+
+    def mask_overlay(self, luma):
+        """Paint the boxes under our overlay with the background just above them (in place)"""
+        height, width = luma.shape[:2]
+        pad = self.overlay_padding
+        for line in self.overlay_lines:
+            x, y, w, h = line.box
+            x0, y0 = max(0, x - pad), max(0, y - pad)
+            x1, y1 = min(width, x + w + pad), min(height, y + h + pad)
+            if x0 >= x1 or y0 >= y1:
+                continue
+            edge = luma[y0 - 1, x0:x1] if y0 > 0 else luma[min(y1, height - 1), x0:x1]
+            luma[y0:y1, x0:x1] = int(np.median(edge))
+
+    def recognize_frame(self, luma):
+        """Preprocess a luma frame and extract its text using OCR (lines with boxes end up in `lines`)"""
+        FRAMES_OCR.inc()
+        hidden = self.overlay_lines  # Masked out of the frame by accept_frame
+        self.scrolled = False
+        try:
+            # Preprocess for better OCR
+            with tracer.span('preprocess', 'ocr'):
+                gray = self.preprocess_image(luma)
+            with tracer.span('pick_languages', 'ocr'):
+                self.ocr_langs = self.language_selector.languages(gray)
+
+            if self.use_text_regions:
+                # OCR only the detected text lines - pictures and blank UI are skipped
+                lines = self.recognize_regions(gray, hidden)
+            elif self.use_tile_ocr:
+                # Incremental OCR - unchanged bands come from the tile cache
+                with tracer.span('ocr_tiles', 'ocr'):
+                    lines = self.tile_ocr.recognize_frame(gray, self.ocr_langs)
+            else:
+                # Perform full-page OCR with the selected languages
+                with tracer.span('ocr_full', 'ocr'):
+                    lines = self.ocr_pool.recognize_lines(gray, psm=3, lang=self.ocr_langs)
+
+            lines = [line for line in lines
+                     if line.confidence is None or line.confidence >= self.min_line_confidence]
+            lines = self.to_frame_pixels(lines)
+            if hidden and not self.scrolled:
+                # Under the overlay the capture shows our own translation; the source is unchanged.
+                # After a scroll it moved with the content and is read again once the overlay follows
+                lines = sorted(lines + hidden, key=lambda line: (line.box[1], line.box[0]))
+            self.lines = lines
+            text = "\n".join(line.text for line in lines)
+            self.language_selector.observe(text)
+            return text
+
+        except Exception as e:
+            self.regions = None
+            self.lines = []
+            ERRORS.inc(stage='ocr', type=type(e).__name__)
+            logger.error(f"Image processing error: {e}")
+            return ""
+
+    def to_frame_pixels(self, lines, inverse=False):
+        """Map line boxes from the preprocessed image back to the captured frame (or the other way)"""
+        scale = self.preprocessor.scale if 'resize' in self.preprocessor.steps else 1.0
+        if scale == 1.0:
+            return lines
+        factor = scale if inverse else 1.0 / scale
+        return [line._replace(box=tuple(int(round(v * factor)) for v in line.box)) for line in lines]
+
+    def recognize_regions(self, gray, hidden=()):
+        """OCR the detected text lines; after a scroll, only lines in the newly exposed area
+
+        `hidden` are the source lines (frame pixels) masked under our overlay;
+        a scroll carries them along with the recognized lines.
+        """
+        shift = None
+        if self.use_scroll_reuse:
+            with tracer.span('estimate_motion', 'ocr'):
+                shift = self.motion_estimator.estimate(gray)
+
+        height, width = gray.shape[:2]
+        regions = []
+        x, y, w, h = 0, 0, width, height
+        self.scrolled = bool(shift and shift != (0, 0))
+        if self.scrolled and (self.regions or hidden) and self.regions_lang == self.ocr_langs:
+            # Lines still on screen keep their text (and so their cached translation);
+            # after a language switch everything is read again
+            FRAMES_SCROLLED.inc()
+            hidden = self.to_frame_pixels(hidden, inverse=True)
+            # A line recognized before its overlay was drawn is now masked - the hidden copy wins
+            carried = [region for region in self.regions or () if not overlaps_any(region.box, hidden)]
+            regions, (x, y, w, h) = shift_regions(carried + hidden, shift[0], shift[1], gray.shape)
+            REGIONS_REUSED.inc(len(regions))
+
+        boxes = []
+        if w >= self.text_region_detector.min_width and h >= self.text_region_detector.min_height:
+            with tracer.span('detect_regions', 'ocr', area=w * h):
+                boxes = [(bx + x, by + y, bw, bh)
+                         for bx, by, bw, bh in self.text_region_detector.detect(gray[y:y + h, x:x + w])]
+        with tracer.span('ocr_regions', 'ocr', regions=len(boxes), reused=len(regions)):
+            regions.extend(self.tile_ocr.recognize_boxes(gray, boxes, self.ocr_langs))
+
+        self.regions = regions
+        self.regions_lang = self.ocr_langs
+        return stitch_regions(regions)
+
+    def recognize_tile(self, tile, psm=6):
+        """OCR a single text band (psm 6) or text line (psm 7) into lines with boxes"""
+        with tracer.span('tesseract', 'ocr', psm=psm, lang=self.ocr_langs):
+            return self.ocr_pool.recognize_lines(tile, psm=psm, lang=self.ocr_langs)
+
+    def recognize_tiles(self, jobs):
+        """OCR (tile, psm) jobs sharded across the engine pool, results in job order"""
+        with tracer.span('ocr_batch', 'ocr', tiles=len(jobs)):
+            return self.ocr_pool.map(self.recognize_tile, jobs)
+
+    def preprocess_image(self, gray):
+        """Preprocess a luma frame for better OCR results"""
+        try:
+            return self.preprocessor.process(gray)
+        except Exception as e:
+            logger.warning(f"Image preprocessing error, using original: {e}")
+            return gray
+
+    def filter_text(self, extracted_text):
+        """Return the text if it is long enough and differs from the last one, else None"""
+        # Check if we have valid text
+        if not extracted_text or len(extracted_text.strip()) < self.text_min_length:
+            return None
+
+        # Only process if text has changed beyond OCR jitter
+        if not self.text_change.has_changed(extracted_text):
+            return None
+        return extracted_text
+
+    # ==================== Translation ====================
+    def translate(self, text):
+        """Translate text segment by segment, sending only uncached segments to the backend"""
+        try:
+            lines = split_segments(text)
+            translations = {}
+            displays = {}  # Raw translated segment -> display form, where already known
+            missing = []
+
+            with tracer.span('cache_lookup', 'translate'):
+                for segment in unique_segments(lines):
+                    # Check cache first
+                    entry = self.translation_cache.lookup(
+                        segment,
+                        self.current_source_lang,
+                        self.current_target_lang
+                    )
+                    if entry:
+                        translations[segment] = entry['translation']
+                        if self.needs_shaping():
+                            if entry['display'] is None:
+                                self.translation_cache.set_display(entry, self.display_shaper.shape(entry['translation']))
+                            displays[entry['translation']] = entry['display']
+                    elif self.in_target_script(segment):
+                        translations[segment] = segment  # Already in the target language (or no letters)
+                    else:
+                        missing.append(segment)
+
+            # Segments already being translated by another caller are awaited, not re-sent
+            owned = []
+            joined = []
+            for segment in missing:
+                key = (self.current_source_lang, self.current_target_lang, segment)
+                flight, leader = self.inflight.claim(key)
+                (owned if leader else joined).append((key, flight))
+
+            # Perform translation of the remaining segments in one request
+            with tracer.span('backend', 'translate', segments=len(owned), joined=len(joined)):
+                translated, complete = self._translate_owned(owned)
+                translations.update(translated)
+
+            if joined:
+                with tracer.span('inflight_wait', 'translate', segments=len(joined)):
+                    for key, flight in joined:
+                        segment = key[2]
+                        try:
+                            translations[segment] = flight.wait(self.inflight_timeout)
+                        except Exception:
+                            translations[segment] = segment  # Leader failed - show the original
+                            complete = False
+
+            translated_lines = [[translations[s] for s in sentences] for sentences in lines]
+            raw = join_segments(translated_lines)
+            if not self.needs_shaping():
+                return Translation(raw, raw, complete)
+
+            # Reshape Arabic text for proper display, segment by segment (memoized)
+            with tracer.span('arabic_reshape', 'translate'):
+                display = self.display_shaper.layout(translated_lines, displays)
+            return Translation(raw, display, complete)
+
+        except Exception as e:
+            ERRORS.inc(stage='translate', type=type(e).__name__)
+            logger.error(f"Translation error: {e}")
+            return Translation(TRANSLATION_ERROR, TRANSLATION_ERROR)
+
+    def _translate_owned(self, owned):
+        """Translate segments this caller leads, publishing results to any followers
+
+        Returns ({segment: translation}, complete); on a backend failure the
+        segments map to themselves and complete is False.
+        """
+        segments = [key[2] for key, _ in owned]
+        try:
+            return self._translate_segments(owned, segments)
+        finally:
+            # Never leave followers waiting on a flight that was not completed
+            for key, flight in owned:
+                if not flight.done.is_set():
+                    self.inflight.fail(key, flight, RuntimeError("translation aborted"))
+
+    def _translate_segments(self, owned, segments):
+        try:
+            results = translate_segments(
+                segments,
+                self.backend_translate,
+                self.backend_translate_batch
+            )
+        except Exception as e:
+            # Provider down or out of retries - show cached text plus the
+            # untranslated rest instead of an error, and keep the service running
+            ERRORS.inc(stage='translate_backend', type=type(e).__name__)
+            TRANSLATION_FALLBACKS.inc(len(segments))
+            logger.warning(f"Translation backend failed, showing original text: {e}")
+            for key, flight in owned:
+                self.inflight.fail(key, flight, e)
+            # Untranslated segments are not cached, so they are retried next time
+            # (a static screen produces no next time - see track_fallback/take_retry)
+            return {segment: segment for segment in segments}, False
+
+        translations = {}
+        for (key, flight), translated in zip(owned, results):
+            # Cache the result (logical order plus display form) before
+            # releasing followers, so later callers hit the cache instead
+            self.translation_cache.set(
+                key[2],
+                translated,
+                self.current_source_lang,
+                self.current_target_lang,
+                display=self.display_shaper.shape(translated) if self.needs_shaping() else None
+            )
+            self.inflight.resolve(key, flight, translated)
+            translations[key[2]] = translated
+        return translations, True
+
+    def track_fallback(self, item, translation):
+        """Remember a pipeline item whose translation fell back to the original text
+
+        The text was already accepted as changed and identical frames that
+        follow are skipped before OCR, so nothing else would translate it
+        once the backend recovers. A complete translation clears it.
+        """
+        self.retry_item = None if translation.complete else item
+
+    def take_retry(self):
+        """The item to translate again, once the backend lets a call through; else None"""
+        if self.retry_item is None or self.translator is None or not self.translator.ready():
+            return None
+        item, self.retry_item = self.retry_item, None
+        return item
+
+    def backend_translate(self, text):
+        TRANSLATION_CALLS.inc()
+        TRANSLATION_BYTES.inc(len(text.encode('utf-8')))
+        return self.translator.translate(text)
+
+    def backend_translate_batch(self, batch):
+        TRANSLATION_CALLS.inc(len(batch))
+        TRANSLATION_BYTES.inc(sum(len(text.encode('utf-8')) for text in batch))
+        return self.translator.translate_batch(batch)
+
+    def in_target_script(self, segment):
+        """True if a segment is written in the target language's script (mixed text is not)"""
+        script = LANGUAGE_SCRIPTS.get(self.current_target_lang)
+        return script is not None and in_script(segment, script)
+
+    def needs_shaping(self):
+        """Arabic-script targets need letter reshaping and right-to-left reordering"""
+        return LANGUAGE_SCRIPTS.get(self.current_target_lang) == 'Arabic'
+
+    # ==================== State ====================
+    def reset(self):
+        """Forget per-session state (the persistent translation store is kept)"""
+        self.text_change.reset()
+        self.language_selector.reset()
+        self.ocr_pool.close()
+        self.translation_cache.clear()
+        self.display_shaper.clear()
+        self.change_detector.reset()
+        self.tile_ocr.clear()
+        self.motion_estimator.reset()
+        self.regions = None
+        self.lines = []
+        self.retry_item = None
+        self.overlay_lines = []
+
+    def stats(self):
+        return {
+            'cache': self.translation_cache.stats(),
+            'inflight': self.inflight.stats(),
+            'display': self.display_shaper.stats(),
+            'text_changes': self.text_change.stats(),
+            'languages': self.language_selector.stats(),
+            'frames': self.change_detector.stats(),
+            'tiles': self.tile_ocr.stats(),
+            'regions': self.text_region_detector.stats(),
+            'motion': self.motion_estimator.stats(),
+            'preprocess': self.preprocessor.stats()
+        }
+
+
+def overlaps_any(box, lines):
+    """True if an (x, y, w, h) box intersects the box of any of `lines`"""
+    x, y, w, h = box
+    return any(x < lx + lw and lx < x + w and y < ly + lh and ly < y + h for lx, ly, lw, lh in
+               (line.box for line in lines))
@@ -0,0 +1,120 @@
+import threading
+import time
+
+
+# ==================== Capture Scheduler ====================
+class EWMA:
+    """Exponentially weighted moving average"""
+    def __init__(self, alpha=0.3, initial=None):
+        self.alpha = alpha
+        self.value = initial
+
+    def update(self, sample):
+        if self.value is None:
+            self.value = sample
+        else:
+            self.value += self.alpha * (sample - self.value)
+        return self.value
+
+    def get(self, default=0.0):
+        return default if self.value is None else self.value
+
+
+class CaptureScheduler:
+    """Pick the next capture time from per-stage latency and the observed content change rate
+
+    - While content changes, capture often enough to keep end-to-end latency
+      near `target_latency` (a change waits on average half an interval).
+    - Never spend more than `cpu_budget` of one core on processing.
+    - On static content back off geometrically up to `max_interval`.
+    - A changed frame resets the backoff immediately, so scrolling is picked
+      up on the very next frame.
+    """
+    def __init__(self, target_latency=1.0, cpu_budget=0.5, min_interval=0.25, max_interval=4.0,
+                 backoff=1.5, alpha=0.3, clock=time.monotonic):
+        self.target_latency = target_latency
+        self.cpu_budget = cpu_budget  # Fraction of one core
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.alpha = alpha
+        self.clock = clock
+        self.stage_latency = {}  # stage name -> EWMA seconds, updated from the stage threads
+        self.stage_lock = threading.Lock()
+        self.capture_cost = EWMA(alpha)  # Acquire + ingest + change detection, paid every frame
+        self.change_rate = EWMA(alpha, initial=1.0)
+        self.static_streak = 0
+        self.last_capture = None
+        self.interval = min_interval
+
+    # ==================== Observations ====================
+    def observe_stage(self, name, seconds):
+        """Record how long a processing stage took for one item (any thread)"""
+        with self.stage_lock:
+            ewma = self.stage_latency.get(name)
+            if ewma is None:
+                ewma = self.stage_latency[name] = EWMA(self.alpha)
+            ewma.update(seconds)
+
+    def stage_seconds(self):
+        """Snapshot of the smoothed latency of each stage"""
+        with self.stage_lock:
+            return {name: ewma.get() for name, ewma in self.stage_latency.items()}
+
+    def on_capture(self, changed, capture_seconds=0.0):
+        """Record a capture and whether its content changed; returns the new interval"""
+        self.last_capture = self.clock()
+        self.capture_cost.update(capture_seconds)
+        self.change_rate.update(1.0 if changed else 0.0)
+        self.static_streak = 0 if changed else self.static_streak + 1
+        self.interval = self.compute_interval()
+        return self.interval
+
+    # ==================== Decisions ====================
+    def processing_latency(self):
+        """Estimated time from capture to overlay for a changed frame"""
+        return self.capture_cost.get() + sum(self.stage_seconds().values())
+
+    def budget_interval(self):
+        """Shortest interval that keeps expected CPU use within the budget"""
+        change_rate = self.change_rate.get()
+        processing = sum(self.stage_seconds().values())
+        cost_per_frame = self.capture_cost.get() + change_rate * processing
+        return cost_per_frame / self.cpu_budget if self.cpu_budget > 0 else 0.0
+
+    def active_interval(self):
+        """Interval that meets the latency target while content is changing"""
+        # A change waits half an interval on average before it is captured
+        slack = self.target_latency - self.processing_latency()
+        interval = max(2.0 * slack, self.budget_interval())
+        return min(self.max_interval, max(self.min_interval, interval))
+
+    def compute_interval(self):
+        interval = self.active_interval()
+        if self.static_streak:
+            # Static content - back off geometrically from the active rate
+            interval *= self.backoff ** self.static_streak
+        return min(self.max_interval, interval)
+
+    def wait_time(self):
+        """Seconds until the next capture is due"""
+        if self.last_capture is None:
+            return 0.0
+        return max(0.0, self.last_capture + self.interval - self.clock())
+
+    def reset(self):
+        with self.stage_lock:
+            self.stage_latency.clear()
+        self.capture_cost = EWMA(self.alpha)
+        self.change_rate = EWMA(self.alpha, initial=1.0)
+        self.static_streak = 0
+        self.last_capture = None
+        self.interval = self.min_interval
+
+    def stats(self):
+        return {
+            'interval': self.interval,
+            'change_rate': self.change_rate.get(),
+            'latency': self.processing_latency(),
+            'stages': self.stage_seconds()
+        }
@@ -0,0 +1,170 @@
+import logging
+
+import numpy as np
+import cv2
+
+logger = logging.getLogger(__name__)
+
+SCRIPTS = ('Latin', 'Greek', 'Cyrillic', 'Hebrew', 'Arabic', 'Devanagari', 'Thai', 'Hangul', 'Japanese', 'Han')
+
+# Letter ranges per script (inclusive); anything else - digits, punctuation, spaces - is ignored
+_RANGES = sorted([
+    (0x0041, 0x005A, 'Latin'), (0x0061, 0x007A, 'Latin'), (0x00C0, 0x024F, 'Latin'), (0x1E00, 0x1EFF, 'Latin'),
+    (0x0370, 0x03FF, 'Greek'),
+    (0x0400, 0x052F, 'Cyrillic'),
+    (0x0590, 0x05FF, 'Hebrew'),
+    (0x0600, 0x065F, 'Arabic'), (0x066A, 0x06EF, 'Arabic'), (0x06FA, 0x06FF, 'Arabic'),
+    (0x0750, 0x077F, 'Arabic'), (0x08A0, 0x08FF, 'Arabic'), (0xFB50, 0xFDFF, 'Arabic'), (0xFE70, 0xFEFF, 'Arabic'),
+    (0x0900, 0x097F, 'Devanagari'),
+    (0x0E00, 0x0E7F, 'Thai'),
+    (0x1100, 0x11FF, 'Hangul'), (0x3130, 0x318F, 'Hangul'), (0xAC00, 0xD7AF, 'Hangul'),
+    (0x3040, 0x30FF, 'Japanese'),  # Hiragana and Katakana
+    (0x3400, 0x4DBF, 'Han'), (0x4E00, 0x9FFF, 'Han'), (0xF900, 0xFAFF, 'Han'),
+])
+_STARTS = np.array([start for start, _, _ in _RANGES], dtype=np.uint32)
+_ENDS = np.array([end for _, end, _ in _RANGES], dtype=np.uint32)
+_RANGE_SCRIPT = np.array([SCRIPTS.index(script) for _, _, script in _RANGES], dtype=np.intp)
+
+# Script written by each language code the app offers
+LANGUAGE_SCRIPTS = {
+    'ar': 'Arabic', 'fa': 'Arabic', 'ur': 'Arabic',
+    'en': 'Latin', 'fr': 'Latin', 'es': 'Latin', 'de': 'Latin', 'tr': 'Latin',
+    'ru': 'Cyrillic',
+    'zh': 'Han',
+    'ja': 'Japanese',
+    'ko': 'Hangul'
+}
+
+# Tesseract traineddata used to read each script
+SCRIPT_OCR_LANGS = {
+    'Latin': 'eng',
+    'Arabic': 'ara',
+    'Cyrillic': 'rus',
+    'Han': 'chi_sim',
+    'Japanese': 'jpn',
+    'Hangul': 'kor',
+    'Greek': 'ell',
+    'Hebrew': 'heb',
+    'Devanagari': 'hin',
+    'Thai': 'tha'
+}
+
+# Tesseract OSD script names that differ from ours
+OSD_SCRIPTS = {'HanS': 'Han', 'HanT': 'Han', 'Hiragana': 'Japanese', 'Katakana': 'Japanese', 'Korean': 'Hangul'}
+
+
+# ==================== Script Histogram ====================
+def script_histogram(text):
+    """Letter count per script, computed over all codepoints at once"""
+    codepoints = np.frombuffer(text.encode('utf-32-le'), dtype='<u4')
+    index = np.searchsorted(_STARTS, codepoints, side='right') - 1
+    valid = index >= 0
+    index = np.where(valid, index, 0)
+    valid &= codepoints <= _ENDS[index]
+    counts = np.bincount(_RANGE_SCRIPT[index[valid]], minlength=len(SCRIPTS))
+    return {SCRIPTS[i]: int(count) for i, count in enumerate(counts) if count}
+
+
+def script_shares(text):
+    """Share of letters per script; kana makes accompanying Han count as Japanese"""
+    histogram = script_histogram(text)
+    if 'Japanese' in histogram and 'Han' in histogram:
+        histogram['Japanese'] += histogram.pop('Han')
+    total = sum(histogram.values())
+    return {script: count / total for script, count in histogram.items()} if total else {}
+
+
+def in_script(text, script, min_share=0.8):
+    """True if (almost) all letters are in `script`; texts without letters count as matching"""
+    shares = script_shares(text)
+    return not shares or shares.get(script, 0.0) >= min_share
+
+
+def ocr_languages(scripts):
+    """Tesseract language string for a set of scripts, Latin first (the primary model, as 'eng+ara')"""
+    ordered = sorted((s for s in set(scripts) if s in SCRIPT_OCR_LANGS), key=SCRIPTS.index)
+    return "+".join(SCRIPT_OCR_LANGS[s] for s in ordered)
+
+
+# ==================== OCR Language Selection ====================
+class OCRLanguageSelector:
+    """Pick the Tesseract languages for a frame instead of always running every model
+
+    Scripts are learned from recent OCR output (an EWMA of script shares).
+    Every `recheck_every` frames all `default_scripts` run once, together
+    with a guess from Tesseract OSD on a thumbnail when available, so a
+    newly appearing script is still discovered. OSD also runs while no
+    learned script is established yet; otherwise it is skipped, since it
+    costs about as much as the OCR it is meant to save.
+    """
+    def __init__(self, default_scripts=('Latin', 'Arabic'), guess=None, recheck_every=10,
+                 min_share=0.05, alpha=0.3, thumbnail_width=320):
+        self.default_scripts = set(default_scripts)
+        self.guess = guess  # Optional callable: thumbnail -> script name or None
+        self.recheck_every = recheck_every
+        self.min_share = min_share
+        self.alpha = alpha
+        self.thumbnail_width = thumbnail_width
+        self.shares = {}  # script -> EWMA share of recent OCR output
+        self.frames = 0
+        self.full_frames = 0
+        self.guesses = 0
+
+    def set_source_language(self, lang):
+        """Restrict OCR to one language's script, or 'auto' for the defaults"""
+        script = LANGUAGE_SCRIPTS.get(lang)
+        self.default_scripts = {script} if script else {'Latin', 'Arabic'}
+        self.reset()
+
+    def languages(self, gray):
+        """Tesseract language string for this frame"""
+        self.frames += 1
+        scripts = {script for script, share in self.shares.items() if share >= self.min_share}
+        if scripts and self.frames % self.recheck_every != 0:
+            return ocr_languages(scripts)
+
+        # Recheck frame, or nothing learned yet: every default model plus the OSD guess
+        self.full_frames += 1
+        scripts = self.default_scripts | set(self.shares)
+        if self.guess:
+            script = self._guess_script(gray)
+            if script:
+                scripts.add(script)
+        return ocr_languages(scripts)
+
+    def _guess_script(self, gray):
+        height, width = gray.shape[:2]
+        scale = min(1.0, self.thumbnail_width / width)
+        thumbnail = cv2.resize(gray, (int(width * scale), int(height * scale)), interpolation=cv2.INTER_AREA)
+        self.guesses += 1
+        try:
+            script = self.guess(thumbnail)
+        except Exception as e:
+            logger.debug(f"Script guess failed: {e}")
+            return None
+        return OSD_SCRIPTS.get(script, script)
+
+    def observe(self, text):
+        """Learn scripts from a frame's OCR output"""
+        shares = script_shares(text)
+        if not shares:
+            return
+        if not self.shares:
+            self.shares = shares
+            return
+        for script in set(self.shares) | set(shares):
+            previous = self.shares.get(script, 0.0)
+            self.shares[script] = previous + self.alpha * (shares.get(script, 0.0) - previous)
+        # Forget scripts that have faded out
+        self.shares = {script: share for script, share in self.shares.items() if share >= self.min_share / 4}
+
+    def reset(self):
+        self.shares.clear()
+        self.frames = 0
+
+    def stats(self):
+        return {
+            'shares': dict(self.shares),
+            'full_frames': self.full_frames,
+            'guesses': self.guesses
+        }
@@ -0,0 +1,86 @@
+import threading
+
+from metrics import TRANSLATION_DEDUPED
+
+
+# ==================== Single-Flight ====================
+class Flight:
+    """One in-flight call; followers wait on it instead of issuing their own"""
+    __slots__ = ('done', 'result', 'error', 'followers')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.followers = 0
+
+    def wait(self, timeout=None):
+        """Return the leader's result, re-raising its error; TimeoutError if it never lands"""
+        if not self.done.wait(timeout):
+            raise TimeoutError("in-flight request did not complete")
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+class SingleFlight:
+    """Collapse concurrent requests for the same key into one call
+
+    The first caller for a key becomes the leader and must `resolve` or
+    `fail` the flight; callers arriving before that join as followers and
+    receive the same result. Finished flights are forgotten - completed
+    results belong in the cache, not here.
+    """
+    def __init__(self):
+        self.flights = {}  # key -> Flight
+        self.lock = threading.Lock()
+        self.leaders = 0
+        self.followers = 0
+
+    def claim(self, key):
+        """Return (flight, is_leader) for a key"""
+        with self.lock:
+            flight = self.flights.get(key)
+            if flight is not None:
+                flight.followers += 1
+                self.followers += 1
+                TRANSLATION_DEDUPED.inc()
+                return flight, False
+            flight = self.flights[key] = Flight()
+            self.leaders += 1
+            return flight, True
+
+    def resolve(self, key, flight, result):
+        self._finish(key, flight)
+        flight.result = result
+        flight.done.set()
+
+    def fail(self, key, flight, error):
+        self._finish(key, flight)
+        flight.error = error
+        flight.done.set()
+
+    def _finish(self, key, flight):
+        with self.lock:
+            if self.flights.get(key) is flight:
+                del self.flights[key]
+
+    def do(self, key, func, timeout=None):
+        """Run func() once for all concurrent callers with the same key"""
+        flight, leader = self.claim(key)
+        if not leader:
+            return flight.wait(timeout)
+        try:
+            result = func()
+        except BaseException as e:
+            self.fail(key, flight, e)
+            raise
+        self.resolve(key, flight, result)
+        return result
+
+    def stats(self):
+        return {
+            'in_flight': len(self.flights),
+            'leaders': self.leaders,
+            'saved': self.followers
+        }
@@ -0,0 +1,15 @@
+import pytest
+
+
+class FakeClock:
+    """Monotonic clock the test moves by hand: clock.now += seconds"""
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
@@ -0,0 +1,51 @@
+import cv2
+import numpy as np
+import pytest
+
+from change_detection import FrameChangeDetector
+
+
+def screen(*lines):
+    """648x1152 light UI frame with dark text lines at (x, y)"""
+    frame = np.full((1152, 648), 235, dtype=np.uint8)
+    for text, x, y in lines:
+        cv2.putText(frame, text, (x, y), cv2.FONT_HERSHEY_SIMPLEX, 0.8, 30, 2, cv2.LINE_AA)
+    return frame
+
+
+@pytest.mark.parametrize('text', ["ok", "Thank you", "Wrong PIN"])
+def test_single_short_new_line_is_a_change(text):
+    detector = FrameChangeDetector()
+    base = [("Enter your PIN", 40, 200), ("Cancel", 40, 1000)]
+    assert detector.has_changed(screen(*base))
+
+    assert detector.has_changed(screen(*base, (text, 300, 620)))
+
+
+def test_identical_and_noisy_frames_are_skipped():
+    detector = FrameChangeDetector()
+    frame = screen(("Enter your PIN", 40, 200))
+    assert detector.has_changed(frame)
+
+    noise = np.random.default_rng(0).integers(-3, 4, frame.shape)
+    assert not detector.has_changed(frame.copy())
+    assert not detector.has_changed(np.clip(frame + noise, 0, 255).astype(np.uint8))
+    assert detector.stats()['skips'] == 2
+
+
+def test_rgba_frames_use_luma():
+    detector = FrameChangeDetector()
+    gray = screen(("Enter your PIN", 40, 200))
+    assert detector.has_changed(cv2.cvtColor(gray, cv2.COLOR_GRAY2RGBA))
+    assert not detector.has_changed(cv2.cvtColor(gray, cv2.COLOR_GRAY2RGBA))
+    assert detector.has_changed(cv2.cvtColor(screen(("Enter your PIN", 40, 200), ("ok", 300, 620)),
+                                             cv2.COLOR_GRAY2RGBA))
+
+
+def test_skipped_frames_do_not_move_the_reference():
+    detector = FrameChangeDetector(pixel_threshold=6.0)
+    frame = np.full((480, 480), 100, dtype=np.uint8)
+    assert detector.has_changed(frame)
+    # Drift below the per-tile threshold, one step at a time, still adds up
+    assert not detector.has_changed(frame + 4)
+    assert detector.has_changed(frame + 8)
@@ -0,0 +1,131 @@
+import numpy as np
+import cv2
+import pytest
+
+from frame_ingest import FrameIngestor, strided_rgba_view
+
+
+# ==================== Synthetic ImageReader Planes ====================
+class FakeByteBuffer:
+    """Just enough of java.nio.ByteBuffer for ingest_image: remaining() and get(dst)"""
+    def __init__(self, data):
+        self.data = bytes(data)
+
+    def remaining(self):
+        return len(self.data)
+
+    def get(self, dst):
+        dst[:] = self.data
+
+
+class FakePlane:
+    def __init__(self, data, row_stride, pixel_stride):
+        self.buffer = FakeByteBuffer(data)
+        self.row_stride = row_stride
+        self.pixel_stride = pixel_stride
+
+    def getBuffer(self):
+        return self.buffer
+
+    def getRowStride(self):
+        return self.row_stride
+
+    def getPixelStride(self):
+        return self.pixel_stride
+
+
+class FakeImage:
+    def __init__(self, plane, width, height):
+        self.plane = plane
+        self.width = width
+        self.height = height
+
+    def getPlanes(self):
+        return [self.plane]
+
+    def getWidth(self):
+        return self.width
+
+    def getHeight(self):
+        return self.height
+
+
+def padded_image(rgba, row_stride, pixel_stride=4, pad_last_row=False):
+    """Lay out an RGBA frame like ImageReader: padded rows, optional gaps between pixels"""
+    height, width = rgba.shape[:2]
+    size = (height - 1) * row_stride + width * pixel_stride
+    if pad_last_row:
+        size = height * row_stride
+    data = np.full(size, 0xEE, dtype=np.uint8)  # Padding bytes that must never be read
+    for y in range(height):
+        row = data[y * row_stride:y * row_stride + width * pixel_stride].reshape(width, pixel_stride)
+        row[:, :4] = rgba[y]
+    return FakeImage(FakePlane(data, row_stride, pixel_stride), width, height)
+
+
+def random_frame(height=37, width=53, seed=0):
+    return np.random.default_rng(seed).integers(0, 256, (height, width, 4), dtype=np.uint8)
+
+
+# ==================== Tests ====================
+@pytest.mark.parametrize('pad_last_row', [False, True])
+def test_padded_rows_give_exact_view_and_luma(pad_last_row):
+    rgba = random_frame()
+    image = padded_image(rgba, row_stride=53 * 4 + 44, pad_last_row=pad_last_row)
+    ingestor = FrameIngestor()
+
+    view, luma = ingestor.ingest_image(image)
+
+    assert view.shape == rgba.shape
+    np.testing.assert_array_equal(view, rgba)
+    np.testing.assert_array_equal(luma, cv2.cvtColor(rgba, cv2.COLOR_RGBA2GRAY))
+
+
+def test_view_aliases_the_landing_buffer():
+    image = padded_image(random_frame(), row_stride=53 * 4 + 12)
+    ingestor = FrameIngestor()
+
+    view, luma = ingestor.ingest_image(image)
+
+    # No copy between the landing buffer and the RGBA view
+    assert np.shares_memory(view, np.frombuffer(ingestor.raw, dtype=np.uint8))
+    assert view.strides == (53 * 4 + 12, 4, 1)
+    assert not view.flags.writeable
+    assert luma is ingestor.luma
+
+
+def test_wide_pixel_stride():
+    rgba = random_frame(seed=1)
+    image = padded_image(rgba, row_stride=53 * 8 + 16, pixel_stride=8)
+    ingestor = FrameIngestor()
+
+    view, luma = ingestor.ingest_image(image)
+
+    np.testing.assert_array_equal(view, rgba)
+    gray = cv2.cvtColor(rgba, cv2.COLOR_RGBA2GRAY).astype(np.int16)
+    # Integer BT.601 path: within one level of OpenCV's rounding
+    assert np.abs(luma.astype(np.int16) - gray).max() <= 1
+
+
+def test_buffers_are_reused_across_frames():
+    ingestor = FrameIngestor()
+    first = padded_image(random_frame(seed=2), row_stride=53 * 4 + 44)
+    second = padded_image(random_frame(seed=3), row_stride=53 * 4 + 44)
+
+    _, luma_first = ingestor.ingest_image(first)
+    raw_first = ingestor.raw
+    _, luma_second = ingestor.ingest_image(second)
+
+    assert ingestor.raw is raw_first
+    assert luma_second is luma_first
+    np.testing.assert_array_equal(luma_second, cv2.cvtColor(random_frame(seed=3), cv2.COLOR_RGBA2GRAY))
+
+
+def test_invalid_strides_are_rejected():
+    data = bytearray(100)
+    with pytest.raises(ValueError):
+        strided_rgba_view(data, 10, 2, row_stride=10 * 4, pixel_stride=3)
+    with pytest.raises(ValueError):
+        strided_rgba_view(data, 10, 2, row_stride=10 * 4 - 1)
+    with pytest.raises(ValueError):
+        strided_rgba_view(data, 10, 3, row_stride=10 * 4)  # Needs 120 bytes
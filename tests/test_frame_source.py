@@ -0,0 +1,57 @@
+import threading
+
+import numpy as np
+
+from frame_source import FakeFrameSource, FrameMailbox
+
+
+def rgba(value, height=8, width=12):
+    frame = np.zeros((height, width, 4), np.uint8)
+    frame[..., :3] = value
+    frame[..., 3] = 255
+    return frame
+
+
+def test_consumer_gets_only_the_latest_frame():
+    source = FakeFrameSource()
+    source.start()
+    source.push(rgba(10))
+    source.push(rgba(200))  # Replaces the unconsumed frame
+
+    luma = source.next_frame(timeout=0)
+
+    assert luma.shape == (8, 12)
+    assert (luma == 200).all()
+    assert source.next_frame(timeout=0) is None
+    assert source.stats() == {'delivered': 1, 'replaced': 1}
+
+
+def test_waiting_consumer_is_woken_by_a_push():
+    source = FakeFrameSource()
+    source.start()
+    frames = []
+    consumer = threading.Thread(target=lambda: frames.append(source.next_frame(timeout=2.0)))
+    consumer.start()
+
+    source.push(rgba(90))
+    consumer.join()
+
+    assert (frames[0] == 90).all()
+
+
+def test_replaced_and_closed_frames_are_released():
+    released = []
+    mailbox = FrameMailbox(release=released.append)
+    mailbox.put('first')
+    mailbox.put('second')
+    assert released == ['first']
+
+    mailbox.close()
+    assert released == ['first', 'second']
+    mailbox.put('late')  # Arrives after close - released straight away
+    assert released == ['first', 'second', 'late']
+    assert mailbox.get(timeout=0) is None
+
+    mailbox.reopen()
+    mailbox.put('third')
+    assert mailbox.get(timeout=0) == 'third'
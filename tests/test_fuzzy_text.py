@@ -0,0 +1,60 @@
+import pytest
+
+from fuzzy_text import TextChangeDetector, fold_text
+from translation_cache import TranslationCache
+
+
+@pytest.mark.parametrize('jittered, original', [
+    ("Ship to lreland", "Ship to Ireland"),
+    ("Room 1O4", "Room 104"),
+    ("Total |n cart", "Total In cart"),
+    ("  Sign   in  ", "Sign in"),
+    ("اهلا بك", "أهلا بك"),
+])
+def test_look_alike_glyphs_fold_together(jittered, original):
+    assert fold_text(jittered) == fold_text(original)
+
+
+@pytest.mark.parametrize('changed, original', [
+    ("The file is not saved", "The file is saved"),  # Negation
+    ("3 files deleted", "3 file deleted"),  # Plural
+    ("Polish", "polish"),  # Case
+    ("Done?", "Done."),  # Question vs statement
+    ("Done", "Done."),  # Dropped punctuation
+    ("Gate 22", "Gate 23"),
+    ("Delete all items", "Delete al items"),
+])
+def test_meaningful_edits_do_not_fold_together(changed, original):
+    assert fold_text(changed) != fold_text(original)
+
+
+@pytest.mark.parametrize('changed, original', [
+    ("The file is not saved", "The file is saved"),
+    ("3 files deleted", "3 file deleted"),
+    ("Polish", "polish"),
+    ("Done?", "Done."),
+])
+def test_cache_never_returns_another_texts_translation(changed, original):
+    cache = TranslationCache()
+    cache.set(original, "translation of the original")
+
+    assert cache.get(changed) is None
+    assert cache.stats()['fuzzy_hits'] == 0
+
+
+def test_cache_hit_across_ocr_jitter():
+    cache = TranslationCache()
+    cache.set("Ship to Ireland", "الشحن إلى أيرلندا")
+
+    assert cache.get("Ship to lreland") == "الشحن إلى أيرلندا"
+    assert cache.get("Ship to lreland", target_lang='fr') is None
+    assert cache.stats()['fuzzy_hits'] == 1
+
+
+def test_change_detector_ignores_jitter_but_not_edits():
+    detector = TextChangeDetector()
+    assert detector.has_changed("Welcome back\nYou have 1 new message")
+    assert not detector.has_changed("Welcome back\nYou have l new message")
+    assert detector.has_changed("Welcome back\nYou have 1 new messages")
+    assert detector.has_changed("Welcome back?\nYou have 1 new messages")
+    assert detector.stats() == {'checks': 4, 'jitter': 1}
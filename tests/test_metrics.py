@@ -0,0 +1,73 @@
+import urllib.request
+
+from metrics import MetricsRegistry, MetricsServer
+
+
+def sample_lines(text, name):
+    return [line for line in text.splitlines() if line.startswith(name)]
+
+
+def test_counter_and_gauge_text_format():
+    registry = MetricsRegistry()
+    errors = registry.counter('errors_total', "Errors by stage")
+    errors.inc(stage='ocr', type='ValueError')
+    errors.inc(2, stage='ocr', type='ValueError')
+    registry.gauge('queue_depth', "Items waiting", func=lambda: [({'stage': 'render'}, 4)])
+
+    text = registry.render_prometheus()
+
+    assert text.endswith("\n")
+    assert text.splitlines()[:3] == [
+        "# HELP errors_total Errors by stage",
+        "# TYPE errors_total counter",
+        'errors_total{stage="ocr",type="ValueError"} 3',
+    ]
+    assert "# TYPE queue_depth gauge" in text
+    assert 'queue_depth{stage="render"} 4' in text
+
+
+def test_label_values_are_escaped():
+    registry = MetricsRegistry()
+    registry.counter('errors_total').inc(message='say "hi"\\now\nthen')
+
+    assert sample_lines(registry.render_prometheus(), 'errors_total{') == [
+        'errors_total{message="say \\"hi\\"\\\\now\\nthen"} 1'
+    ]
+
+
+def test_histogram_exports_cumulative_buckets_sum_and_count():
+    registry = MetricsRegistry()
+    latency = registry.histogram('stage_latency_seconds', "Per-stage latency")
+    for value in (0.003, 0.02, 20.0):
+        latency.observe(value, stage='ocr')
+
+    text = registry.render_prometheus()
+
+    assert "# TYPE stage_latency_seconds histogram" in text
+    buckets = {
+        line.split('le="')[1].split('"')[0]: int(line.rsplit(" ", 1)[1])
+        for line in sample_lines(text, 'stage_latency_seconds_bucket')
+    }
+    assert buckets['0.001'] == 0
+    assert buckets['0.005'] == 1
+    assert buckets['0.025'] == 2
+    assert buckets['10.0'] == 2
+    assert buckets['+Inf'] == 3
+    assert list(buckets.values()) == sorted(buckets.values())  # Cumulative
+    assert 'stage_latency_seconds_bucket{stage="ocr",le="+Inf"} 3' in text
+    assert 'stage_latency_seconds_count{stage="ocr"} 3' in text
+    [total] = sample_lines(text, 'stage_latency_seconds_sum')
+    assert abs(float(total.rsplit(" ", 1)[1]) - 20.023) < 1e-9
+
+
+def test_endpoint_serves_the_registry():
+    registry = MetricsRegistry()
+    registry.counter('frames_total', "Frames").inc()
+    server = MetricsServer(registry, port=0)
+    server.start()
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{server.port}/metrics", timeout=5) as response:
+            assert response.headers['Content-Type'].startswith('text/plain; version=0.0.4')
+            assert "frames_total 1" in response.read().decode('utf-8')
+    finally:
+        server.stop()
@@ -0,0 +1,51 @@
+import cv2
+import numpy as np
+
+from motion import MotionEstimator, shift_regions
+from ocr_engine import OCRLine
+
+HEIGHT, WIDTH = 1152, 648
+
+
+def settings_page(lines=48):
+    """Tall white page of text lines 60 px apart, scrolled through a HEIGHT-high window"""
+    page = np.full((lines * 60 + 120, WIDTH), 255, np.uint8)
+    for i in range(lines):
+        cv2.putText(page, f"Line {i} of the settings page", (20, 40 + i * 60),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.9, 0, 2)
+    return page
+
+
+def test_recovers_a_known_scroll():
+    page = settings_page()
+    estimator = MotionEstimator()
+
+    assert estimator.estimate(page[0:HEIGHT]) is None  # No reference yet
+    assert estimator.estimate(page[37:37 + HEIGHT]) == (0, -37)  # Scrolled down: content moves up
+    assert estimator.estimate(page[37:37 + HEIGHT]) == (0, 0)
+    assert estimator.estimate(page[0:HEIGHT]) == (0, 37)
+    assert estimator.stats() == {'estimates': 3, 'scrolls': 2, 'rejected': 0}
+
+
+def test_content_change_is_not_a_scroll():
+    estimator = MotionEstimator()
+    estimator.estimate(settings_page()[0:HEIGHT])
+
+    other = np.full((HEIGHT, WIDTH), 255, np.uint8)
+    cv2.circle(other, (300, 500), 200, 0, -1)
+
+    assert estimator.estimate(other) is None
+    assert estimator.stats()['rejected'] == 1
+
+
+def test_shift_regions_keeps_whole_lines_and_returns_the_exposed_strip():
+    regions = [
+        OCRLine("cut at the top", (20, 0, 300, 30), 90),
+        OCRLine("middle", (20, 500, 300, 30), 90),
+        OCRLine("near the bottom", (20, 1100, 300, 30), 90),
+    ]
+
+    kept, area = shift_regions(regions, 0, -37, (HEIGHT, WIDTH))
+
+    assert kept == [OCRLine("middle", (20, 463, 300, 30), 90), OCRLine("near the bottom", (20, 1063, 300, 30), 90)]
+    assert area == (0, 1093, WIDTH, HEIGHT - 1093)  # Below the last kept line
@@ -0,0 +1,62 @@
+import threading
+
+from ocr_engine import OCREnginePool
+
+
+class FakeEngine:
+    name = 'fake'
+
+    def __init__(self):
+        self.closed = False
+        self.busy = threading.Event()
+        self.release = threading.Event()
+
+    def recognize(self, image, psm=6, lang=None):
+        assert not self.closed
+        self.busy.set()
+        self.release.wait(5)
+        assert not self.closed  # Must not be closed under a running recognition
+        return "text"
+
+    def close(self):
+        self.closed = True
+
+
+def test_close_skips_engines_that_are_checked_out():
+    engines = []
+
+    def factory():
+        engines.append(FakeEngine())
+        return engines[-1]
+
+    pool = OCREnginePool(size=1, factory=factory)
+    results = []
+    worker = threading.Thread(target=lambda: results.append(pool.recognize(None)))
+    worker.start()
+    assert engines and engines[0].busy.wait(5)
+
+    pool.close()
+    assert not engines[0].closed
+
+    engines[0].release.set()
+    worker.join(5)
+    assert results == ["text"]
+    assert engines[0].closed  # Closed on return instead of going back to the pool
+
+
+def test_close_closes_idle_engines_and_pool_restarts():
+    engines = []
+
+    def factory():
+        engines.append(FakeEngine())
+        engines[-1].release.set()
+        return engines[-1]
+
+    pool = OCREnginePool(size=2, factory=factory)
+    assert pool.recognize(None) == "text"
+    pool.close()
+    assert len(engines) == 2 and all(engine.closed for engine in engines)
+
+    assert pool.recognize(None) == "text"
+    assert len(engines) == 4
+    pool.close()
@@ -0,0 +1,112 @@
+from overlay_layout import OverlayLayout, OverlayRegion
+from overlay_presenter import FakeOverlaySink, OverlayPresenter
+
+
+class ManualPost:
+    """Holds posted callables until the test runs them, like a UI thread between frames"""
+    def __init__(self):
+        self.queue = []
+
+    def __call__(self, callback):
+        self.queue.append(callback)
+
+    def run(self):
+        queue, self.queue = self.queue, []
+        for callback in queue:
+            callback()
+
+
+def region(text, y, display=None):
+    return OverlayRegion((text, 0), (0, y, 100, 20), display or text, display or text)
+
+
+def presenter_with(sink, post, clock):
+    return OverlayPresenter(sink, OverlayLayout(), post=post, clock=clock)
+
+
+def test_text_burst_collapses_to_one_render_with_the_latest_text(clock):
+    sink, post = FakeOverlaySink(), ManualPost()
+    presenter = presenter_with(sink, post, clock)
+
+    for i in range(10):
+        presenter.show_text(f"translation {i}")
+    assert len(post.queue) == 1
+    assert sink.renders == 0
+
+    post.run()
+    assert sink.texts == ["translation 9"]
+    assert sink.renders == 1
+    stats = presenter.stats()
+    assert (stats['updates'], stats['posts'], stats['flushes'], stats['coalesced']) == (10, 1, 1, 9)
+
+
+def test_region_burst_collapses_to_one_render_with_the_latest_regions(clock):
+    sink, post = FakeOverlaySink(), ManualPost()
+    presenter = presenter_with(sink, post, clock)
+
+    presenter.show_regions([region("a", 0), region("b", 30)])
+    presenter.show_regions([region("a", 10), region("b", 40)])
+    presenter.show_regions([region("a", 10, display="A"), region("c", 70)])
+    assert len(post.queue) == 1
+
+    post.run()
+    assert sink.renders == 1
+    (diff,) = sink.diffs
+    assert sorted(r.key[0] for r in diff.added) == ["a", "c"]
+    assert {r.key[0]: r.display for r in presenter.layout.regions.values()} == {"a": "A", "c": "c"}
+
+
+def test_mixed_burst_latest_kind_wins(clock):
+    sink, post = FakeOverlaySink(), ManualPost()
+    presenter = presenter_with(sink, post, clock)
+
+    presenter.show_regions([region("a", 0)])
+    presenter.show_text("panel text")
+    post.run()
+    assert sink.texts == ["panel text"]
+    assert sink.diffs == []
+    assert sink.renders == 1
+
+
+def test_each_frame_gets_its_own_post(clock):
+    sink, post = FakeOverlaySink(), ManualPost()
+    presenter = presenter_with(sink, post, clock)
+
+    for frame in range(3):
+        presenter.show_text(f"first {frame}")
+        presenter.show_text(f"second {frame}")
+        post.run()
+    assert sink.texts == ["second 0", "second 1", "second 2"]
+    assert presenter.stats()['posts'] == 3
+
+
+def test_repeated_content_is_not_redrawn(clock):
+    sink, post = FakeOverlaySink(), ManualPost()
+    presenter = presenter_with(sink, post, clock)
+
+    presenter.show_text("same")
+    post.run()
+    presenter.show_text("same")
+    post.run()
+    presenter.show_regions([region("a", 0)])
+    post.run()
+    presenter.show_regions([region("a", 0)])
+    post.run()
+
+    assert sink.renders == 2
+    assert presenter.stats()['noops'] == 2
+
+
+def test_haptics_are_rate_limited(clock):
+    sink = FakeOverlaySink()
+    presenter = OverlayPresenter(sink, OverlayLayout(), haptic_interval=3.0, clock=clock)
+
+    presenter.show_text("one")
+    clock.now += 1.0
+    presenter.show_text("two")
+    clock.now += 3.0
+    presenter.show_text("three")
+
+    assert sink.texts == ["one", "two", "three"]  # No post: flushed immediately
+    assert sink.vibrations == 2
+    assert presenter.stats()['haptics_suppressed'] == 1
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from preprocessing import Preprocessor
+
+
+def gradient_frame(height=120, width=200):
+    return np.tile(np.linspace(40, 220, width).astype(np.uint8), (height, 1))
+
+
+def test_resize_and_contrast_reuse_their_buffers():
+    preprocessor = Preprocessor(steps=('resize', 'contrast'), scale=1.5)
+    frame = gradient_frame()
+
+    first = preprocessor.process(frame)
+    assert first.shape == (180, 300)
+    assert first.dtype == np.uint8
+    assert first.std() > frame.std()  # Contrast spread the gray levels
+
+    second = preprocessor.process(frame)
+    assert second is first  # Same buffer, no new allocation
+    assert set(preprocessor.stats()) == {'resize', 'contrast'}
+
+
+def test_contrast_matches_pil():
+    ImageEnhance = pytest.importorskip('PIL.ImageEnhance')
+    Image = pytest.importorskip('PIL.Image')
+    frame = gradient_frame()
+    frame[40:80, 50:150] = 30
+
+    ours = Preprocessor(steps=('contrast',), contrast=1.5).process(frame)
+    pil = np.asarray(ImageEnhance.Contrast(Image.fromarray(frame)).enhance(1.5))
+
+    # PIL rounds the mean gray level first, so values may differ by one
+    assert np.abs(ours.astype(int) - pil.astype(int)).max() <= 1
+
+
+def test_adaptive_threshold_is_binary():
+    frame = gradient_frame()
+    frame[50:60, 20:180] = 0  # A dark stroke on the gradient
+
+    out = Preprocessor(steps=('clahe', 'denoise', 'adaptive_threshold')).process(frame)
+
+    assert set(np.unique(out)) <= {0, 255}
+    assert (out[52:58, 30:170] == 0).all()
+    assert (out[:30] == 255).all()
+
+
+def test_unknown_step_is_rejected():
+    with pytest.raises(ValueError):
+        Preprocessor(steps=('resize', 'sharpen'))
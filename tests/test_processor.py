@@ -0,0 +1,150 @@
+import numpy as np
+
+from ocr_engine import OCRLine
+from processor import ScreenProcessor
+from translation_backend import BackendError, CircuitBreaker, ResilientBackend, TranslationBackend
+
+
+class OutageBackend(TranslationBackend):
+    """Fails while `down` is set, otherwise tags the text"""
+    name = 'outage'
+
+    def __init__(self):
+        self.down = True
+        self.calls = 0
+
+    def translate(self, text, timeout=None):
+        self.calls += 1
+        if self.down:
+            raise BackendError("HTTP 503")
+        return f"<ar>{text}</ar>"
+
+
+def make_processor(clock):
+    backend = OutageBackend()
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30.0, clock=clock)
+    translator = ResilientBackend(backend, retries=0, breaker=breaker, clock=clock, sleep=lambda s: None)
+    return ScreenProcessor(translator=translator, target_lang='ar'), backend
+
+
+def translate_stage(processor, item):
+    translation = processor.translate(item[0])
+    processor.track_fallback(item, translation)
+    return translation
+
+
+def test_static_screen_is_translated_after_an_outage(clock):
+    processor, backend = make_processor(clock)
+    text = "Your session has expired"
+    item = (processor.filter_text(text), [])
+
+    translation = translate_stage(processor, item)
+    assert not translation.complete
+    assert translation.raw == text  # Shown untranslated
+
+    # The screen does not change: OCR output is the same text, which is not "changed"
+    assert processor.filter_text(text) is None
+    # Circuit open - nothing to send yet
+    assert processor.take_retry() is None
+
+    backend.down = False
+    clock.now += 30.0
+    retry = processor.take_retry()
+    assert retry == item
+    assert processor.take_retry() is None  # Handed out once
+
+    translation = translate_stage(processor, retry)
+    assert translation.complete
+    assert translation.raw == f"<ar>{text}</ar>"
+    assert processor.take_retry() is None
+
+
+def test_complete_translation_clears_a_pending_retry(clock):
+    processor, backend = make_processor(clock)
+    translate_stage(processor, ("Your session has expired", []))
+    backend.down = False
+    clock.now += 30.0
+
+    # A newer screen was translated first - the old text is no longer on screen
+    assert translate_stage(processor, ("Welcome back", [])).complete
+    assert processor.take_retry() is None
+
+
+class BandOCRPool:
+    """Reads each dark horizontal band as one line: black ink is source text, gray ink our overlay"""
+    engine_name = 'bands'
+
+    def recognize_lines(self, gray, psm=3, lang=None):
+        lines = []
+        ink = gray.min(axis=1) < 200
+        y = 0
+        while y < len(ink):
+            if not ink[y]:
+                y += 1
+                continue
+            top = y
+            while y < len(ink) and ink[y]:
+                y += 1
+            band = gray[top:y]
+            columns = (band < 200).any(axis=0).nonzero()[0]
+            text = f"Source line {top}" if band.min() < 30 else "ترجمة السطر"
+            lines.append(OCRLine(text, (int(columns[0]), top, int(columns[-1] - columns[0] + 1), y - top), 90.0))
+        return lines
+
+    def detect_script(self, image):
+        return None
+
+    def close(self):
+        pass
+
+
+def band_processor():
+    processor = ScreenProcessor(ocr_pool=BandOCRPool())
+    processor.use_text_regions = False
+    processor.use_tile_ocr = False
+    processor.preprocessor.steps = ()
+    return processor
+
+
+def app_screen(overlay=False):
+    frame = np.full((240, 400), 255, dtype=np.uint8)
+    for y in (50, 120):
+        frame[y:y + 20, 20:220] = 0
+        if overlay:
+            frame[y:y + 20, 20:220] = 140  # Our translation, drawn exactly over the source line
+    return frame
+
+
+def test_own_overlay_is_not_read_back():
+    processor = band_processor()
+    frame = processor.accept_frame(app_screen())
+    text = processor.filter_text(processor.recognize_frame(frame))
+    assert text == "Source line 50\nSource line 120"
+    source_lines = processor.lines
+
+    # The render stage shows positioned regions over both lines
+    processor.set_overlay_lines(source_lines)
+
+    # The mirrored capture now shows our overlay where the source was; the masked
+    # boxes differ from the reference once, and read back as the kept source text
+    frame = processor.accept_frame(app_screen(overlay=True))
+    assert frame is not None
+    assert processor.recognize_frame(frame) == text
+    assert processor.lines == source_lines
+    assert processor.filter_text(text) is None  # Nothing to retranslate
+    # And the overlay staying on screen is not a change either
+    assert processor.accept_frame(app_screen(overlay=True)) is None
+
+
+def test_new_line_next_to_the_overlay_is_read():
+    processor = band_processor()
+    processor.filter_text(processor.recognize_frame(processor.accept_frame(app_screen())))
+    processor.set_overlay_lines(processor.lines)
+    processor.accept_frame(app_screen(overlay=True))
+
+    screen = app_screen(overlay=True)
+    screen[190:205, 20:120] = 0
+    frame = processor.accept_frame(screen)
+    assert frame is not None
+    text = processor.filter_text(processor.recognize_frame(frame))
+    assert text == "Source line 50\nSource line 120\nSource line 190"
@@ -0,0 +1,63 @@
+import threading
+
+import pytest
+
+from scheduler import CaptureScheduler
+
+
+def test_wait_time_follows_the_clock(clock):
+    scheduler = CaptureScheduler(target_latency=1.0, min_interval=0.25, clock=clock)
+    assert scheduler.wait_time() == 0.0
+
+    interval = scheduler.on_capture(changed=True)
+    assert interval == pytest.approx(2.0)  # Latency slack of a second, nothing measured yet
+    assert scheduler.wait_time() == pytest.approx(2.0)
+
+    clock.now += 1.5
+    assert scheduler.wait_time() == pytest.approx(0.5)
+    clock.now += 1.0
+    assert scheduler.wait_time() == 0.0
+
+
+def test_static_content_backs_off_and_a_change_resets(clock):
+    scheduler = CaptureScheduler(target_latency=0.5, min_interval=0.25, max_interval=4.0,
+                                 backoff=2.0, clock=clock)
+    active = scheduler.on_capture(changed=True)
+    intervals = []
+    for _ in range(6):
+        clock.now += scheduler.wait_time()
+        intervals.append(scheduler.on_capture(changed=False))
+
+    assert intervals == sorted(intervals)
+    assert intervals[0] > active
+    assert intervals[-1] == 4.0
+    assert scheduler.on_capture(changed=True) < intervals[0]
+
+
+def test_slow_stages_stretch_the_interval(clock):
+    scheduler = CaptureScheduler(target_latency=1.0, cpu_budget=0.5, clock=clock)
+    scheduler.observe_stage('ocr', 0.8)
+    scheduler.observe_stage('translate', 0.4)
+
+    assert scheduler.processing_latency() == pytest.approx(1.2)
+    assert scheduler.on_capture(changed=True) == pytest.approx(1.2 / 0.5)
+    assert scheduler.stats()['stages'] == {'ocr': 0.8, 'translate': 0.4}
+
+
+def test_stage_observations_from_other_threads(clock):
+    scheduler = CaptureScheduler(clock=clock)
+
+    def observe(prefix):
+        for i in range(5000):
+            scheduler.observe_stage(f"{prefix}{i % 50}", 0.01)
+
+    threads = [threading.Thread(target=observe, args=(prefix,)) for prefix in "abc"]
+    for thread in threads:
+        thread.start()
+    # New stages appear while the capture thread sums and reports them
+    while any(thread.is_alive() for thread in threads):
+        scheduler.on_capture(changed=True)
+        scheduler.stats()
+    for thread in threads:
+        thread.join()
+    assert len(scheduler.stats()['stages']) == 150
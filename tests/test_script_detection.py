@@ -0,0 +1,65 @@
+import numpy as np
+
+from script_detection import OCRLanguageSelector, in_script, ocr_languages, script_shares
+
+
+def test_language_string_keeps_latin_first():
+    assert ocr_languages({'Arabic', 'Latin'}) == 'eng+ara'
+    assert ocr_languages(['Latin', 'Arabic', 'Cyrillic']) == 'eng+rus+ara'
+    assert ocr_languages({'Arabic'}) == 'ara'
+    assert ocr_languages({'Klingon', 'Latin'}) == 'eng'
+
+
+def test_script_shares():
+    shares = script_shares("Hello مرحبا 123")
+    assert shares == {'Latin': 0.5, 'Arabic': 0.5}
+    assert in_script("مرحبا بك", 'Arabic')
+    assert not in_script("Hello مرحبا", 'Arabic')
+    assert in_script("12:30", 'Arabic')  # No letters
+
+
+class CountingGuess:
+    def __init__(self, script=None):
+        self.script = script
+        self.calls = 0
+
+    def __call__(self, thumbnail):
+        self.calls += 1
+        return self.script
+
+
+def frame(seed):
+    return np.random.default_rng(seed).integers(0, 256, (480, 640), dtype=np.uint8)
+
+
+def test_osd_runs_only_on_recheck_frames_once_scripts_are_learned():
+    guess = CountingGuess()
+    selector = OCRLanguageSelector(guess=guess, recheck_every=10)
+
+    assert selector.languages(frame(0)) == 'eng+ara'  # Nothing learned yet
+    assert guess.calls == 1
+    selector.observe("Settings and privacy")
+
+    # Every frame differs, like a scrolling screen - still no OSD between rechecks
+    languages = [selector.languages(frame(seed)) for seed in range(1, 15)]
+    assert guess.calls == 2  # Frame 10 only
+    assert languages[8] == 'eng+ara'  # The recheck frame runs every default model
+    assert set(languages[:8] + languages[9:]) == {'eng'}
+
+
+def test_osd_guess_adds_a_new_script_on_recheck():
+    guess = CountingGuess('Cyrillic')
+    selector = OCRLanguageSelector(guess=guess, recheck_every=3)
+    selector.languages(frame(0))
+    selector.observe("Settings")
+
+    assert selector.languages(frame(1)) == 'eng'
+    assert selector.languages(frame(2)) == 'eng+rus+ara'
+    selector.observe("Настройки и конфиденциальность")
+    assert 'rus' in selector.languages(frame(3))
+
+
+def test_source_language_restricts_defaults():
+    selector = OCRLanguageSelector()
+    selector.set_source_language('ar')
+    assert selector.languages(frame(0)) == 'ara'
@@ -0,0 +1,121 @@
+import threading
+import time
+
+import pytest
+
+from processor import ScreenProcessor
+from single_flight import SingleFlight
+from translation_backend import BackendError, TranslationBackend
+
+
+def wait_until(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.001)
+
+
+def run_follower(flights, key, results):
+    def follow():
+        try:
+            results.append(flights.do(key, lambda: "follower called", timeout=2.0))
+        except Exception as e:
+            results.append(e)
+    thread = threading.Thread(target=follow)
+    thread.start()
+    wait_until(lambda: flights.followers == 1)
+    return thread
+
+
+def test_leader_result_is_shared_with_followers():
+    flights = SingleFlight()
+    release = threading.Event()
+    results = []
+
+    def slow():
+        release.wait(2.0)
+        return "result"
+
+    leader = threading.Thread(target=lambda: results.append(flights.do('key', slow)))
+    leader.start()
+    wait_until(lambda: flights.leaders == 1)
+    follower = run_follower(flights, 'key', results)
+
+    release.set()
+    leader.join()
+    follower.join()
+
+    assert results == ["result", "result"]
+    assert flights.stats() == {'in_flight': 0, 'leaders': 1, 'saved': 1}
+
+
+def test_leader_failure_reaches_followers():
+    flights = SingleFlight()
+    release = threading.Event()
+    results = []
+
+    def failing():
+        release.wait(2.0)
+        raise BackendError("HTTP 503")
+
+    def lead():
+        with pytest.raises(BackendError):
+            flights.do('key', failing)
+
+    leader = threading.Thread(target=lead)
+    leader.start()
+    wait_until(lambda: flights.leaders == 1)
+    follower = run_follower(flights, 'key', results)
+
+    release.set()
+    leader.join()
+    follower.join()
+
+    assert len(results) == 1 and isinstance(results[0], BackendError)
+    # The failed flight is forgotten: the next caller leads a new one
+    assert flights.do('key', lambda: "retried") == "retried"
+    assert flights.stats()['leaders'] == 2
+
+
+def test_different_keys_do_not_share():
+    flights = SingleFlight()
+
+    assert flights.do('a', lambda: 1) == 1
+    assert flights.do('b', lambda: 2) == 2
+    assert flights.stats() == {'in_flight': 0, 'leaders': 2, 'saved': 0}
+
+
+class BlockingBackend(TranslationBackend):
+    name = 'blocking'
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.calls = 0
+
+    def translate(self, text, timeout=None):
+        self.calls += 1
+        self.release.wait(2.0)
+        return f"<ar>{text}</ar>"
+
+
+def test_concurrent_translations_of_a_segment_share_one_call():
+    backend = BlockingBackend()
+    processor = ScreenProcessor(translator=backend, target_lang='ar')
+    results = []
+
+    def translate():
+        results.append(processor.translate("Payment received").raw)
+
+    first = threading.Thread(target=translate)
+    first.start()
+    wait_until(lambda: backend.calls == 1)
+    second = threading.Thread(target=translate)
+    second.start()
+    wait_until(lambda: processor.inflight.followers == 1)
+
+    backend.release.set()
+    first.join()
+    second.join()
+
+    assert results == ["<ar>Payment received</ar>"] * 2
+    assert backend.calls == 1
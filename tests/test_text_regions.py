@@ -0,0 +1,42 @@
+import cv2
+import numpy as np
+
+from text_regions import TextRegionDetector, group_lines
+
+FONT = cv2.FONT_HERSHEY_SIMPLEX
+
+
+def screen(*texts, height=1152, width=648):
+    """White frame with dark text at (x, baseline y) positions"""
+    gray = np.full((height, width), 255, np.uint8)
+    for text, origin in texts:
+        cv2.putText(gray, text, origin, FONT, 1.2, 0, 2, cv2.LINE_AA)
+    return gray
+
+
+def test_boxes_cover_every_text_line_in_reading_order():
+    gray = screen(("Wrong PIN", (40, 100)), ("OK", (500, 300)), ("Try again later", (40, 300)),
+                  ("Thank you", (200, 800)))
+
+    boxes = TextRegionDetector().detect(gray)
+
+    lines = group_lines(boxes)
+    assert len(lines) == 3
+    assert [box for line in lines for box in line] == boxes  # Already in reading order
+    assert [round(line[0][1], -2) for line in lines] == [100, 300, 800]
+    assert lines[1][-1][0] > 450  # "OK" is last on its line, right of "Try again later"
+
+    # Every glyph pixel is inside a box
+    covered = np.zeros(gray.shape, bool)
+    for x, y, w, h in boxes:
+        covered[y:y + h, x:x + w] = True
+    assert covered[gray < 128].all()
+    # ... and the boxes stay close to the text
+    assert covered.mean() < 0.05
+
+
+def test_blank_and_solid_areas_are_not_text():
+    gray = np.full((1152, 648), 255, np.uint8)
+    gray[500:700, 100:500] = 40  # A dark panel is a solid blob, not a line
+
+    assert TextRegionDetector().detect(gray) == []
@@ -0,0 +1,41 @@
+from text_segments import join_segments, split_segments, translate_segments, unique_segments
+
+
+def test_split_and_join_round_trip():
+    text = "Your PIN is wrong. Try again!\nBalance:   42 USD\n\nهل تريد المتابعة؟ نعم"
+
+    lines = split_segments(text)
+
+    assert lines == [
+        ["Your PIN is wrong.", "Try again!"],
+        ["Balance: 42 USD"],
+        ["هل تريد المتابعة؟", "نعم"],
+    ]
+    # Blank lines and runs of spaces are layout, not text
+    assert join_segments(lines) == "Your PIN is wrong. Try again!\nBalance: 42 USD\nهل تريد المتابعة؟ نعم"
+    assert split_segments(join_segments(lines)) == lines
+
+
+def test_translated_segments_rejoin_in_order():
+    lines = split_segments("Cancel. OK.\nCancel.")
+    segments = unique_segments(lines)
+    assert segments == ["Cancel.", "OK."]
+
+    translations = dict(zip(segments, translate_segments(segments, lambda text: text.upper())))
+
+    assert join_segments([[translations[s] for s in sentences] for sentences in lines]) == "CANCEL. OK.\nCANCEL."
+
+
+def test_merged_lines_fall_back_to_the_batch_call():
+    calls = []
+
+    def translate(text):
+        calls.append(text)
+        return text.replace("\n", " ")  # Provider lost the line structure
+
+    def translate_batch(batch):
+        calls.append(list(batch))
+        return [s.lower() for s in batch]
+
+    assert translate_segments(["One.", "Two."], translate, translate_batch) == ["one.", "two."]
+    assert calls == ["One.\nTwo.", ["One.", "Two."]]
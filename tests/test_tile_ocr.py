@@ -0,0 +1,66 @@
+import numpy as np
+
+from ocr_engine import OCRLine
+from tile_ocr import TileOCR
+
+
+class RecordingOCR:
+    """Stands in for the engine pool; text depends on the languages it was asked for"""
+    def __init__(self):
+        self.lang = None
+        self.calls = 0
+
+    def recognize(self, tile, psm):
+        self.calls += 1
+        return [OCRLine(f"text read as {self.lang}", (0, 0, tile.shape[1], tile.shape[0]), 90.0)]
+
+
+def text_frame():
+    gray = np.full((120, 200), 255, dtype=np.uint8)
+    gray[10:30, 10:150] = 0
+    gray[60:80, 20:180] = 0
+    return gray
+
+
+def recognize(tiles, ocr, gray, lang):
+    ocr.lang = lang
+    return [line.text for line in tiles.recognize_frame(gray, lang)]
+
+
+def test_unchanged_tiles_are_reused_for_the_same_languages():
+    ocr = RecordingOCR()
+    tiles = TileOCR(ocr.recognize)
+    gray = text_frame()
+
+    first = recognize(tiles, ocr, gray, 'eng')
+    calls = ocr.calls
+    assert recognize(tiles, ocr, gray, 'eng') == first
+    assert ocr.calls == calls
+    assert tiles.stats()['reused'] == calls
+
+
+def test_language_change_reads_tiles_again():
+    ocr = RecordingOCR()
+    tiles = TileOCR(ocr.recognize)
+    gray = text_frame()
+
+    assert set(recognize(tiles, ocr, gray, 'eng')) == {"text read as eng"}
+    calls = ocr.calls
+    assert set(recognize(tiles, ocr, gray, 'eng+ara')) == {"text read as eng+ara"}
+    assert ocr.calls == 2 * calls
+    # Both readings stay cached side by side
+    assert set(recognize(tiles, ocr, gray, 'eng')) == {"text read as eng"}
+    assert ocr.calls == 2 * calls
+
+
+def test_boxes_are_keyed_by_language_too():
+    ocr = RecordingOCR()
+    tiles = TileOCR(ocr.recognize)
+    gray = text_frame()
+    boxes = [(10, 10, 140, 20), (20, 60, 160, 20)]
+
+    ocr.lang = 'eng'
+    assert [line.text for line in tiles.recognize_boxes(gray, boxes, 'eng')] == ["text read as eng"] * 2
+    ocr.lang = 'ara'
+    assert [line.text for line in tiles.recognize_boxes(gray, boxes, 'ara')] == ["text read as ara"] * 2
+    assert ocr.calls == 4
@@ -0,0 +1,124 @@
+import time
+
+import pytest
+
+from benchmarks.backend_bench import FlakyTranslateServer
+from translation_backend import (BackendError, BackendUnavailable, CircuitBreaker, GoogleTranslateBackend,
+                                 ResilientBackend)
+
+
+@pytest.fixture
+def serve():
+    servers = []
+
+    def start(**kwargs):
+        server = FlakyTranslateServer(latency=0.0, **kwargs)
+        servers.append(server)
+        return server, server.start()
+
+    yield start
+    for server in servers:
+        server.stop()
+
+
+def resilient(base_url, read_timeout=1.0, breaker=None, **kwargs):
+    backend = GoogleTranslateBackend(base_url=base_url, read_timeout=read_timeout)
+    return ResilientBackend(backend, breaker=breaker, sleep=lambda seconds: None, **kwargs)
+
+
+def test_retry_then_success(serve):
+    server, base_url = serve(script=['fail', 'garbage'])
+    backend = resilient(base_url, retries=2)
+
+    assert backend.translate("hello") == "<ar>hello</ar>"
+    assert server.requests == 3
+    assert backend.breaker.state == CircuitBreaker.CLOSED
+    assert backend.breaker.failures == 0
+    backend.close()
+
+
+def test_deadline_exhausted(serve):
+    server, base_url = serve(script=['stall'] * 3, stall=2.0)
+    backend = resilient(base_url, read_timeout=0.3, deadline=0.5, retries=5)
+
+    start = time.monotonic()
+    with pytest.raises(BackendError) as raised:
+        backend.translate("hello")
+    elapsed = time.monotonic() - start
+
+    assert raised.value.retryable
+    assert elapsed < 1.5  # Bounded by the deadline, not the 2 s stall
+    assert backend.breaker.failures == 1
+    backend.close()
+
+
+def test_breaker_opens_and_rejects_without_calling(serve, clock):
+    server, base_url = serve(fail_rate=1.0)
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30.0, clock=clock)
+    backend = resilient(base_url, retries=1, breaker=breaker)
+
+    for _ in range(2):
+        with pytest.raises(BackendError):
+            backend.translate("hello")
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.trips == 1
+
+    requests_before = server.requests
+    with pytest.raises(BackendUnavailable):
+        backend.translate("hello")
+    assert server.requests == requests_before
+    backend.close()
+
+
+def test_half_open_probe_recovers(serve, clock):
+    server, base_url = serve(script=['fail', 'fail'])
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30.0, clock=clock)
+    backend = resilient(base_url, retries=0, breaker=breaker)
+
+    for _ in range(2):
+        with pytest.raises(BackendError):
+            backend.translate("hello")
+    assert breaker.state == CircuitBreaker.OPEN
+
+    clock.now += 30.0
+    assert backend.translate("hello") == "<ar>hello</ar>"
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert not breaker.probing
+    backend.close()
+
+
+class ExplodingOnce(GoogleTranslateBackend):
+    """Raises a non-BackendError (a bug, not a provider failure) on the first call"""
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.exploded = False
+
+    def translate(self, text, timeout=None):
+        if not self.exploded:
+            self.exploded = True
+            raise KeyError('unexpected')
+        return super().translate(text, timeout)
+
+
+def test_half_open_probe_failing_with_unexpected_error_reopens(serve, clock):
+    server, base_url = serve(script=['fail', 'fail'])
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30.0, clock=clock)
+    backend = resilient(base_url, retries=0, breaker=breaker)
+    for _ in range(2):
+        with pytest.raises(BackendError):
+            backend.translate("hello")
+
+    backend.backend = ExplodingOnce(base_url=base_url)
+    clock.now += 30.0
+    with pytest.raises(KeyError):
+        backend.translate("hello")
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.probing  # Not stuck: the next cool-down lets another probe through
+
+    with pytest.raises(BackendUnavailable):
+        backend.translate("hello")
+    clock.now += 30.0
+    assert backend.translate("hello") == "<ar>hello</ar>"
+    assert breaker.state == CircuitBreaker.CLOSED
+    backend.close()
+
@@ -0,0 +1,93 @@
+from fuzzy_text import fold_text
+from translation_cache import TranslationCache
+
+
+def cached_texts(cache):
+    return [key[2] for key in cache.cache]
+
+
+def test_lookup_refreshes_lru_order():
+    cache = TranslationCache(max_size=2)
+    cache.set("first", "1")
+    cache.set("second", "2")
+    assert cache.lookup("first") is not None
+
+    cache.set("third", "3")
+
+    assert cached_texts(cache) == ["first", "third"]
+    assert cache.stats()['evictions'] == 1
+
+
+def test_byte_limit_evicts_below_max_size():
+    cache = TranslationCache(max_size=100, max_bytes=30)
+    for text in ("aaaaa", "bbbbb", "ccccc"):
+        cache.set(text, "x" * 10)  # 15 bytes each
+
+    assert cached_texts(cache) == ["bbbbb", "ccccc"]
+    assert cache.total_bytes == 30
+    assert cache.stats()['evictions'] == 1
+
+
+def test_ttl_expires_exact_hits(clock):
+    cache = TranslationCache(ttl=10, clock=clock)
+    cache.set("Cancel", "إلغاء")
+    clock.now += 9
+    assert cache.get("Cancel") == "إلغاء"
+
+    clock.now += 2
+    assert cache.get("Cancel") is None
+    assert len(cache.cache) == 0
+    assert cache.total_bytes == 0
+
+
+def test_ttl_expires_fuzzy_hits(clock):
+    cache = TranslationCache(ttl=10, clock=clock)
+    cache.set("Total: 10", "المجموع: 10")
+    clock.now += 9
+    assert cache.get("Total: lO") == "المجموع: 10"  # OCR look-alikes
+    assert cache.stats()['fuzzy_hits'] == 1
+
+    clock.now += 2
+    assert cache.get("Total: lO") is None
+    assert len(cache.cache) == 0
+    assert cache.folded == {}
+
+
+def test_set_display_after_eviction_keeps_byte_count():
+    cache = TranslationCache(max_size=1)
+    cache.set("first", "1")
+    entry = cache.lookup("first")
+    cache.set("second", "2")  # Evicts "first"
+
+    cache.set_display(entry, "display form")
+
+    assert entry['display'] == "display form"
+    assert cache.total_bytes == sum(e['size'] for e in cache.cache.values())
+
+
+def test_set_display_counts_bytes_of_cached_entry():
+    cache = TranslationCache()
+    cache.set("first", "1")
+    before = cache.total_bytes
+
+    cache.set_display(cache.lookup("first"), "abc")
+
+    assert cache.total_bytes == before + 3
+
+
+def test_removing_one_of_two_folded_twins_keeps_the_other_reachable():
+    cache = TranslationCache(max_size=3)
+    cache.set("Item 1", "old")
+    cache.set("Item l", "new")  # Folds to the same text
+
+    cache.lookup("Item 1")  # "Item l" becomes least recently used
+    cache.set("other", "x")
+    cache.set("another", "y")  # Evicts "Item l"
+
+    assert cached_texts(cache) == ["Item 1", "other", "another"]
+    assert cache.get("Item I") == "old"  # Fuzzy path still finds the survivor
+
+    assert cache.folded[('auto', 'ar', fold_text("Item 1"))] == {('auto', 'ar', "Item 1"): None}
+
+    cache.clear()
+    assert cache.folded == {}
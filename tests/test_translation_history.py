@@ -0,0 +1,86 @@
+import pytest
+
+from translation_history import HistoryEntry, HistoryRing, TranslationHistory, TranslationLog
+
+
+def entries(count):
+    return [HistoryEntry(f"original {i}", f"translated {i}", timestamp=1000.0 + i) for i in range(count)]
+
+
+def open_log(tmp_path):
+    log = TranslationLog(str(tmp_path / 'history.db'), flush_interval=0.01)
+    log.open()
+    return log
+
+
+def test_ring_keeps_the_newest_entries_after_wrapping():
+    ring = HistoryRing(capacity=3)
+    for entry in entries(5):
+        ring.append(entry)
+
+    assert len(ring) == 3
+    assert [e.original for e in ring.newest()] == ["original 4", "original 3", "original 2"]
+    assert ring[0].original == "original 4"
+    assert ring[2].original == "original 2"
+    assert [e.original for e in ring.newest(2)] == ["original 4", "original 3"]
+    with pytest.raises(IndexError):
+        ring[3]
+
+
+def test_ring_clear():
+    ring = HistoryRing(capacity=2)
+    for entry in entries(3):
+        ring.append(entry)
+    ring.clear()
+
+    assert len(ring) == 0
+    assert ring.newest() == []
+
+
+def test_log_search_uses_the_full_text_index(tmp_path):
+    log = open_log(tmp_path)
+    try:
+        assert log.fts
+        log.append(HistoryEntry("Wrong PIN entered", "رقم التعريف خاطئ", 'en', 'ar', 1.0))
+        log.append(HistoryEntry("Payment received", "تم استلام الدفعة", 'en', 'ar', 2.0))
+        log.append(HistoryEntry("PIN changed", "تم تغيير الرقم", 'en', 'ar', 3.0))
+    finally:
+        log.close()  # Flushes the queue
+
+    log = open_log(tmp_path)
+    try:
+        assert [e.original for e in log.search("pin")] == ["PIN changed", "Wrong PIN entered"]
+        assert [e.original for e in log.search("wro pin")] == ["Wrong PIN entered"]  # Prefix terms, all must match
+        assert [e.original for e in log.search("الدفعة")] == ["Payment received"]
+        assert log.search('"') == []  # Quotes in the query are not FTS syntax
+        assert log.search("   ") == []
+        assert log.stats()['searches'] == 4
+    finally:
+        log.close()
+
+
+def test_history_reloads_the_newest_logged_entries(tmp_path):
+    log = open_log(tmp_path)
+    history = TranslationHistory(capacity=2, log=log)
+    for i in range(3):
+        history.add(f"original {i}", f"translated {i}")
+    log.close()
+
+    log = open_log(tmp_path)
+    try:
+        history = TranslationHistory(capacity=2)
+        history.attach(log)
+        assert [e.original for e in history.recent()] == ["original 2", "original 1"]
+        # The log still finds what the ring has dropped
+        assert [e.original for e in history.search("original 0")] == ["original 0"]
+    finally:
+        log.close()
+
+
+def test_history_without_a_log_searches_memory():
+    history = TranslationHistory(capacity=2)
+    history.add("Wrong PIN", "رقم خاطئ")
+    history.add("Thank you", "شكرا")
+
+    assert [e.translated for e in history.search("wrong pin")] == ["رقم خاطئ"]
+    assert history.search("") == []
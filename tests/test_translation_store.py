@@ -0,0 +1,75 @@
+import sqlite3
+
+from translation_store import PersistentTranslationStore, AUTO_VACUUM_INCREMENTAL
+
+
+def fill(store, count):
+    for i in range(count):
+        store.put(f"text number {i} " * 20, "t" * 200, 'en', 'ar')
+
+
+def pragma(path, name):
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute(f"PRAGMA {name}").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_fresh_database_uses_incremental_auto_vacuum_and_wal(tmp_path):
+    path = str(tmp_path / 'translations.db')
+    store = PersistentTranslationStore(path)
+    store.open()
+    store.close()
+
+    assert pragma(path, 'auto_vacuum') == AUTO_VACUUM_INCREMENTAL
+    assert pragma(path, 'journal_mode') == 'wal'
+
+
+def test_existing_wal_database_is_converted(tmp_path):
+    path = str(tmp_path / 'translations.db')
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("CREATE TABLE unrelated (value TEXT)")
+    conn.commit()
+    conn.close()
+    assert pragma(path, 'auto_vacuum') == 0
+
+    store = PersistentTranslationStore(path)
+    store.open()
+    store.put("hello", "مرحبا", 'en', 'ar')
+    store.close()
+
+    assert pragma(path, 'auto_vacuum') == AUTO_VACUUM_INCREMENTAL
+    assert pragma(path, 'journal_mode') == 'wal'
+
+
+def test_compaction_returns_pages_to_the_filesystem(tmp_path):
+    path = str(tmp_path / 'translations.db')
+    store = PersistentTranslationStore(path, max_rows=100)
+    store.open()
+    fill(store, 3000)
+    store.close()  # Flushes, then compacts
+
+    conn = sqlite3.connect(path)
+    rows = conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+    conn.close()
+    assert rows <= 100
+    assert pragma(path, 'freelist_count') == 0
+    assert pragma(path, 'page_count') < 100
+
+
+def test_reads_after_reopen(tmp_path):
+    path = str(tmp_path / 'translations.db')
+    store = PersistentTranslationStore(path)
+    store.open()
+    store.put("hello", "مرحبا", 'en', 'ar')
+    store.close()
+
+    store = PersistentTranslationStore(path)
+    store.open()
+    try:
+        assert store.get("hello", 'en', 'ar') == "مرحبا"
+        assert store.get("hello", 'en', 'fr') is None
+    finally:
+        store.close()
@@ -0,0 +1,90 @@
+import cv2
+
+
+# ==================== Text Region Detection ====================
+class TextRegionDetector:
+    """Find text-line boxes with a morphological gradient and connected components"""
+    def __init__(self, min_height=8, max_height=90, min_width=12, min_fill=0.1, max_fill=0.95,
+                 max_width=800, padding=3):
+        self.min_height = min_height
+        self.max_height = max_height
+        self.min_width = min_width
+        self.min_fill = min_fill  # Edge pixel density inside a box, rejects empty frames
+        self.max_fill = max_fill  # ... and solid blobs
+        self.max_width = max_width  # Wider frames are halved (pyrDown) until they fit
+        self.padding = padding
+        self.gradient_kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3))
+        self.close_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (9, 1))
+        self.frames = 0
+        self.pixels_total = 0
+        self.pixels_in_regions = 0
+
+    def detect(self, gray):
+        """Return text boxes (x, y, w, h) in `gray` coordinates, in reading order"""
+        scale = 1
+        small = gray
+        while small.shape[1] > self.max_width:
+            small = cv2.pyrDown(small)
+            scale *= 2
+
+        # Strong local contrast marks glyph edges
+        gradient = cv2.morphologyEx(small, cv2.MORPH_GRADIENT, self.gradient_kernel)
+        _, edges = cv2.threshold(gradient, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)
+
+        # Join the glyphs of a line horizontally into one component
+        joined = cv2.morphologyEx(edges, cv2.MORPH_CLOSE, self.close_kernel)
+        count, _, stats, _ = cv2.connectedComponentsWithStats(joined, connectivity=8)
+
+        min_h = self.min_height / scale
+        max_h = self.max_height / scale
+        min_w = self.min_width / scale
+        height, width = gray.shape[:2]
+        pad = self.padding
+
+        boxes = []
+        for x, y, w, h, _ in stats[1:count]:
+            if h < min_h or h > max_h or w < min_w:
+                continue
+            fill = cv2.countNonZero(edges[y:y + h, x:x + w]) / float(w * h)
+            if fill < self.min_fill or fill > self.max_fill:
+                continue
+
+            # Back to full resolution with a small margin for the glyph borders
+            x0 = max(0, x * scale - pad)
+            y0 = max(0, y * scale - pad)
+            x1 = min(width, (x + w) * scale + pad)
+            y1 = min(height, (y + h) * scale + pad)
+            boxes.append((int(x0), int(y0), int(x1 - x0), int(y1 - y0)))
+
+        self.frames += 1
+        self.pixels_total += height * width
+        self.pixels_in_regions += sum(w * h for _, _, w, h in boxes)
+        return reading_order(boxes)
+
+    def stats(self):
+        coverage = (self.pixels_in_regions / self.pixels_total * 100) if self.pixels_total else 0
+        return {
+            'frames': self.frames,
+            'coverage': coverage
+        }
+
+
+def reading_order(boxes):
+    """Sort boxes top-to-bottom, then left-to-right within vertically overlapping lines"""
+    lines = group_lines(boxes)
+    return [box for line in lines for box in line]
+
+
+def group_lines(boxes):
+    """Group boxes whose vertical centers fall inside each other's span into lines"""
+    lines = []
+    for box in sorted(boxes, key=lambda b: b[1]):
+        x, y, w, h = box
+        center = y + h / 2
+        if lines:
+            _, ly, _, lh = lines[-1][0]
+            if ly <= center <= ly + lh:
+                lines[-1].append(box)
+                continue
+        lines.append([box])
+    return [sorted(line, key=lambda b: b[0]) for line in lines]
@@ -0,0 +1,45 @@
+import re
+
+from translation_cache import normalize_text
+
+# Sentence ends followed by whitespace (Latin and Arabic punctuation)
+SENTENCE_BREAK = re.compile(r'(?<=[.!?؟。])\s+')
+
+
+# ==================== Text Segmentation ====================
+def split_segments(text):
+    """Split OCR text into lines of normalized sentences: [[sentence, ...], ...]"""
+    lines = []
+    for line in text.splitlines():
+        line = normalize_text(line)
+        if line:
+            lines.append([s for s in SENTENCE_BREAK.split(line) if s])
+    return lines
+
+
+def join_segments(lines):
+    """Reassemble translated segments in their original order"""
+    return "\n".join(" ".join(sentences) for sentences in lines)
+
+
+def unique_segments(lines):
+    """All segments in reading order without duplicates"""
+    return list(dict.fromkeys(s for sentences in lines for s in sentences))
+
+
+def translate_segments(segments, translate, translate_batch=None):
+    """Translate several segments with one backend call, keeping their order"""
+    if not segments:
+        return []
+    if len(segments) == 1:
+        return [translate(segments[0])]
+
+    # One request with one segment per line; newlines survive translation
+    translated = translate("\n".join(segments)).split("\n")
+    if len(translated) == len(segments):
+        return [t.strip() for t in translated]
+
+    # Line structure got merged by the provider - fall back to per-segment calls
+    if translate_batch:
+        return translate_batch(segments)
+    return [translate(s) for s in segments]
@@ -0,0 +1,144 @@
+import hashlib
+from collections import OrderedDict
+
+import numpy as np
+
+from ocr_engine import merge_lines
+from text_regions import group_lines
+
+
+# ==================== Dirty-Tile Incremental OCR ====================
+class TileOCR:
+    """Split a grayscale frame into text bands and only re-OCR bands whose content changed"""
+    def __init__(self, recognize, max_band_height=96, min_gap=3, contrast_threshold=24, max_tiles=512,
+                 recognize_batch=None):
+        self.recognize = recognize  # Callable: (2D uint8 array, psm) -> [OCRLine, ...] in tile pixels
+        self.recognize_batch = recognize_batch  # Optional: [(tile, psm), ...] -> [lines, ...] in order
+        self.max_band_height = max_band_height
+        self.min_gap = min_gap  # Blank rows needed to separate two bands
+        self.contrast_threshold = contrast_threshold
+        self.max_tiles = max_tiles
+        self.tiles = OrderedDict()  # (lang, fingerprint) -> tuple of OCRLine (LRU)
+        self.tiles_seen = 0
+        self.tiles_reused = 0
+        self.tiles_recognized = 0
+
+    def split(self, gray):
+        """Return (top, bottom) row ranges of bands that contain ink, cut at blank rows"""
+        # A row is blank when it has (almost) no contrast
+        row_range = gray.max(axis=1).astype(np.int16) - gray.min(axis=1)
+        ink = row_range >= self.contrast_threshold
+
+        bands = []
+        top = None
+        gap = 0
+        for y, has_ink in enumerate(ink):
+            if has_ink:
+                if top is None:
+                    top = y
+                gap = 0
+            elif top is not None:
+                gap += 1
+                if gap >= self.min_gap:
+                    bands.extend(self._limit_height(top, y - gap + 1))
+                    top = None
+                    gap = 0
+        if top is not None:
+            bands.extend(self._limit_height(top, len(ink) - gap))
+        return bands
+
+    def _limit_height(self, top, bottom):
+        # Very tall blocks (e.g. dense paragraphs) are cut into fixed-height bands
+        return [
+            (start, min(start + self.max_band_height, bottom))
+            for start in range(top, bottom, self.max_band_height)
+        ]
+
+    def fingerprint(self, tile):
+        """Content hash of a tile, tolerant to low-bit noise"""
+        coarse = tile[::2, ::2] >> 4
+        digest = hashlib.md5(coarse.tobytes())
+        digest.update(str(coarse.shape).encode('ascii'))
+        return digest.hexdigest()
+
+    def recognize_frame(self, gray, lang=None):
+        """OCR a frame tile by tile, reusing cached lines for unchanged tiles; lines in frame pixels
+
+        `lang` is the OCR language set the tiles will be recognized with: a
+        tile read with other languages is not reused.
+        """
+        height = gray.shape[0]
+        # Pad each band by a couple of blank rows on both sides
+        bands = [(max(0, top - 2), min(height, bottom + 2)) for top, bottom in self.split(gray)]
+        results = self._recognize_all([(gray[top:bottom], 6) for top, bottom in bands], lang)
+
+        lines = []
+        for (top, _), band_lines in zip(bands, results):
+            for line in band_lines:
+                x, y, w, h = line.box
+                lines.append(line._replace(box=(x, y + top, w, h)))
+        return lines
+
+    def recognize_boxes(self, gray, boxes, lang=None):
+        """One OCRLine per (x, y, w, h) box in single-line mode, in box order"""
+        results = self._recognize_all([(gray[y:y + h, x:x + w], 7) for x, y, w, h in boxes], lang)
+        return [merge_lines(lines, box=box) for box, lines in zip(boxes, results)]
+
+    def _recognize_all(self, jobs, lang=None):
+        """Lines for (tile, psm) jobs in order; only uncached tiles are OCRed, in one batch"""
+        results = [None] * len(jobs)
+        pending = OrderedDict()  # (lang, fingerprint) -> job indices (identical tiles are OCRed once)
+        for i, (tile, psm) in enumerate(jobs):
+            # The same pixels read as 'eng' and as 'eng+ara' give different text
+            key = (lang, self.fingerprint(tile))
+            self.tiles_seen += 1
+            lines = self.tiles.get(key)
+            if lines is not None:
+                self.tiles.move_to_end(key)
+                self.tiles_reused += 1
+                results[i] = lines
+            else:
+                pending.setdefault(key, []).append(i)
+
+        if pending:
+            batch = [jobs[indices[0]] for indices in pending.values()]
+            if self.recognize_batch:
+                recognized = self.recognize_batch(batch)
+            else:
+                recognized = [self.recognize(tile, psm) for tile, psm in batch]
+
+            for (key, indices), lines in zip(pending.items(), recognized):
+                lines = tuple(lines)
+                self.tiles[key] = lines
+                self.tiles_recognized += 1
+                for i in indices:
+                    results[i] = lines
+            while len(self.tiles) > self.max_tiles:
+                self.tiles.popitem(last=False)
+        return results
+
+    def clear(self):
+        self.tiles.clear()
+        self.tiles_seen = 0
+        self.tiles_reused = 0
+        self.tiles_recognized = 0
+
+    def stats(self):
+        reuse_rate = (self.tiles_reused / self.tiles_seen * 100) if self.tiles_seen > 0 else 0
+        return {
+            'size': len(self.tiles),
+            'reused': self.tiles_reused,
+            'recognized': self.tiles_recognized,
+            'reuse_rate': reuse_rate
+        }
+
+
+def stitch_regions(regions):
+    """Merge per-box OCRLines into one OCRLine per visual line, in reading order"""
+    by_box = {region.box: region for region in regions}
+    lines = []
+    for boxes in group_lines(list(by_box)):
+        line = merge_lines([by_box[box] for box in boxes])
+        if line.text:
+            lines.append(line)
+    return lines
@@ -0,0 +1,100 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+
+
+# ==================== Tracing ====================
+class _NullSpan:
+    """Shared no-op span returned while tracing is disabled"""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ('tracer', 'name', 'cat', 'args', 'start')
+
+    def __init__(self, tracer, name, cat, args):
+        self.tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter_ns()
+        self.tracer.events.append(
+            (self.name, self.cat, self.start, end - self.start, threading.get_ident(), self.args)
+        )
+        return False
+
+
+class Tracer:
+    """Span recorder backed by a ring buffer, exportable as Chrome trace-event JSON"""
+    def __init__(self, capacity=20000, enabled=False):
+        self.events = deque(maxlen=capacity)  # Oldest spans fall off; append is thread-safe
+        self.enabled = enabled
+        self.thread_names = {}
+
+    def enable(self, capacity=None):
+        if capacity and capacity != self.events.maxlen:
+            self.events = deque(self.events, maxlen=capacity)
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def span(self, name, cat='pipeline', **args):
+        """Context manager timing a block; costs one attribute check when disabled"""
+        if not self.enabled:
+            return NULL_SPAN
+        thread = threading.current_thread()
+        self.thread_names[thread.ident] = thread.name
+        return _Span(self, name, cat, args or None)
+
+    def clear(self):
+        self.events.clear()
+
+    def chrome_trace(self):
+        """Return the recorded spans as a Chrome trace-event dict (chrome://tracing, Perfetto)"""
+        pid = os.getpid()
+        # Metadata events name the threads
+        events = [
+            {'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': thread_name}}
+            for tid, thread_name in list(self.thread_names.items())
+        ]
+        for name, cat, start, duration, tid, args in list(self.events):
+            event = {
+                'name': name,
+                'cat': cat,
+                'ph': 'X',
+                'ts': start / 1000.0,  # Microseconds
+                'dur': duration / 1000.0,
+                'pid': pid,
+                'tid': tid
+            }
+            if args:
+                event['args'] = args
+            events.append(event)
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def dump(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.chrome_trace(), f, ensure_ascii=False)
+        return len(self.events)
+
+
+# Process-wide tracer used by all modules
+tracer = Tracer()
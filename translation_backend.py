@@ -0,0 +1,248 @@
+import logging
+import random
+import threading
+import time
+
+# requests ships with deep_translator; guarded so headless tools can import this module without it
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+except ImportError:
+    requests = None
+
+from metrics import metrics, TRANSLATION_RETRIES
+
+logger = logging.getLogger(__name__)
+
+
+class BackendError(Exception):
+    """Translation request failed; `retryable` marks transient failures (timeouts, 5xx, 429)"""
+    def __init__(self, message, retryable=True):
+        super().__init__(message)
+        self.retryable = retryable
+
+
+class BackendUnavailable(BackendError):
+    """Circuit breaker is open: the provider is considered down and is not called"""
+    def __init__(self, message="translation backend unavailable"):
+        super().__init__(message, retryable=False)
+
+
+# ==================== Backends ====================
+class TranslationBackend:
+    """Interface for translation providers"""
+    name = 'base'
+
+    def translate(self, text, timeout=None):
+        raise NotImplementedError
+
+    def translate_batch(self, batch, timeout=None):
+        return [self.translate(text, timeout) for text in batch]
+
+    def ready(self):
+        """True if a call would reach the provider now"""
+        return True
+
+    def close(self):
+        pass
+
+
+class HTTPTranslationBackend(TranslationBackend):
+    """Backend on a pooled keep-alive session: one TLS handshake, reused for every request"""
+    def __init__(self, base_url, pool_size=4, connect_timeout=3.0, read_timeout=5.0,
+                 user_agent="Mozilla/5.0 (Android) ScreenTranslator"):
+        if requests is None:
+            raise RuntimeError("requests is not installed")
+        self.base_url = base_url
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.session = requests.Session()
+        # Retries are done by ResilientBackend (with deadline and jitter), not urllib3
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers['User-Agent'] = user_agent
+
+    def request(self, method, path, timeout=None, **kwargs):
+        """Send a request and return the response, mapping failures to BackendError"""
+        read_timeout = self.read_timeout if timeout is None else min(self.read_timeout, timeout)
+        try:
+            response = self.session.request(
+                method,
+                self.base_url + path,
+                timeout=(min(self.connect_timeout, read_timeout), read_timeout),
+                **kwargs
+            )
+        except requests.RequestException as e:
+            # Connection resets, timeouts and broken or truncated responses are all transient
+            raise BackendError(f"{type(e).__name__}: {e}")
+
+        if response.status_code == 429 or response.status_code >= 500:
+            raise BackendError(f"HTTP {response.status_code}")
+        if response.status_code >= 400:
+            raise BackendError(f"HTTP {response.status_code}", retryable=False)
+        return response
+
+    def close(self):
+        self.session.close()
+
+
+class GoogleTranslateBackend(HTTPTranslationBackend):
+    """Google Translate web endpoint (the one used by the browser extension, JSON responses)"""
+    name = 'google'
+
+    def __init__(self, source='auto', target='ar', base_url="https://translate.googleapis.com", **kwargs):
+        super().__init__(base_url, **kwargs)
+        self.source = source
+        self.target = target
+
+    def translate(self, text, timeout=None):
+        if not text or not text.strip():
+            return text
+        response = self.request(
+            'POST',
+            '/translate_a/single',
+            timeout=timeout,
+            params={'client': 'gtx', 'sl': self.source, 'tl': self.target, 'dt': 't'},
+            data={'q': text}
+        )
+        try:
+            # [[["translated", "original", ...], ...], ...] - one entry per source sentence
+            return "".join(part[0] for part in response.json()[0] if part[0])
+        except (ValueError, TypeError, IndexError) as e:
+            # Error pages and captive portals answer 200 with something else - try again
+            raise BackendError(f"Unexpected response: {e}")
+
+
+# ==================== Resilience ====================
+class CircuitBreaker:
+    """Stop calling a failing provider for `reset_timeout` seconds, then let one probe through"""
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probing = False
+        self.trips = 0
+        self.lock = threading.Lock()
+
+    def allow(self):
+        with self.lock:
+            if self.state == self.OPEN and self.clock() - self.opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                self.probing = False
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.HALF_OPEN and not self.probing:
+                self.probing = True  # Exactly one request tests the provider
+                return True
+            return False
+
+    def ready(self):
+        """True if `allow` would let a call through now (closed, or due for a probe); no state change"""
+        with self.lock:
+            if self.state == self.OPEN:
+                return self.clock() - self.opened_at >= self.reset_timeout
+            return self.state == self.CLOSED or not self.probing
+
+    def record_success(self):
+        with self.lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self.probing = False
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    self.trips += 1
+                    logger.warning(f"Translation circuit opened after {self.failures} failures")
+                self.state = self.OPEN
+                self.opened_at = self.clock()
+                self.probing = False
+
+
+class ResilientBackend(TranslationBackend):
+    """Deadline, jittered exponential retries and a circuit breaker around another backend"""
+    def __init__(self, backend, deadline=6.0, retries=2, base_delay=0.25, max_delay=2.0,
+                 breaker=None, clock=time.monotonic, sleep=time.sleep):
+        self.backend = backend
+        self.name = backend.name
+        self.deadline = deadline  # Seconds per text, across all attempts
+        self.retries = retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.breaker = breaker or CircuitBreaker(clock=clock)
+        self.clock = clock
+        self.sleep = sleep
+        metrics.gauge(
+            'translation_circuit_open',
+            "1 while the translation circuit breaker rejects requests",
+            func=lambda: 0 if self.breaker.state == CircuitBreaker.CLOSED else 1
+        )
+
+    def translate(self, text, timeout=None):
+        if not self.breaker.allow():
+            raise BackendUnavailable()
+
+        healthy = False
+        try:
+            result = self._translate_with_retries(text, timeout)
+            healthy = True
+            return result
+        except BackendError as e:
+            # A non-retryable error means the provider answered, it is just rejecting this request
+            healthy = not e.retryable
+            raise
+        finally:
+            # Anything else counts as a failure too, so a half-open probe is never left in flight
+            if healthy:
+                self.breaker.record_success()
+            else:
+                self.breaker.record_failure()
+
+    def _translate_with_retries(self, text, timeout):
+        deadline = self.clock() + (self.deadline if timeout is None else min(self.deadline, timeout))
+        error = None
+        for attempt in range(self.retries + 1):
+            remaining = deadline - self.clock()
+            if remaining <= 0:
+                break
+            try:
+                return self.backend.translate(text, timeout=remaining)
+            except BackendError as e:
+                if not e.retryable:
+                    raise
+                error = e
+
+            if attempt == self.retries:
+                break
+            # Full jitter keeps clients from retrying in lock-step
+            delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+            if self.clock() + delay >= deadline:
+                break
+            TRANSLATION_RETRIES.inc()
+            logger.info(f"Translation attempt {attempt + 1} failed ({error}), retrying in {delay:.2f}s")
+            self.sleep(delay)
+
+        raise error or BackendError("deadline exceeded")
+
+    def ready(self):
+        return self.breaker.ready()
+
+    def close(self):
+        self.backend.close()
+
+    def stats(self):
+        return {
+            'state': self.breaker.state,
+            'failures': self.breaker.failures,
+            'trips': self.breaker.trips
+        }
@@ -0,0 +1,195 @@
+import threading
+import time
+from collections import OrderedDict
+
+from fuzzy_text import fold_text
+
+
+# ==================== Translation Cache ====================
+def normalize_text(text):
+    """Collapse whitespace so layout-only differences share a cache entry"""
+    return " ".join(text.split())
+
+
+class TranslationCache:
+    """Thread-safe LRU cache for translations bounded by entries and bytes, with optional TTL
+
+    With `fuzzy` enabled, an exact miss falls back to a text that only
+    differs by OCR look-alike glyphs (see fold_text).
+    """
+    def __init__(self, max_size=200, max_bytes=4 * 1024 * 1024, ttl=None, store=None, fuzzy=True,
+                 clock=time.time):
+        self.cache = OrderedDict()  # (source, target, text) -> entry, oldest first
+        self.max_size = max_size
+        self.max_bytes = max_bytes
+        self.ttl = ttl  # Seconds, None = never expire
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.store_hits = 0
+        self.store = store  # Optional persistent second tier
+        self.fuzzy = fuzzy
+        self.folded = {}  # (source, target, folded text) -> {key: None}, newest key last
+        self.fuzzy_hits = 0
+        self.clock = clock  # Wall clock: TTLs also apply to persisted last_used times
+        self.lock = threading.RLock()
+
+    def _key(self, text, source_lang, target_lang):
+        return (source_lang, target_lang, normalize_text(text))
+
+    def get(self, text, source_lang='auto', target_lang='ar'):
+        entry = self.lookup(text, source_lang, target_lang)
+        return entry['translation'] if entry else None
+
+    def lookup(self, text, source_lang='auto', target_lang='ar'):
+        """Cache entry for a text (raw 'translation' plus its 'display' form, if computed), or None"""
+        key = self._key(text, source_lang, target_lang)
+        with self.lock:
+            entry = self.cache.get(key)
+            if entry is not None:
+                if self.ttl is not None and self.clock() - entry['timestamp'] > self.ttl:
+                    self._remove(key)
+                else:
+                    # Move to end (most recently used)
+                    self.cache.move_to_end(key)
+                    self.hits += 1
+                    if self.store:
+                        self.store.touch(key[2], source_lang, target_lang)
+                    return entry
+
+            if self.fuzzy:
+                entry = self._fuzzy_get(key)
+                if entry is not None:
+                    self.hits += 1
+                    self.fuzzy_hits += 1
+                    return entry
+
+        # Fall back to the persistent tier and promote the entry on a hit
+        if self.store:
+            translation = self.store.get(key[2], source_lang, target_lang, max_age=self.ttl)
+            if translation is not None:
+                with self.lock:
+                    entry = self._insert(key, translation)
+                    self.hits += 1
+                    self.store_hits += 1
+                self.store.touch(key[2], source_lang, target_lang)
+                return entry
+
+        with self.lock:
+            self.misses += 1
+        return None
+
+    def _fuzzy_get(self, key):
+        """Entry of a cached text that matches `key` up to OCR look-alike glyphs"""
+        source_lang, target_lang, text = key
+        matches = self.folded.get((source_lang, target_lang, fold_text(text)))
+        if not matches:
+            return None
+
+        match = next(reversed(matches))
+        entry = self.cache[match]
+        if self.ttl is not None and self.clock() - entry['timestamp'] > self.ttl:
+            self._remove(match)
+            return None
+        self.cache.move_to_end(match)
+        return entry
+
+    def set(self, text, translation, source_lang='auto', target_lang='ar', display=None):
+        """Store a raw (logical order) translation and optionally its display form"""
+        key = self._key(text, source_lang, target_lang)
+        with self.lock:
+            self._insert(key, translation, display)
+        if self.store:
+            # Only the raw form is persisted, display forms are cheap to rebuild once
+            self.store.put(key[2], translation, source_lang, target_lang)
+
+    def set_display(self, entry, display):
+        """Attach a display form to an entry returned by `lookup`"""
+        with self.lock:
+            if entry.get('display') is None:
+                entry['display'] = display
+                size = len(display.encode('utf-8'))
+                entry['size'] += size
+                # The entry may have been evicted since the lookup
+                if self.cache.get(entry['key']) is entry:
+                    self.total_bytes += size
+
+    def warm(self, limit=None):
+        """Load the most recently used entries from the persistent tier"""
+        if not self.store:
+            return 0
+        rows = self.store.recent(limit or self.max_size)
+        with self.lock:
+            # Insert oldest first so the newest end up most recently used
+            for source_lang, target_lang, text, translation in reversed(rows):
+                self._insert((source_lang, target_lang, text), translation)
+        return len(rows)
+
+    def _insert(self, key, translation, display=None):
+        source_lang, target_lang, text = key
+        size = len(text.encode('utf-8')) + len(translation.encode('utf-8'))
+        if display is not None:
+            size += len(display.encode('utf-8'))
+        if key in self.cache:
+            self._remove(key)
+
+        entry = self.cache[key] = {
+            'key': key,
+            'translation': translation,
+            'display': display,
+            'source_lang': source_lang,
+            'target_lang': target_lang,
+            'timestamp': self.clock(),
+            'size': size
+        }
+        self.total_bytes += size
+        if self.fuzzy:
+            folded = entry['folded'] = fold_text(text)
+            self.folded.setdefault((source_lang, target_lang, folded), {})[key] = None
+
+        # Remove least recently used until both bounds hold
+        while len(self.cache) > self.max_size or (
+                self.total_bytes > self.max_bytes and len(self.cache) > 1):
+            lru_key = next(iter(self.cache))
+            self._remove(lru_key)
+            self.evictions += 1
+        return entry
+
+    def _remove(self, key):
+        entry = self.cache.pop(key)
+        self.total_bytes -= entry['size']
+        folded = entry.get('folded')
+        if folded is not None:
+            # Other texts with the same folded form stay reachable
+            folded_key = (key[0], key[1], folded)
+            matches = self.folded[folded_key]
+            del matches[key]
+            if not matches:
+                del self.folded[folded_key]
+
+    def clear(self):
+        with self.lock:
+            self.cache.clear()
+            self.folded.clear()
+            self.fuzzy_hits = 0
+            self.total_bytes = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+            self.store_hits = 0
+
+    def stats(self):
+        with self.lock:
+            total = self.hits + self.misses
+            hit_rate = (self.hits / total * 100) if total > 0 else 0
+            return {
+                'size': len(self.cache),
+                'bytes': self.total_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'store_hits': self.store_hits,
+                'fuzzy_hits': self.fuzzy_hits,
+                'hit_rate': hit_rate
+            }
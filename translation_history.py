@@ -0,0 +1,229 @@
+import logging
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+from write_behind import WriteBehindDatabase
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS history (
+    id INTEGER PRIMARY KEY,
+    timestamp REAL NOT NULL,
+    source TEXT NOT NULL,
+    target TEXT NOT NULL,
+    original TEXT NOT NULL,
+    translated TEXT NOT NULL
+);
+"""
+
+# External-content index: the text is stored once, in `history`
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS history_fts USING fts5(
+    original, translated,
+    content='history', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS history_ai AFTER INSERT ON history BEGIN
+    INSERT INTO history_fts (rowid, original, translated) VALUES (new.id, new.original, new.translated);
+END;
+"""
+
+
+def preview(text, width=100):
+    return text[:width] + "..." if len(text) > width else text
+
+
+def fts_query(query):
+    """Quote each word of free-form input as an FTS5 prefix term (all must match)"""
+    terms = ['"' + word.replace('"', '""') + '"*' for word in query.split()]
+    return " ".join(terms)
+
+
+# ==================== History Entries ====================
+class HistoryEntry:
+    """One translation; full texts are kept once and previews are cut on demand"""
+    __slots__ = ('timestamp', 'source', 'target', 'original', 'translated')
+
+    def __init__(self, original, translated, source='auto', target='ar', timestamp=None):
+        self.timestamp = time.time() if timestamp is None else timestamp
+        self.source = source
+        self.target = target
+        self.original = original
+        self.translated = translated
+
+    @property
+    def time_label(self):
+        return datetime.fromtimestamp(self.timestamp).strftime("%H:%M:%S")
+
+    def original_preview(self, width=100):
+        return preview(self.original, width)
+
+    def translated_preview(self, width=100):
+        return preview(self.translated, width)
+
+
+class HistoryRing:
+    """Fixed-capacity ring of the newest entries; appends are O(1) and never copy"""
+    def __init__(self, capacity=100):
+        self.capacity = capacity
+        self.slots = [None] * capacity
+        self.head = 0  # Next slot to write
+        self.count = 0
+        self.lock = threading.Lock()
+
+    def append(self, entry):
+        with self.lock:
+            self.slots[self.head] = entry
+            self.head = (self.head + 1) % self.capacity
+            self.count = min(self.count + 1, self.capacity)
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        """Entry by age: 0 is the newest"""
+        with self.lock:
+            if not 0 <= index < self.count:
+                raise IndexError("history index out of range")
+            return self.slots[(self.head - 1 - index) % self.capacity]
+
+    def newest(self, limit=None):
+        """Entries newest first"""
+        with self.lock:
+            count = self.count if limit is None else min(limit, self.count)
+            return [self.slots[(self.head - 1 - i) % self.capacity] for i in range(count)]
+
+    def clear(self):
+        with self.lock:
+            self.slots = [None] * self.capacity
+            self.head = 0
+            self.count = 0
+
+
+# ==================== Persistent Log ====================
+class TranslationLog(WriteBehindDatabase):
+    """Append-only SQLite (WAL) history log with an FTS5 index, written behind the UI
+
+    Rows are only ever inserted, so months of history cost disk, not
+    process memory; searches go through the full-text index. Builds of
+    SQLite without FTS5 fall back to a LIKE scan.
+    """
+    label = "Translation history log"
+
+    def __init__(self, path, flush_interval=1.0, batch_size=256):
+        super().__init__(path, flush_interval, batch_size)
+        self.fts = False
+        self.searches = 0
+
+    def create_schema(self, conn):
+        conn.executescript(SCHEMA)
+        try:
+            conn.executescript(FTS_SCHEMA)
+            self.fts = True
+        except sqlite3.OperationalError as e:
+            logger.warning(f"FTS5 unavailable, history search will scan: {e}")
+            self.fts = False
+
+    # ==================== Reads ====================
+    def _entries(self, rows):
+        return [HistoryEntry(original, translated, source, target, timestamp)
+                for timestamp, source, target, original, translated in rows]
+
+    def recent(self, limit):
+        """Newest logged entries, newest first"""
+        return self._entries(self.read(
+            "SELECT timestamp, source, target, original, translated FROM history "
+            "ORDER BY id DESC LIMIT ?",
+            (limit,)
+        ))
+
+    def search(self, query, limit=50):
+        """Entries whose original or translated text contains every word of `query`, newest first"""
+        if not self.reader or not query.split():
+            return []
+        self.searches += 1
+        if self.fts:
+            rows = self.read(
+                "SELECT h.timestamp, h.source, h.target, h.original, h.translated "
+                "FROM history_fts JOIN history h ON h.id = history_fts.rowid "
+                "WHERE history_fts MATCH ? ORDER BY h.id DESC LIMIT ?",
+                (fts_query(query), limit)
+            )
+        else:
+            pattern = f"%{query.strip()}%"
+            rows = self.read(
+                "SELECT timestamp, source, target, original, translated FROM history "
+                "WHERE original LIKE ? OR translated LIKE ? ORDER BY id DESC LIMIT ?",
+                (pattern, pattern, limit)
+            )
+        return self._entries(rows)
+
+    # ==================== Write-behind ====================
+    def append(self, entry):
+        """Queue an entry; never blocks on disk"""
+        self.pending.put((entry.timestamp, entry.source, entry.target, entry.original, entry.translated))
+
+    def write_batch(self, conn, batch):
+        with conn:
+            conn.executemany(
+                "INSERT INTO history (timestamp, source, target, original, translated) "
+                "VALUES (?, ?, ?, ?, ?)",
+                batch
+            )
+
+    def stats(self):
+        return {
+            'pending': self.pending.qsize(),
+            'writes': self.writes,
+            'searches': self.searches,
+            'fts': self.fts
+        }
+
+
+# ==================== History ====================
+class TranslationHistory:
+    """Recent translations in memory, everything else in the (optional) on-disk log"""
+    def __init__(self, capacity=100, log=None):
+        self.ring = HistoryRing(capacity)
+        self.log = log
+
+    def add(self, original, translated, source='auto', target='ar'):
+        entry = HistoryEntry(original, translated, source, target)
+        self.ring.append(entry)
+        if self.log:
+            self.log.append(entry)
+        return entry
+
+    def attach(self, log):
+        """Log future entries and reload the newest logged ones into memory"""
+        self.log = log
+        if log and not len(self.ring):
+            for entry in reversed(log.recent(self.ring.capacity)):
+                self.ring.append(entry)
+
+    def detach(self):
+        log, self.log = self.log, None
+        return log
+
+    def recent(self, limit=None):
+        return self.ring.newest(limit)
+
+    def search(self, query, limit=50):
+        """Search the log, or only what is still in memory without one"""
+        if self.log:
+            return self.log.search(query, limit)
+        words = query.casefold().split()
+        if not words:
+            return []
+        found = [entry for entry in self.ring.newest()
+                 if all(w in entry.original.casefold() or w in entry.translated.casefold() for w in words)]
+        return found[:limit]
+
+    def __len__(self):
+        return len(self.ring)
+
+    def clear(self):
+        self.ring.clear()
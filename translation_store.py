@@ -0,0 +1,130 @@
+import logging
+import time
+
+from write_behind import WriteBehindDatabase
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS translations (
+    source TEXT NOT NULL,
+    target TEXT NOT NULL,
+    text TEXT NOT NULL,
+    translation TEXT NOT NULL,
+    last_used REAL NOT NULL,
+    PRIMARY KEY (source, target, text)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS translations_last_used ON translations (last_used);
+"""
+
+AUTO_VACUUM_INCREMENTAL = 2  # PRAGMA auto_vacuum value
+
+
+# ==================== Persistent Translation Store ====================
+class PersistentTranslationStore(WriteBehindDatabase):
+    """SQLite (WAL) second-tier translation store with write-behind and size-based compaction"""
+    label = "Translation store"
+    maintenance_interval = 30.0
+
+    def __init__(self, path, max_rows=50000, max_bytes=32 * 1024 * 1024,
+                 flush_interval=1.0, batch_size=256):
+        super().__init__(path, flush_interval, batch_size)
+        self.max_rows = max_rows
+        self.max_bytes = max_bytes
+        self.compactions = 0
+
+    def prepare(self, conn):
+        # auto_vacuum only takes effect before the database header is written -
+        # by the switch to WAL or the first table - so it goes first
+        conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != AUTO_VACUUM_INCREMENTAL:
+            # Existing database created without it: one full VACUUM (not allowed in WAL) applies it
+            conn.execute("PRAGMA journal_mode=DELETE")
+            conn.execute("VACUUM")
+
+    def create_schema(self, conn):
+        conn.executescript(SCHEMA)
+        if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != AUTO_VACUUM_INCREMENTAL:
+            logger.warning("Translation store auto_vacuum is off, compaction will not free disk space")
+
+    # ==================== Reads ====================
+    def get(self, text, source_lang, target_lang, max_age=None):
+        oldest = time.time() - max_age if max_age is not None else 0
+        rows = self.read(
+            "SELECT translation FROM translations "
+            "WHERE source=? AND target=? AND text=? AND last_used>=?",
+            (source_lang, target_lang, text, oldest)
+        )
+        return rows[0][0] if rows else None
+
+    def recent(self, limit):
+        """Return the most recently used (source, target, text, translation) rows, newest first"""
+        return self.read(
+            "SELECT source, target, text, translation FROM translations "
+            "ORDER BY last_used DESC LIMIT ?",
+            (limit,)
+        )
+
+    # ==================== Write-behind ====================
+    def put(self, text, translation, source_lang, target_lang):
+        """Queue an insert/update; never blocks on disk"""
+        self.pending.put(('put', (source_lang, target_lang, text, translation, time.time())))
+
+    def touch(self, text, source_lang, target_lang):
+        """Queue a last-used update for an entry served from memory"""
+        self.pending.put(('touch', (time.time(), source_lang, target_lang, text)))
+
+    def write_batch(self, conn, batch):
+        puts = [args for op, args in batch if op == 'put']
+        touches = [args for op, args in batch if op == 'touch']
+        with conn:
+            if puts:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO translations (source, target, text, translation, last_used) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    puts
+                )
+            if touches:
+                conn.executemany(
+                    "UPDATE translations SET last_used=? WHERE source=? AND target=? AND text=?",
+                    touches
+                )
+
+    def maintain(self, conn):
+        self.compact(conn)
+
+    def compact(self, conn):
+        """Drop least recently used rows until the store fits its row and byte limits"""
+        rows = conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+        page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+        pages = conn.execute("PRAGMA page_count").fetchone()[0]
+        free_pages = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        used_bytes = (pages - free_pages) * page_size
+
+        excess = rows - self.max_rows
+        if used_bytes > self.max_bytes and rows:
+            # Shrink to ~75% of the byte budget in one go to avoid compacting every cycle
+            keep = int(rows * self.max_bytes * 0.75 / used_bytes)
+            excess = max(excess, rows - keep)
+
+        if excess > 0:
+            with conn:
+                # WITHOUT ROWID table - cut at the last_used of the excess-th oldest row
+                conn.execute(
+                    "DELETE FROM translations WHERE last_used <= ("
+                    "SELECT last_used FROM translations ORDER BY last_used LIMIT 1 OFFSET ?)",
+                    (excess - 1,)
+                )
+            self.compactions += 1
+            logger.info(f"Translation store compacted: {excess} old entries removed")
+
+        if free_pages or excess > 0:
+            # Frees one page per step; executescript runs it to completion (execute stops after one)
+            conn.executescript("PRAGMA incremental_vacuum;")
+
+    def stats(self):
+        return {
+            'pending': self.pending.qsize(),
+            'writes': self.writes,
+            'compactions': self.compactions
+        }
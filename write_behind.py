@@ -0,0 +1,134 @@
+import logging
+import queue
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+# ==================== Write-behind SQLite ====================
+class WriteBehindDatabase:
+    """SQLite (WAL) database read on the caller's thread and written behind it
+
+    Writes are queued and flushed by one thread in batched transactions, so
+    callers never block on disk. Subclasses create their schema in
+    `create_schema`, apply a batch in `write_batch` and may do periodic
+    housekeeping in `maintain` (also run once more on close).
+    """
+    label = "Database"  # Name used in log messages and for the writer thread
+    maintenance_interval = None  # Seconds between `maintain` calls, None for never
+
+    def __init__(self, path, flush_interval=1.0, batch_size=256):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.pending = queue.Queue()
+        self.reader = None
+        self.read_lock = threading.Lock()
+        self.writer_thread = None
+        self.writes = 0
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    # ==================== Subclass hooks ====================
+    def prepare(self, conn):
+        """Settings that must be applied before the database switches to WAL"""
+
+    def create_schema(self, conn):
+        raise NotImplementedError
+
+    def write_batch(self, conn, batch):
+        raise NotImplementedError
+
+    def maintain(self, conn):
+        pass
+
+    # ==================== Lifecycle ====================
+    def open(self):
+        """Create the schema and start the write-behind thread"""
+        if self.writer_thread:
+            return
+
+        conn = sqlite3.connect(self.path)
+        self.prepare(conn)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        self.create_schema(conn)
+        conn.commit()
+        conn.close()
+
+        self.reader = self._connect()
+        self.writer_thread = threading.Thread(
+            target=self._writer_loop,
+            daemon=True,
+            name=self.label.title().replace(" ", "") + "Writer"
+        )
+        self.writer_thread.start()
+        logger.info(f"{self.label} opened: {self.path}")
+
+    def close(self):
+        """Flush pending writes and close the database"""
+        if not self.writer_thread:
+            return
+
+        self.pending.put(None)
+        self.writer_thread.join(timeout=5.0)
+        self.writer_thread = None
+
+        with self.read_lock:
+            self.reader.close()
+            self.reader = None
+        logger.info(f"{self.label} closed")
+
+    def read(self, sql, params=()):
+        """Rows of a query on the shared reader connection; [] while closed"""
+        if not self.reader:
+            return []
+        with self.read_lock:
+            return self.reader.execute(sql, params).fetchall()
+
+    # ==================== Writer thread ====================
+    def _writer_loop(self):
+        conn = self._connect()
+        last_maintenance = time.time()
+        running = True
+
+        while running:
+            batch = []
+            try:
+                item = self.pending.get(timeout=self.flush_interval)
+                if item is None:
+                    running = False
+                else:
+                    batch.append(item)
+                # Drain whatever else is already waiting
+                while running and len(batch) < self.batch_size:
+                    item = self.pending.get_nowait()
+                    if item is None:
+                        running = False
+                    else:
+                        batch.append(item)
+            except queue.Empty:
+                pass
+
+            if batch:
+                try:
+                    self.write_batch(conn, batch)
+                    self.writes += len(batch)
+                except sqlite3.Error as e:
+                    logger.error(f"{self.label} write failed: {e}")
+
+            if self.maintenance_interval is not None and (
+                    time.time() - last_maintenance > self.maintenance_interval or not running):
+                try:
+                    self.maintain(conn)
+                except sqlite3.Error as e:
+                    logger.warning(f"{self.label} maintenance failed: {e}")
+                last_maintenance = time.time()
+
+        conn.close()